@@ -0,0 +1,96 @@
+"""
+Heavy styled output to a slow pipe, while a ticker measures how late
+the event loop wakes it up: blocking `write` calls, versus an
+`AsyncWriter` that waits with `await drain()`.
+
+Run with: python benchmarks/async_output
+"""
+import asyncio
+import subprocess
+import sys
+import time
+
+from coquille import write
+from coquille.aio import AsyncWriter
+from coquille.sequences import bold
+from coquille.sequences import foreground_color
+
+LINES = 20_000
+TICK = 0.001
+
+
+# a process reading in bursts, every 20 ms, like a congested remote
+# terminal
+SLOW_READER = """
+import os, time
+while os.read(0, 65536):
+    time.sleep(0.02)
+"""
+
+
+async def ticker(lateness: list[float], done: asyncio.Event) -> None:
+    while not done.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lateness.append(time.perf_counter() - start - TICK)
+
+
+async def produce(file, asynchronous: bool) -> None:
+    writer = await AsyncWriter.open(file) if asynchronous else None
+
+    for n in range(LINES):
+        text = f"line {n}: " + "=" * 60
+
+        if writer is None:
+            write(text, foreground_color(n % 256), bold, file=file)
+        else:
+            writer.write(text, foreground_color(n % 256), bold)
+
+        if n % 10 == 0:
+            if writer is None:
+                await asyncio.sleep(0)
+            else:
+                await writer.drain()
+
+    if writer is not None:
+        await writer.close()
+
+
+async def measure(asynchronous: bool) -> tuple[float, list[float]]:
+    reader = subprocess.Popen(
+        [sys.executable, "-c", SLOW_READER],
+        stdin=subprocess.PIPE,
+        text=True,
+    )
+    file = reader.stdin
+    lateness: list[float] = []
+    done = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(lateness, done))
+    start = time.perf_counter()
+
+    await produce(file, asynchronous)
+
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+    file.close()
+    reader.wait()
+
+    return elapsed, sorted(lateness)
+
+
+print(f"{LINES} lines to a slow pipe, ticks of {TICK * 1e3:.0f} ms")
+print(
+    f"{'writer':>12} {'total (ms)':>11} {'ticks':>6} "
+    f"{'p99 late (ms)':>14} {'max late (ms)':>14}",
+)
+
+for name, asynchronous in (("blocking", False), ("AsyncWriter", True)):
+    elapsed, lateness = asyncio.run(measure(asynchronous))
+    p99 = lateness[int(len(lateness) * 0.99)] if lateness else 0.0
+    worst = lateness[-1] if lateness else 0.0
+
+    print(
+        f"{name:>12} {elapsed * 1e3:>11.0f} {len(lateness):>6} "
+        f"{p99 * 1e3:>14.1f} {worst * 1e3:>14.1f}",
+    )
@@ -0,0 +1,71 @@
+"""
+Producers logging styled records to a slow terminal: how long each
+`write` call takes them with the terminal as the file, and with a
+`BackgroundWriter` for each queue policy.
+
+Run with: python benchmarks/background_writer
+"""
+import io
+import os
+import time
+
+from coquille import BackgroundWriter
+from coquille import write
+from coquille.sequences import bold
+from coquille.sequences import foreground_color
+
+RECORDS = 5_000
+
+
+class SlowTerminal(io.TextIOWrapper):
+    """
+    Each write takes 0.2 ms, plus 1 ns per character.
+    """
+
+    def write(self, s: str) -> int:
+        time.sleep(0.0002 + len(s) * 1e-9)
+        return super().write(s)
+
+
+def run(policy):
+    file = SlowTerminal(io.BufferedWriter(io.FileIO(os.devnull, "w")))
+    target = file
+
+    if policy is not None:
+        target = BackgroundWriter(file, max_records=256, policy=policy)
+
+    latencies = []
+    start = time.perf_counter()
+
+    for n in range(RECORDS):
+        before = time.perf_counter()
+        write(f"record {n}: " + "=" * 60, foreground_color(n % 256), bold, file=target)
+        latencies.append(time.perf_counter() - before)
+
+    produced = time.perf_counter() - start
+
+    if policy is not None:
+        target.close()
+
+    total = time.perf_counter() - start
+    file.close()
+    latencies.sort()
+    stats = None if policy is None else target.stats()
+
+    return produced, total, latencies[len(latencies) * 99 // 100], stats
+
+
+print(f"{RECORDS} records")
+print(
+    f"{'file':>12} {'producer (ms)':>14} {'total (ms)':>11} {'p99 write (us)':>15} "
+    f"{'batches':>8} {'dropped':>8} {'peak depth':>11}",
+)
+
+for policy in (None, "block", "drop_oldest", "drop_newest", "coalesce"):
+    produced, total, p99, stats = run(policy)
+    print(
+        f"{policy or 'terminal':>12} {produced * 1e3:>14.0f} {total * 1e3:>11.0f} "
+        f"{p99 * 1e6:>15.0f} "
+        f"{stats.batches if stats else RECORDS:>8} {stats.dropped if stats else 0:>8} "
+        f"{stats.peak_depth if stats else 0:>11}",
+    )
@@ -0,0 +1,103 @@
+"""
+Compare escape-heavy output written through a text stream with the
+same output written as pre-encoded segments by a `BinaryWriter`.
+
+Run with: python benchmarks/binary_output
+"""
+import os
+import time
+
+from coquille.binary import BinaryWriter
+from coquille.sequences import foreground_color
+
+FRAMES = 500
+CELLS = 1_000  # per frame
+COLORS = [foreground_color(n) for n in range(256)]
+ENCODED_COLORS = [color.encoded for color in COLORS]
+CELL_TEXT = "█"
+CELL_BYTES = CELL_TEXT.encode()
+# a few large segments, where writev avoids copying them
+BLOCK = (COLORS[1] + CELL_TEXT * 10_000).encode()
+LARGE_FRAME = (COLORS[1] + CELL_TEXT * 10_000) * 8
+FRAME_SIZE = sum(
+    len(COLORS[index % 256].encoded) + len(CELL_BYTES) for index in range(CELLS)
+)
+
+
+def text_stream() -> int:
+    written = 0
+
+    with open(os.devnull, "w", encoding="utf-8") as file:
+        for _ in range(FRAMES):
+            segments: list[str] = []
+
+            for index in range(CELLS):
+                segments += (COLORS[index % 256], CELL_TEXT)
+
+            frame = "".join(segments)
+            file.write(frame)
+            file.flush()
+            written += FRAME_SIZE
+
+    return written
+
+
+def text_stream_large_segments() -> int:
+    written = 0
+
+    with open(os.devnull, "w", encoding="utf-8") as file:
+        for _ in range(FRAMES):
+            file.write(LARGE_FRAME)
+            file.flush()
+            written += len(BLOCK) * 8
+
+    return written
+
+
+def binary_writer() -> int:
+    fd = os.open(os.devnull, os.O_WRONLY)
+    writer = BinaryWriter(fd)
+    written = 0
+
+    try:
+        for _ in range(FRAMES):
+            segments: list[bytes] = []
+
+            for index in range(CELLS):
+                segments += (ENCODED_COLORS[index % 256], CELL_BYTES)
+
+            writer.write_segments(segments)
+            written += FRAME_SIZE
+            writer.flush()
+    finally:
+        os.close(fd)
+
+    return written
+
+
+def binary_writer_large_segments() -> int:
+    fd = os.open(os.devnull, os.O_WRONLY)
+    writer = BinaryWriter(fd)
+    written = 0
+
+    try:
+        for _ in range(FRAMES):
+            writer.write_segments((BLOCK,) * 8)
+            written += writer.pending
+            writer.flush()
+    finally:
+        os.close(fd)
+
+    return written
+
+
+for name, function in (
+    ("text stream", text_stream),
+    ("BinaryWriter, small segments", binary_writer),
+    ("text stream, large segments", text_stream_large_segments),
+    ("BinaryWriter, large segments", binary_writer_large_segments),
+):
+    start = time.perf_counter()
+    size = function()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<30} {size / elapsed / 1e6:>8.1f} MB/s")
@@ -0,0 +1,65 @@
+"""
+Compare the number of write/flush calls reaching the OS before and
+after the single-write output path of `write`.
+
+Run with: python benchmarks/buffered_output
+"""
+import io
+import os
+import time
+
+from coquille import apply
+from coquille import write
+from coquille.sequences import soft_reset
+
+ITERATIONS = 20_000
+SEQUENCES = ("fg_red", "bold", "italic")
+
+
+class CountingRawIO(io.FileIO):
+    """
+    Unbuffered file where every `write` is exactly one syscall.
+    """
+
+    syscalls = 0
+
+    def write(self, b):
+        self.syscalls += 1
+        return super().write(b)
+
+
+def open_tty_like() -> tuple[CountingRawIO, io.TextIOWrapper]:
+    # every explicit flush reaches the OS, like on a tty
+    raw = CountingRawIO(os.devnull, "w")
+    return raw, io.TextIOWrapper(io.BufferedWriter(raw))
+
+
+def legacy_write(text: str, *sequences: str, file) -> None:
+    # what `write` used to do: one write + one flush per sequence
+    for sequence in sequences:
+        apply(sequence, file)
+
+    print(text, file=file)
+    apply(soft_reset, file)
+
+
+def run(name: str, function, **kwargs) -> None:
+    raw, file = open_tty_like()
+    start = time.perf_counter()
+
+    for _ in range(ITERATIONS):
+        function("Hello World!", *SEQUENCES, file=file, **kwargs)
+
+    file.flush()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<22} {raw.syscalls / ITERATIONS:>6.2f} syscalls/call"
+        f" {elapsed / ITERATIONS * 1e6:>8.2f} µs/call",
+    )
+    file.close()
+
+
+run("before (per sequence)", legacy_write)
+run("after, flush=call", write, flush_policy="call")
+run("after, flush=line", write, flush_policy="line")
+run("after, flush=manual", write, flush_policy="manual")
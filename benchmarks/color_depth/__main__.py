@@ -0,0 +1,76 @@
+"""
+Map every cell of a full-screen frame of RGB colors to a lower color
+depth: a nearest color search on each call versus the lookup tables,
+and the conversion of the sequences of a whole frame.
+
+Run with: python benchmarks/color_depth
+"""
+import timeit
+
+from coquille.colors import downsample
+from coquille.colors import palette_to_rgb
+from coquille.colors import rgb_to_16
+from coquille.colors import rgb_to_256
+from coquille.sequences import foreground_truecolor
+
+NUMBER = 5
+# 200x60 cells of a gradient
+WIDTH, HEIGHT = 200, 60
+COLORS = [
+    (column * 255 // WIDTH, row * 255 // HEIGHT, (row + column) % 256)
+    for row in range(HEIGHT)
+    for column in range(WIDTH)
+]
+FRAME = "".join(foreground_truecolor(*rgb) + "█" for rgb in COLORS)
+PALETTE = [palette_to_rgb(n) for n in range(256)]
+
+
+def search(r: int, g: int, b: int, colors: range) -> int:
+    return min(
+        colors,
+        key=lambda n: (
+            (PALETTE[n][0] - r) ** 2
+            + (PALETTE[n][1] - g) ** 2
+            + (PALETTE[n][2] - b) ** 2
+        ),
+    )
+
+
+def search_256() -> list[int]:
+    return [search(r, g, b, range(16, 256)) for r, g, b in COLORS]
+
+
+def search_16() -> list[int]:
+    return [search(r, g, b, range(16)) for r, g, b in COLORS]
+
+
+def table_256() -> list[int]:
+    return [rgb_to_256(r, g, b) for r, g, b in COLORS]
+
+
+def table_16() -> list[int]:
+    return [rgb_to_16(r, g, b) for r, g, b in COLORS]
+
+
+# the tables are built on first use
+table_256()
+table_16()
+
+print(f"{len(COLORS)} cells")
+print(f"{'mapping':>18} {'time (ms)':>10}")
+
+for function in (search_256, table_256, search_16, table_16):
+    duration = timeit.timeit(function, number=NUMBER)
+    print(f"{function.__name__:>18} {duration / NUMBER * 1e3:>10.2f}")
+
+print(f"{'frame':>18} {'first (ms)':>10} {'next (ms)':>10} {'bytes':>8}")
+
+for depth in ("truecolor", "256", "16", "none"):
+    # the sequences of a frame are converted once, then cached
+    first = timeit.timeit(lambda: downsample(FRAME, depth), number=1)
+    duration = timeit.timeit(lambda: downsample(FRAME, depth), number=NUMBER)
+    size = len(downsample(FRAME, depth).encode())
+    print(
+        f"{depth:>18} {first * 1e3:>10.2f} {duration / NUMBER * 1e3:>10.2f} "
+        f"{size:>8}",
+    )
@@ -0,0 +1,31 @@
+"""
+Compare `Coquille.write` with the template returned by `Coquille.compile`.
+
+Run with: python benchmarks/compiled_coquille
+"""
+import timeit
+
+from coquille import Coquille
+from coquille.sequences import fg_truecolor
+
+
+class NullStream:
+    def write(self, s: str) -> int:
+        return len(s)
+
+    def flush(self) -> None:
+        pass
+
+
+ITERATIONS = 100_000
+
+coquille = Coquille.new(fg_truecolor(128, 255, 0), "bold", "italic", file=NullStream())
+compiled = coquille.compile()
+
+for name, statement in (
+    ("Coquille.write", lambda: coquille.write("Hello World!")),
+    ("CompiledCoquille.write", lambda: compiled.write("Hello World!")),
+    ("CompiledCoquille.format", lambda: compiled.format("Hello World!")),
+):
+    elapsed = timeit.timeit(statement, number=ITERATIONS)
+    print(f"{name:<24} {elapsed / ITERATIONS * 1e9:>8.0f} ns/call")
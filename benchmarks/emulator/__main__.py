@@ -0,0 +1,59 @@
+"""
+Measure the throughput of the virtual terminal, and the number of bytes
+per frame of a `Screen` scene (a moving box over a static background).
+
+Run with: python benchmarks/emulator
+"""
+import time
+
+from coquille.emulator import VirtualTerminal
+from coquille.screen import Screen
+from coquille.sequences import bold
+from coquille.sequences import foreground_color
+from coquille.sequences import normal_intensity
+from coquille.style import Style
+
+WIDTH, HEIGHT = 120, 40
+FRAMES = 200
+
+# a colored log
+line = "".join(
+    f"{foreground_color(n)}{bold}[{n:03}]{normal_intensity} request served\n" for n in range(16)
+)
+log = line * 4096
+megabytes = len(log) / 1024 / 1024
+terminal = VirtualTerminal(WIDTH, HEIGHT)
+start = time.perf_counter()
+
+for offset in range(0, len(log), 4096):
+    terminal.write(log[offset : offset + 4096])
+
+elapsed = time.perf_counter() - start
+print(f"colored log: {megabytes / elapsed:.1f} MB/s")
+
+# a screen scene
+terminal = VirtualTerminal(WIDTH, HEIGHT)
+screen = Screen(WIDTH, HEIGHT, file=terminal)
+background = Style.from_sequences([foreground_color(8)])
+box = Style.from_sequences([bold, foreground_color(3)])
+elapsed = 0.0
+
+for frame in range(FRAMES):
+    screen.fill(".", background)
+    column = frame % (WIDTH - 10)
+
+    for row in range(10, 20):
+        screen.put(row, column, "#" * 10, box)
+
+    output = screen.render()
+    start = time.perf_counter()
+    terminal.write(output)
+    terminal.flush()
+    elapsed += time.perf_counter() - start
+
+sizes = terminal.frame_sizes
+print(f"screen scene: {FRAMES / elapsed:.0f} frames/s")
+print(
+    f"bytes/frame: first {sizes[0]}, "
+    f"then {sum(sizes[1:]) / len(sizes[1:]):.0f} on average",
+)
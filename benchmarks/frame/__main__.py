@@ -0,0 +1,71 @@
+"""
+Redraw a 40-row dashboard, each row with its own `apply` and `write`
+calls: straight to an unbuffered terminal, where every call is a
+system call the terminal may repaint after, versus inside of a `frame`,
+which sends each frame as one synchronized update.
+
+Run with: python benchmarks/frame
+"""
+import io
+import os
+import time
+
+from coquille import apply
+from coquille import frame
+from coquille import write
+from coquille.sequences import bold
+from coquille.sequences import cursor_position
+from coquille.sequences import foreground_color
+
+FRAMES = 300
+ROWS = 40
+
+
+class Terminal(io.FileIO):
+    """
+    An unbuffered terminal, counting the writes it gets.
+    """
+
+    writes = 0
+
+    def write(self, b) -> int:
+        self.writes += 1
+        return super().write(b)
+
+
+def draw(file, n: int) -> None:
+    for row in range(ROWS):
+        apply(cursor_position(row + 1, 1), file)
+        write(
+            f"worker {row:>2}: {n * (row + 1):>8} requests",
+            foreground_color(row % 16),
+            bold,
+            end="",
+            file=file,
+        )
+
+
+def run(framed: bool) -> tuple[float, int]:
+    terminal = Terminal(os.devnull, "w")
+    file = io.TextIOWrapper(terminal, write_through=True)
+    start = time.perf_counter()
+
+    for n in range(FRAMES):
+        if framed:
+            with frame(file) as screen:
+                draw(screen, n)
+        else:
+            draw(file, n)
+
+    elapsed = time.perf_counter() - start
+    file.close()
+
+    return elapsed, terminal.writes
+
+
+print(f"{FRAMES} frames of {ROWS} rows")
+print(f"{'output':>8} {'per frame (us)':>15} {'writes per frame':>17}")
+
+for name, framed in (("direct", False), ("frame", True)):
+    elapsed, writes = run(framed)
+    print(f"{name:>8} {elapsed / FRAMES * 1e6:>15.0f} {writes / FRAMES:>17.0f}")
@@ -0,0 +1,94 @@
+"""
+Two threads updating a 24-row dashboard as fast as they can for one
+second: redrawing it on every update, versus requesting frames from a
+`FrameScheduler` capped at 30 and 60 frames per second.
+
+Run with: python benchmarks/frame_pacing
+"""
+import io
+import os
+import threading
+import time
+
+from coquille import apply
+from coquille import frame
+from coquille import write
+from coquille.pacing import FrameScheduler
+from coquille.sequences import bold
+from coquille.sequences import cursor_position
+from coquille.sequences import foreground_color
+
+DURATION = 1.0
+ROWS = 24
+counters = [0] * ROWS
+
+
+def render(out) -> None:
+    for row, value in enumerate(counters):
+        apply(cursor_position(row + 1, 1), out)
+        color = foreground_color(row % 16)
+        write(f"worker {row:>2}: {value:>8}", color, bold, end="", file=out)
+
+
+def run(fps):
+    file = io.TextIOWrapper(io.FileIO(os.devnull, "w"), write_through=True)
+    scheduler = None if fps is None else FrameScheduler(render, file, fps=fps)
+    lock = threading.Lock()
+    end = time.monotonic() + DURATION
+    updates = 0
+    drawing = 0.0
+
+    def update(offset: int) -> None:
+        nonlocal updates, drawing
+
+        while time.monotonic() < end:
+            counters[(updates + offset) % ROWS] += 1
+
+            if scheduler is None:
+                with lock:
+                    start = time.monotonic()
+
+                    with frame(file) as out:
+                        render(out)
+
+                    drawing += time.monotonic() - start
+            else:
+                scheduler.request()
+
+            updates += 1
+            time.sleep(0)
+
+    threads = [threading.Thread(target=update, args=(offset,)) for offset in (0, 7)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    if scheduler is None:
+        frames, skipped, written = updates, 0, None
+    else:
+        scheduler.close()
+        stats = scheduler.stats()
+        frames, skipped, written = stats.frames, stats.skipped, stats.bytes_per_frame
+        drawing = stats.frame_time
+
+    file.close()
+
+    return updates, frames, skipped, written, drawing
+
+
+print(f"{DURATION:.0f} s of updates from 2 threads")
+print(
+    f"{'pacing':>9} {'updates':>8} {'frames':>7} {'skipped':>8} "
+    f"{'bytes/frame':>12} {'drawing (ms)':>13}",
+)
+
+for fps in (None, 60, 30):
+    updates, frames, skipped, written, drawing = run(fps)
+    print(
+        f"{'none' if fps is None else f'{fps} fps':>9} {updates:>8} {frames:>7} "
+        f"{skipped:>8} {'-' if written is None else f'{written:.0f}':>12} "
+        f"{drawing * 1e3:>13.0f}",
+    )
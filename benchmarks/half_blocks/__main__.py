@@ -0,0 +1,84 @@
+"""
+Render RGB frames with half blocks: `fg_truecolor` and `bg_truecolor`
+for each cell, versus `render_half_blocks` (vectorized with NumPy if it
+is installed, and its pure-Python path).
+
+Frames are a 64x64 (4K pixels) heatmap and a noisy photo-like image,
+and a full-screen 200x120 one.
+
+Run with: python benchmarks/half_blocks
+"""
+import random
+import timeit
+
+from coquille import image
+from coquille.image import HALF_BLOCK
+from coquille.sequences import bg_truecolor
+from coquille.sequences import fg_truecolor
+
+NUMBER = 5
+
+
+def heatmap(width: int, height: int) -> list[list[tuple[int, int, int]]]:
+    # bands of 8 identical pixels
+    return [
+        [(x // 8 * 32 % 256, y // 8 * 32 % 256, 128) for x in range(width)]
+        for y in range(height)
+    ]
+
+
+def noise(width: int, height: int) -> list[list[tuple[int, int, int]]]:
+    generator = random.Random(0)
+
+    return [
+        [tuple(generator.randrange(256) for _ in range(3)) for _ in range(width)]
+        for _ in range(height)
+    ]
+
+
+def naive(pixels: list[list[tuple[int, int, int]]]) -> str:
+    lines: list[str] = []
+
+    for top in range(0, len(pixels), 2):
+        lines.append(
+            "".join(
+                fg_truecolor(*upper) + bg_truecolor(*lower) + HALF_BLOCK
+                for upper, lower in zip(pixels[top], pixels[top + 1])
+            )
+            + "\x1b[0m",
+        )
+
+    return "\n".join(lines)
+
+
+FRAMES = {
+    "heatmap 64x64": heatmap(64, 64),
+    "noise 64x64": noise(64, 64),
+    "heatmap 200x120": heatmap(200, 120),
+    "noise 200x120": noise(200, 120),
+}
+# frame name -> pixels given to each renderer
+inputs = {"naive": FRAMES, "pure Python": FRAMES}
+renderers = {"naive": naive, "pure Python": image._render_rows}
+
+if image.numpy is not None:
+    # the conversion to an array is not part of the rendering
+    inputs["NumPy"] = {
+        name: image.numpy.asarray(pixels, dtype=image.numpy.uint8)
+        for name, pixels in FRAMES.items()
+    }
+    renderers["NumPy"] = image._render_array
+else:
+    print("NumPy is not installed, only the pure-Python path is measured")
+
+print(f"{'frame':>16} {'renderer':>12} {'time (ms)':>10} {'bytes':>8}")
+
+for name in FRAMES:
+    for renderer_name, render in renderers.items():
+        frame = inputs[renderer_name][name]
+        duration = timeit.timeit(lambda: render(frame), number=NUMBER)
+        size = len(render(frame).encode())
+        print(
+            f"{name:>16} {renderer_name:>12} {duration / NUMBER * 1e3:>10.2f} "
+            f"{size:>8}",
+        )
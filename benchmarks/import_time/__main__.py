@@ -0,0 +1,62 @@
+"""
+Measure the import time of coquille with `-X importtime`: the median,
+over several fresh interpreters, of the time spent in each module ; and
+the time it takes to build every lazy section of `coquille.sequences`,
+which its import leaves out.
+
+Run with: python benchmarks/import_time [module]
+"""
+import statistics
+import subprocess
+import sys
+
+RUNS = 30
+module = sys.argv[1] if len(sys.argv) > 1 else "coquille"
+BUILD_SCRIPT = """
+import time
+import coquille.sequences as sequences
+start = time.perf_counter()
+for name in sequences.SEQUENCES:
+    getattr(sequences, name)
+print(int((time.perf_counter() - start) * 1e6))
+"""
+# module -> (self times, cumulative times), in µs
+times: dict[str, tuple[list[int], list[int]]] = {}
+
+for _ in range(RUNS):
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    for line in output.stderr.splitlines()[1:]:
+        self_time, cumulative, name = line.split("|")
+        self_times, cumulatives = times.setdefault(name.strip(), ([], []))
+        self_times.append(int(self_time.split(":")[1]))
+        cumulatives.append(int(cumulative))
+
+print(f"{'module':>20} {'self (µs)':>10} {'cumulative (µs)':>16}")
+
+for name, (self_times, cumulatives) in sorted(
+    times.items(),
+    key=lambda item: -statistics.median(item[1][1]),
+)[:12]:
+    print(
+        f"{name:>20} {statistics.median(self_times):>10.0f} "
+        f"{statistics.median(cumulatives):>16.0f}",
+    )
+
+build_times = [
+    int(
+        subprocess.run(
+            [sys.executable, "-c", BUILD_SCRIPT],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout,
+    )
+    for _ in range(RUNS)
+]
+print(f"\nbuilding the lazy sections: {statistics.median(build_times):.0f} µs")
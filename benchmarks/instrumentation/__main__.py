@@ -0,0 +1,76 @@
+"""
+The cost of the instrumentation on the output functions: per call,
+with no instrumentation (the default), with one enabled, and with one
+enabled with a callback. The first line is a bare `write` + `flush` of
+the same string, the floor of what a call can cost.
+
+Run with: python benchmarks/instrumentation
+"""
+import io
+import os
+import time
+
+from coquille import apply
+from coquille import Coquille
+from coquille import write
+from coquille.instrumentation import disable
+from coquille.instrumentation import enable
+from coquille.sequences import bold
+
+CALLS = 100_000
+REPEATS = 5
+
+file = io.TextIOWrapper(io.BufferedWriter(io.FileIO(os.devnull, "w")))
+coquille = Coquille.new(bold, "fg_red", file=file)
+
+
+def raw() -> None:
+    for _ in range(CALLS):
+        file.write(bold)
+        file.flush()
+
+
+def apply_calls() -> None:
+    for _ in range(CALLS):
+        apply(bold, file)
+
+
+def write_calls() -> None:
+    for _ in range(CALLS):
+        write("Hello", bold, "fg_red", file=file)
+
+
+def print_calls() -> None:
+    for _ in range(CALLS):
+        coquille.print("Hello")
+
+
+def per_call(calls) -> float:
+    # the best of a few runs, in nanoseconds
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        calls()
+        best = min(best, time.perf_counter() - start)
+
+    return best / CALLS * 1e9
+
+
+print(f"{CALLS} calls, best of {REPEATS}")
+print(f"{'':>16} {'disabled (ns)':>14} {'enabled (ns)':>13} {'callback (ns)':>14}")
+
+for name, calls in (
+    ("write + flush", raw),
+    ("apply", apply_calls),
+    ("write", write_calls),
+    ("Coquille.print", print_calls),
+):
+    disabled = per_call(calls)
+    enable()
+    enabled = per_call(calls)
+    enable(lambda event: None)
+    callback = per_call(calls)
+    disable()
+
+    print(f"{name:>16} {disabled:>14.0f} {enabled:>13.0f} {callback:>14.0f}")
@@ -0,0 +1,59 @@
+"""
+Compare the ways of getting the sequence of each cell of a heatmap: the
+generic `SGR`, the palette tables and the color factories.
+
+Run with: python benchmarks/palette
+"""
+import timeit
+
+from coquille.sequences import CHAR_ESC
+from coquille.sequences import foreground_color
+from coquille.sequences import FOREGROUND_COLORS
+from coquille.sequences import foreground_truecolor
+from coquille.sequences import SGR
+
+NUMBER = 20
+# 80x24 cells
+CELLS = [(row * 80 + column) % 256 for row in range(24) for column in range(80)]
+RGB_CELLS = [(n, 255 - n, n // 2) for n in CELLS]
+
+
+def sgr_frame() -> str:
+    return "".join(SGR(38, 5, n) for n in CELLS)
+
+
+def table_frame() -> str:
+    sequences = FOREGROUND_COLORS.sequences
+
+    return "".join(sequences[n] for n in CELLS)
+
+
+def factory_frame() -> str:
+    return "".join(foreground_color(n) for n in CELLS)
+
+
+def joined_truecolor_frame() -> str:
+    return "".join(
+        CHAR_ESC + "[" + ";".join(map(str, (38, 2, r, g, b))) + "m"
+        for r, g, b in RGB_CELLS
+    )
+
+
+def truecolor_frame() -> str:
+    return "".join(foreground_truecolor(r, g, b) for r, g, b in RGB_CELLS)
+
+
+assert sgr_frame() == table_frame() == factory_frame()
+assert joined_truecolor_frame() == truecolor_frame()
+
+print(f"{'frame':>18} {'time (µs)':>10}")
+
+for frame in (
+    sgr_frame,
+    table_frame,
+    factory_frame,
+    joined_truecolor_frame,
+    truecolor_frame,
+):
+    duration = timeit.timeit(frame, number=NUMBER)
+    print(f"{frame.__name__:>18} {duration / NUMBER * 1e6:>10.0f}")
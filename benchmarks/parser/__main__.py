@@ -0,0 +1,64 @@
+"""
+Measure the throughput of the streaming parser on a colored log, fed in
+chunks of several sizes, compared to a plain regular expression split
+(which cannot handle chunks).
+
+Run with: python benchmarks/parser
+"""
+import random
+import re
+import time
+
+from coquille.parser import Parser
+from coquille.sequences import bold
+from coquille.sequences import default_background_color
+from coquille.sequences import default_foreground_color
+from coquille.sequences import foreground_color
+from coquille.sequences import foreground_truecolor
+from coquille.sequences import normal_intensity
+
+WORDS = ["INFO", "request", "served", "in", "12ms", "user", "cache", "miss"]
+SEQUENCES = [
+    bold,
+    normal_intensity,
+    foreground_color(208),
+    foreground_truecolor(255, 128, 0),
+    default_foreground_color,
+    default_background_color,
+]
+PATTERN = re.compile(r"(\x1b\[[0-?]*[ -/]*[@-~])")
+
+
+def make_log(size: int) -> str:
+    rng = random.Random(0)
+    parts: list[str] = []
+    length = 0
+
+    while length < size:
+        part = rng.choice(SEQUENCES) if rng.random() < 0.3 else rng.choice(WORDS) + " "
+        parts.append(part)
+        length += len(part)
+
+    return "".join(parts)
+
+
+LOG = make_log(8 * 1024 * 1024)
+MEGABYTES = len(LOG) / 1024 / 1024
+
+start = time.perf_counter()
+count = len(PATTERN.split(LOG))
+elapsed = time.perf_counter() - start
+print(f"{'regex split':>16}: {MEGABYTES / elapsed:7.1f} MB/s ({count} parts)")
+
+for size in (64, 4096, 65536):
+    chunks = [LOG[i : i + size] for i in range(0, len(LOG), size)]
+    parser = Parser()
+    count = 0
+    start = time.perf_counter()
+
+    for chunk in chunks:
+        for _ in parser.feed(chunk):
+            count += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"{f'chunks of {size}':>16}: {MEGABYTES / elapsed:7.1f} MB/s ({count} tokens)")
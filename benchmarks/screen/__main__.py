@@ -0,0 +1,46 @@
+"""
+Measure the cost of `Screen.render` depending on the number of changed
+cells, for two screen sizes: it should follow the former, not the latter.
+
+Run with: python benchmarks/screen
+"""
+import random
+import time
+
+from coquille.screen import Screen
+from coquille.sequences import foreground_color
+from coquille.style import Style
+
+FRAMES = 60
+STYLES = [Style.from_sequences([foreground_color(n)]) for n in range(16)]
+
+
+def bench(width: int, height: int, changed: int) -> tuple[float, float]:
+    screen = Screen(width, height)
+    screen.render()
+    rng = random.Random(0)
+    elapsed = 0.0
+    size = 0
+
+    for _ in range(FRAMES):
+        for _ in range(changed):
+            screen.put(
+                rng.randrange(height),
+                rng.randrange(width),
+                rng.choice("abcdefgh"),
+                rng.choice(STYLES),
+            )
+
+        start = time.perf_counter()
+        size += len(screen.render())
+        elapsed += time.perf_counter() - start
+
+    return elapsed / FRAMES, size / FRAMES
+
+
+print(f"{'size':>8} {'changed cells':>14} {'ms/frame':>9} {'bytes/frame':>12}")
+
+for width, height in ((300, 100), (600, 200)):
+    for changed in (0, 10, 100, 1_000, 10_000):
+        cost, size = bench(width, height, changed)
+        print(f"{width}x{height:<4} {changed:>14} {cost * 1e3:>9.3f} {size:>12.0f}")
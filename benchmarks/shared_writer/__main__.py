@@ -0,0 +1,58 @@
+"""
+Several threads logging styled records to the same stream: a global
+lock around every `write` call (which formats under the lock), versus
+a `SharedWriter` (which only locks to commit a formatted record).
+
+Run with: python benchmarks/shared_writer
+"""
+import io
+import os
+import threading
+import time
+
+from coquille import SharedWriter
+from coquille import write
+from coquille.sequences import bold
+from coquille.sequences import foreground_color
+
+RECORDS = 20_000
+
+
+def run(threads: int, shared: bool) -> float:
+    file = io.TextIOWrapper(io.BufferedWriter(io.FileIO(os.devnull, "w")))
+    target = SharedWriter(file) if shared else file
+    lock = threading.Lock()
+
+    def log(thread: int) -> None:
+        color = foreground_color(thread)
+
+        for n in range(RECORDS // threads):
+            if shared:
+                write(f"worker {thread}: record {n}", color, bold, file=target)
+            else:
+                with lock:
+                    write(f"worker {thread}: record {n}", color, bold, file=target)
+
+    workers = [threading.Thread(target=log, args=(thread,)) for thread in range(threads)]
+    start = time.perf_counter()
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    elapsed = time.perf_counter() - start
+    file.close()
+
+    return elapsed
+
+
+print(f"{RECORDS} records")
+print(f"{'threads':>8} {'global lock (ms)':>17} {'SharedWriter (ms)':>18}")
+
+for threads in (1, 2, 4, 8):
+    print(
+        f"{threads:>8} {run(threads, False) * 1e3:>17.0f} "
+        f"{run(threads, True) * 1e3:>18.0f}",
+    )
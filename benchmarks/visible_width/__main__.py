@@ -0,0 +1,48 @@
+"""
+Compare `visible_width` to what is usually hand-rolled: a regular
+expression compiled on each call and `unicodedata` for each character.
+
+Like in a table renderer, the same cells are measured again and again.
+
+Run with: python benchmarks/visible_width
+"""
+import re
+import timeit
+import unicodedata
+
+from coquille.sequences import bold
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_truecolor
+from coquille.sequences import normal_intensity
+from coquille.width import visible_width
+
+NUMBER = 200_000
+
+
+def naive_visible_width(text: str) -> int:
+    text = re.sub(r"\x1b\[[0-9;]*m", "", text)
+
+    return sum(
+        0
+        if unicodedata.combining(char)
+        else 2
+        if unicodedata.east_asian_width(char) in "WF"
+        else 1
+        for char in text
+    )
+
+
+CELLS = {
+    "plain": "Hello",
+    "styled": f"{bold}{fg_red}Hello{normal_intensity}",
+    "truecolor": f"{foreground_truecolor(255, 128, 0)}1234.56",
+    "wide": f"{fg_red}日本語{normal_intensity}",
+}
+
+print(f"{'cell':>10} {'naive (µs)':>11} {'coquille (µs)':>14}")
+
+for name, cell in CELLS.items():
+    assert naive_visible_width(cell) == visible_width(cell)
+    naive = timeit.timeit(lambda: naive_visible_width(cell), number=NUMBER)
+    fast = timeit.timeit(lambda: visible_width(cell), number=NUMBER)
+    print(f"{name:>10} {naive / NUMBER * 1e6:>11.3f} {fast / NUMBER * 1e6:>14.3f}")
@@ -0,0 +1,84 @@
+"""
+Highlight a tokenized 50k-line Python file with a `write` call per
+token, versus a single `write_many` call (and with a chunk size).
+
+Run with: python benchmarks/write_many
+"""
+import io
+import os
+import pathlib
+import time
+import token
+import tokenize
+
+from coquille import write
+from coquille import write_many
+from coquille.sequences import bold
+from coquille.sequences import fg_blue
+from coquille.sequences import fg_green
+from coquille.sequences import fg_magenta
+from coquille.sequences import italic
+
+LINES = 50_000
+SOURCE = pathlib.Path(__file__).parents[2] / "src" / "coquille" / "prelude.py"
+STYLES = {
+    token.NAME: (),
+    token.STRING: (fg_green,),
+    token.NUMBER: (fg_magenta,),
+    token.COMMENT: (italic, fg_blue),
+    token.OP: (bold,),
+}
+
+
+def spans() -> list[tuple[str, tuple[str, ...]]]:
+    source = SOURCE.read_text()
+    lines = source.splitlines(keepends=True)
+    source = "".join(lines * (LINES // len(lines) + 1))
+    result: list[tuple[str, tuple[str, ...]]] = []
+    end = (1, 0)
+
+    for current in tokenize.generate_tokens(io.StringIO(source).readline):
+        # the whitespace between tokens
+        if current.start[0] == end[0]:
+            result.append((" " * (current.start[1] - end[1]), ()))
+
+        result.append((current.string, STYLES.get(current.type, ())))
+        end = current.end
+
+    return result
+
+
+class CountingRawIO(io.FileIO):
+    syscalls = 0
+
+    def write(self, b):
+        self.syscalls += 1
+        return super().write(b)
+
+
+def run(name: str, function) -> None:
+    raw = CountingRawIO(os.devnull, "w")
+    file = io.TextIOWrapper(io.BufferedWriter(raw))
+    start = time.perf_counter()
+    function(file)
+    file.flush()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {raw.syscalls:>8} syscalls {elapsed * 1e3:>8.0f} ms")
+    file.close()
+
+
+SPANS = spans()
+print(f"{len(SPANS)} spans")
+
+
+def per_token(file) -> None:
+    for text, style in SPANS:
+        write(text, *style, end="", file=file)
+
+
+run("write per token", per_token)
+run("write_many", lambda file: write_many(SPANS, file=file))
+run(
+    "write_many, chunks of 64 KiB",
+    lambda file: write_many(SPANS, file=file, chunk_size=65536),
+)
@@ -0,0 +1,277 @@
+"""
+# Asyncio
+
+An asyncio counterpart of the output functions of coquille: nothing is
+written to the stream until the end of the current iteration of the
+event loop, where everything that was written during it is sent with a
+single non-blocking write. `await writer.drain()` applies backpressure
+when the stream is slower than the application.
+
+Sequences and names are handled like by `write` and `Coquille`. Like
+with a `SharedWriter`, the output of a `style` block is held until the
+end of the outermost one of its task, and sent as a whole, so that the
+styles of concurrent tasks do not leak into each other.
+"""
+# pyright: reportUnusedCallResult = false
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+from weakref import WeakKeyDictionary
+
+from coquille.colors import ColorDepth
+from coquille.colors import downsample
+from coquille.prelude import _format
+from coquille.prelude import _Scope
+from coquille.sequences import EscapeSequence
+from coquille.sequences import EscapeSequenceName
+from coquille.state import TerminalState
+
+__all__ = [
+    "AsyncWriter",
+]
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coquille.typeshed import SupportsWriteAndDrain
+    from coquille.typeshed import SupportsWriteAndFlush
+
+
+class _PipeProtocol(asyncio.streams.FlowControlMixin):  # type: ignore
+    """
+    The protocol of a writable pipe, with the flow control needed by
+    `StreamWriter.drain` and the close waiter of `StreamWriter.wait_closed`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        super().connection_lost(exc)
+
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def _get_close_waiter(self, stream: asyncio.StreamWriter) -> asyncio.Future[None]:
+        return self._closed
+
+
+class _TaskBuffer:
+    __slots__ = ("parts", "scopes")
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        # the active `style` blocks of the task
+        self.scopes: list[_Scope] = []
+
+
+class AsyncWriter:
+    """
+    Styled output to an `asyncio.StreamWriter` (see `AsyncWriter.open`
+    for the standard streams), batched for each iteration of the event
+    loop.
+
+    ## Example
+
+    ```py
+    >>> writer = await AsyncWriter.open()  # stdout
+    >>> writer.write("Hello", bold, "fg_red")
+    >>> with writer.style(italic):
+    ...     writer.write("World")
+    >>> await writer.drain()
+    ```
+    """
+
+    def __init__(
+        self,
+        stream: SupportsWriteAndDrain,
+        *,
+        encoding: str = "utf-8",
+        color_depth: ColorDepth = "truecolor",
+    ) -> None:
+        self.stream = stream
+        self.encoding = encoding
+        self.color_depth = color_depth
+        self._pending: list[str] = []
+        self._scheduled = False
+        self._buffers: WeakKeyDictionary[asyncio.Task[object], _TaskBuffer] = (
+            WeakKeyDictionary()
+        )
+        # the buffer of what does not run in a task
+        self._buffer_outside_tasks = _TaskBuffer()
+        # the file descriptor made non-blocking by `open`, and its mode
+        self._blocking: Optional[tuple[int, bool]] = None
+
+    @classmethod
+    async def open(
+        cls,
+        file: Optional[SupportsWriteAndFlush[str]] = None,
+        *,
+        color_depth: ColorDepth = "truecolor",
+    ) -> AsyncWriter:
+        """
+        Get a writer for `file` (by default, stdout), which must be a
+        pipe, a socket or a terminal.
+
+        The file descriptor is duplicated, so that closing the writer
+        does not close `file`, which is flushed first. The duplicate
+        shares its blocking mode, so `file` is non-blocking until the
+        writer is closed.
+        """
+
+        file = file or sys.stdout
+        file.flush()
+
+        loop = asyncio.get_running_loop()
+        fd = file.fileno()  # type: ignore
+        blocking = os.get_blocking(fd)
+        pipe = os.fdopen(os.dup(fd), "wb", buffering=0)
+        transport, protocol = await loop.connect_write_pipe(_PipeProtocol, pipe)
+        stream = asyncio.StreamWriter(transport, protocol, None, loop)
+
+        writer = cls(
+            stream,
+            encoding=getattr(file, "encoding", None) or "utf-8",
+            color_depth=color_depth,
+        )
+        writer._blocking = fd, blocking
+
+        return writer
+
+    def _buffer(self) -> _TaskBuffer:
+        task = asyncio.current_task()
+
+        if task is None:
+            return self._buffer_outside_tasks
+
+        buffer = self._buffers.get(task)
+
+        if buffer is None:
+            buffer = self._buffers[task] = _TaskBuffer()
+
+        return buffer
+
+    def _open(self, buffer: _TaskBuffer) -> _Scope:
+        # like `_Scope.open`, on top of the blocks of the task
+        enclosing = buffer.scopes[-1].state if buffer.scopes else TerminalState()
+
+        return _Scope(enclosing, enclosing)
+
+    def _send(self, string: str, buffer: Optional[_TaskBuffer] = None) -> None:
+        if not string:
+            return
+
+        buffer = buffer or self._buffer()
+
+        # held until the end of the outermost block
+        if buffer.scopes:
+            buffer.parts.append(string)
+            return
+
+        self._pending.append(string)
+
+        if not self._scheduled:
+            asyncio.get_running_loop().call_soon(self.flush)
+            self._scheduled = True
+
+    def flush(self) -> None:
+        """
+        Send what was written now, instead of at the end of the current
+        iteration of the event loop (except the output of the `style`
+        blocks that are still open).
+        """
+
+        self._scheduled = False
+
+        if not self._pending:
+            return
+
+        string = downsample("".join(self._pending), self.color_depth)
+        self._pending.clear()
+        self.stream.write(string.encode(self.encoding))
+
+    async def drain(self) -> None:
+        """
+        Send what was written, and wait until the stream can take more.
+
+        The other tasks get a turn even if it already can, so that a
+        producer that drains regularly does not hold the event loop.
+        """
+
+        self.flush()
+        await self.stream.drain()
+        await asyncio.sleep(0)
+
+    def apply(self, *sequences: Union[EscapeSequence, EscapeSequenceName]) -> None:
+        """
+        Apply escape sequences, which are not undone.
+        """
+
+        buffer = self._buffer()
+        self._send(self._open(buffer).apply(sequences), buffer)
+
+    def write(
+        self,
+        text: str,
+        *sequences: Union[EscapeSequence, EscapeSequenceName],
+        end: Optional[str] = "\n",
+    ) -> None:
+        """
+        Same as `coquille.write`: `text` is written with the sequences,
+        which are then undone.
+        """
+
+        buffer = self._buffer()
+        scope = self._open(buffer)
+        self._send(
+            scope.apply(sequences) + _format((text,), None, end) + scope.undo(),
+            buffer,
+        )
+
+    @contextmanager
+    def style(
+        self,
+        *sequences: Union[EscapeSequence, EscapeSequenceName],
+    ) -> Iterator[None]:
+        """
+        Apply the sequences for the duration of a `with` block, like a
+        `Coquille`.
+
+        The output of the block is sent at the end of the outermost block
+        of the task.
+        """
+
+        buffer = self._buffer()
+        scope = self._open(buffer)
+        string = scope.apply(sequences)
+        buffer.scopes.append(scope)
+        self._send(string, buffer)
+
+        try:
+            yield
+        finally:
+            buffer.scopes.remove(scope)
+            buffer.parts.append(scope.undo())
+
+            if not buffer.scopes:
+                self._send("".join(buffer.parts), buffer)
+                buffer.parts.clear()
+
+    async def close(self) -> None:
+        """
+        Send what was written, and close the stream.
+        """
+
+        await self.drain()
+        self.stream.close()
+        await self.stream.wait_closed()
+
+        if self._blocking is not None:
+            os.set_blocking(*self._blocking)
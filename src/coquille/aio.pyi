@@ -0,0 +1,45 @@
+import collections.abc
+import contextlib
+
+from coquille.colors import ColorDepth
+from coquille.sequences import EscapeSequence, EscapeSequenceName
+from coquille.typeshed import SupportsWriteAndDrain, SupportsWriteAndFlush
+
+__all__ = [
+    "AsyncWriter",
+]
+
+class AsyncWriter:
+    stream: SupportsWriteAndDrain
+    encoding: str
+    color_depth: ColorDepth
+
+    def __init__(
+        self,
+        stream: SupportsWriteAndDrain,
+        *,
+        encoding: str = "utf-8",
+        color_depth: ColorDepth = "truecolor",
+    ) -> None: ...
+    @classmethod
+    async def open(
+        cls,
+        file: SupportsWriteAndFlush[str] | None = None,
+        *,
+        color_depth: ColorDepth = "truecolor",
+    ) -> AsyncWriter: ...
+    def flush(self) -> None: ...
+    async def drain(self) -> None: ...
+    def apply(self, *sequences: EscapeSequence | EscapeSequenceName) -> None: ...
+    def write(
+        self,
+        text: str,
+        *sequences: EscapeSequence | EscapeSequenceName,
+        end: str | None = "\n",
+    ) -> None: ...
+    @contextlib.contextmanager
+    def style(
+        self,
+        *sequences: EscapeSequence | EscapeSequenceName,
+    ) -> collections.abc.Iterator[None]: ...
+    async def close(self) -> None: ...
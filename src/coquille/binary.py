@@ -0,0 +1,154 @@
+"""
+# Binary output
+
+A writer that emits already encoded segments to a raw file descriptor
+(using `os.writev` when available) or to a binary stream, without
+building intermediate strings.
+"""
+# pyright: reportUnusedCallResult = false
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+from typing import Union
+
+from coquille.sequences import EscapeSequence
+
+__all__ = [
+    "BinaryWriter",
+]
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coquille.typeshed import SupportsWriteAndFlush
+
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):  # pragma: no cover
+    _IOV_MAX = 1024
+
+# above this number of segments, copying them into a single buffer is
+# cheaper than letting the kernel gather them
+_WRITEV_MAX_SEGMENTS = 64
+
+
+class BinaryWriter:
+    """
+    Collect encoded segments and emit them all at once on `flush`.
+
+    `file` is either a raw file descriptor, in which case the segments
+    are written with `os.writev` (one syscall for all of them, no copy),
+    or a binary stream such as `sys.stdout.buffer`, in which case they
+    are accumulated in a reusable `bytearray`.
+
+    Many segments (e.g. one sequence and one character per cell) are
+    joined before being written to a file descriptor, as gathering them
+    is slower than copying them.
+
+    As it has `write(str)` and `flush()` methods, it can be used as the
+    `file` of `apply`, `write` or a `Coquille` ; escape sequences use
+    their cached encoded form.
+
+    ## Example
+
+    ```py
+    >>> writer = BinaryWriter(sys.stdout.fileno())
+    >>> writer.write_segments(bold.encoded, b"Hello World!", normal_intensity.encoded)
+    >>> writer.flush()
+    ```
+    """
+
+    def __init__(
+        self,
+        file: Union[int, SupportsWriteAndFlush[bytes], None] = None,
+        encoding: str = "utf-8",
+    ) -> None:
+        self.file = sys.stdout.buffer if file is None else file
+        self.encoding = encoding
+        self._segments: list[bytes] = []
+        self._buffer = bytearray()
+
+    @property
+    def pending(self) -> int:
+        """
+        The number of bytes waiting to be flushed.
+        """
+
+        return sum(map(len, self._segments)) + len(self._buffer)
+
+    def write(self, string: str) -> int:
+        """
+        Add a string segment.
+        """
+
+        if isinstance(string, EscapeSequence):
+            self.write_bytes(string.encoded)
+        else:
+            self.write_bytes(string.encode(self.encoding))
+
+        return len(string)
+
+    def write_bytes(self, segment: bytes) -> None:
+        """
+        Add an already encoded segment.
+        """
+
+        if isinstance(self.file, int):
+            self._segments.append(segment)
+        else:
+            self._buffer += segment
+
+    def write_segments(self, segments: Iterable[bytes]) -> None:
+        """
+        Add several already encoded segments.
+        """
+
+        if isinstance(self.file, int):
+            self._segments.extend(segments)
+        else:
+            for segment in segments:
+                self._buffer += segment
+
+    def flush(self) -> None:
+        """
+        Emit the pending segments.
+        """
+
+        if isinstance(self.file, int):
+            self._flush_descriptor(self.file)
+        elif self._buffer:
+            self.file.write(self._buffer)
+            self.file.flush()
+            # keeps the allocated memory around for the next segments
+            del self._buffer[:]
+
+    def _flush_descriptor(self, fd: int) -> None:
+        segments = self._segments
+        writev = hasattr(os, "writev")
+
+        if len(segments) > 1 and (not writev or len(segments) > _WRITEV_MAX_SEGMENTS):
+            segments[:] = [b"".join(segments)]
+
+        while segments:
+            if writev:
+                written = os.writev(fd, segments[:_IOV_MAX])
+            else:  # pragma: no cover
+                written = os.write(fd, segments[0])
+
+            if not written:
+                raise OSError(f"nothing could be written to file descriptor {fd}")
+
+            # drop what was written, keep the rest of a partial write
+            index = 0
+
+            while index < len(segments) and written >= len(segments[index]):
+                written -= len(segments[index])
+                index += 1
+
+            del segments[:index]
+
+            if written:
+                segments[0] = segments[0][written:]
@@ -0,0 +1,19 @@
+import collections.abc
+
+from coquille.typeshed import SupportsWriteAndFlush
+
+class BinaryWriter:
+    file: int | SupportsWriteAndFlush[bytes]
+    encoding: str
+
+    def __init__(
+        self,
+        file: int | SupportsWriteAndFlush[bytes] | None = None,
+        encoding: str = "utf-8",
+    ) -> None: ...
+    @property
+    def pending(self) -> int: ...
+    def write(self, string: str) -> int: ...
+    def write_bytes(self, segment: bytes) -> None: ...
+    def write_segments(self, segments: collections.abc.Iterable[bytes]) -> None: ...
+    def flush(self) -> None: ...
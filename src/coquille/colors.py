@@ -0,0 +1,319 @@
+"""
+# Color depth
+
+Not every terminal supports 24-bit colors: on the others, `38;2;r;g;b`
+is either ignored or approximated poorly. The color depth of a writer
+(truecolor, 256 colors, 16 colors or none) is applied to what it
+emits, turning the colors into the nearest ones it can display.
+
+RGB colors are mapped through lookup tables of 32x32x32 entries, built
+on first use, instead of searching the nearest color each time.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections.abc import Mapping
+from functools import lru_cache
+from operator import add
+from typing import Literal
+from typing import Optional
+
+from coquille.sequences import CHAR_ESC
+
+__all__ = [
+    "ColorDepth",
+    "detect_color_depth",
+    "downsample",
+    "palette_to_16",
+    "palette_to_rgb",
+    "rgb_to_16",
+    "rgb_to_256",
+]
+
+
+# "truecolor": 24-bit colors (`38;2;r;g;b`), nothing is changed
+# "256": the 256 colors of the palette (`38;5;n`)
+# "16": the 16 basic colors (`30-37`, `90-97`)
+# "none": no colors at all
+ColorDepth = Literal["truecolor", "256", "16", "none"]
+
+# the default colors of xterm
+_BASIC_COLORS: tuple[tuple[int, int, int], ...] = (
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+# the levels of each component in the 6x6x6 cube (colors 16 to 231)
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+
+def palette_to_rgb(n: int) -> tuple[int, int, int]:
+    """
+    Get the RGB components of the color `n` of the palette.
+    """
+
+    if n < 16:
+        return _BASIC_COLORS[n]
+
+    if n < 232:
+        n -= 16
+        return _CUBE_LEVELS[n // 36], _CUBE_LEVELS[n // 6 % 6], _CUBE_LEVELS[n % 6]
+
+    level = 8 + (n - 232) * 10
+
+    return level, level, level
+
+
+# *- Lookup tables -* #
+
+# each component keeps its 5 most significant bits
+_BITS = 5
+_SIZE = 1 << _BITS
+_SHIFT = 8 - _BITS
+
+
+def _level(index: int) -> int:
+    # the component a 5-bit index stands for (0 -> 0, 31 -> 255)
+    return index << _SHIFT | index >> (_BITS - _SHIFT)
+
+
+@lru_cache(maxsize=None)
+def _table_256() -> bytes:
+    levels = [_level(index) for index in range(_SIZE)]
+    # nearest level of the cube for each 5-bit component, and its error
+    cube_indices = [
+        min(range(6), key=lambda i: abs(_CUBE_LEVELS[i] - level)) for level in levels
+    ]
+    cube_errors = [
+        (_CUBE_LEVELS[cube_index] - level) ** 2
+        for cube_index, level in zip(cube_indices, levels)
+    ]
+    table = bytearray(_SIZE**3)
+    position = 0
+
+    # the basic colors are left out, as terminals often change them
+    for r in range(_SIZE):
+        for g in range(_SIZE):
+            rg_cube = 16 + 36 * cube_indices[r] + 6 * cube_indices[g]
+            rg_error = cube_errors[r] + cube_errors[g]
+
+            for b in range(_SIZE):
+                mean = (levels[r] + levels[g] + levels[b]) / 3
+                gray = min(max(round((mean - 8) / 10), 0), 23)
+                level = 8 + gray * 10
+                gray_error = (
+                    (levels[r] - level) ** 2
+                    + (levels[g] - level) ** 2
+                    + (levels[b] - level) ** 2
+                )
+
+                if gray_error < rg_error + cube_errors[b]:
+                    table[position] = 232 + gray
+                else:
+                    table[position] = rg_cube + cube_indices[b]
+
+                position += 1
+
+    return bytes(table)
+
+
+@lru_cache(maxsize=None)
+def _table_16() -> bytes:
+    # squared distance of each 5-bit component to each basic color
+    distances = [
+        [
+            [(_level(index) - color[component]) ** 2 for color in _BASIC_COLORS]
+            for index in range(_SIZE)
+        ]
+        for component in range(3)
+    ]
+    table = bytearray(_SIZE**3)
+    position = 0
+
+    for r_distances in distances[0]:
+        for g_distances in distances[1]:
+            rg_distances = list(map(add, r_distances, g_distances))
+
+            for b_distances in distances[2]:
+                total = list(map(add, rg_distances, b_distances))
+                table[position] = total.index(min(total))
+                position += 1
+
+    return bytes(table)
+
+
+def _index(r: int, g: int, b: int) -> int:
+    return (r >> _SHIFT) << (2 * _BITS) | (g >> _SHIFT) << _BITS | b >> _SHIFT
+
+
+def rgb_to_256(r: int, g: int, b: int) -> int:
+    """
+    Get the color of the palette (16 to 255) nearest to an RGB color.
+    """
+
+    return _table_256()[_index(r, g, b)]
+
+
+def rgb_to_16(r: int, g: int, b: int) -> int:
+    """
+    Get the basic color (0 to 15) nearest to an RGB color.
+    """
+
+    return _table_16()[_index(r, g, b)]
+
+
+def palette_to_16(n: int) -> int:
+    """
+    Get the basic color (0 to 15) nearest to the color `n` of the palette.
+    """
+
+    return n if n < 16 else rgb_to_16(*palette_to_rgb(n))
+
+
+# *- Sequences -* #
+
+_SGR_PATTERN = re.compile(r"\x1b\[([0-9;:]*)m")
+_EXTENDED_COLOR_CODES = ("38", "48", "58")
+# kind of extended color -> number of parameters, including the kind
+_COLOR_LENGTHS = {"5": 2, "2": 4}
+# `30-37`, `40-47`, `90-97` and `100-107`
+_BASIC_COLOR_CODES = frozenset(
+    str(base + n) for base in (30, 40, 90, 100) for n in range(8)
+)
+
+
+def _basic_color_parameter(code: str, n: int) -> str:
+    if code == "58":  # NOT STANDARD, there are no basic underline colors
+        return f"58;5;{n}"
+
+    # 38 -> 30 / 90, 48 -> 40 / 100
+    base = int(code) - 8 if n < 8 else int(code) + 52
+
+    return str(base + n % 8)
+
+
+def _color_parameter(code: str, color: list[str], depth: ColorDepth) -> Optional[str]:
+    # `color` is either [5, n] or [2, r, g, b] ; None removes it
+    if depth == "none":
+        return None
+
+    components = [min(int(value or 0), 255) for value in color[1:]]
+
+    if color[0] == "2" and depth == "256":
+        return f"{code};5;{rgb_to_256(*components)}"
+
+    if color[0] == "2":
+        return _basic_color_parameter(code, rgb_to_16(*components))
+
+    if depth == "16":
+        return _basic_color_parameter(code, palette_to_16(components[0]))
+
+    return f"{code};5;{components[0]}"
+
+
+def _downsample_parameters(parameters: str, depth: ColorDepth) -> Optional[str]:
+    # the parameters of an SGR sequence at `depth` ; None removes it
+    values = parameters.split(";")
+    result: list[str] = []
+    index = 0
+
+    while index < len(values):
+        value = values[index]
+        index += 1
+
+        if value in _EXTENDED_COLOR_CODES:
+            kind = values[index] if index < len(values) else None
+            length = _COLOR_LENGTHS.get(kind, 0)  # type: ignore
+
+            if length == 0 or index + length > len(values):
+                # not understood, the rest is left as is
+                result.extend(values[index - 1 :])
+                break
+
+            color = _color_parameter(value, values[index : index + length], depth)
+            index += length
+        elif value[:3] in ("38:", "48:", "58:"):
+            # `38:2::r:g:b` (with a color space) or `38:2:r:g:b`, `38:5:n`
+            code, kind, *color_values = value.split(":")
+
+            if kind == "2" and len(color_values) >= 3:
+                color = _color_parameter(code, [kind, *color_values[-3:]], depth)
+            elif kind == "5" and len(color_values) == 1:
+                color = _color_parameter(code, [kind, *color_values], depth)
+            else:
+                color = value
+        elif depth == "none" and value in _BASIC_COLOR_CODES:
+            color = None
+        else:
+            color = value
+
+        if color is not None:
+            result.append(color)
+
+    if parameters and not result:
+        # an empty SGR sequence would be a reset
+        return None
+
+    return ";".join(result)
+
+
+# a frame can have thousands of different colors
+@lru_cache(maxsize=65536)
+def _downsample_sequence(sequence: str, depth: ColorDepth) -> str:
+    parameters = _downsample_parameters(sequence[2:-1], depth)
+
+    return "" if parameters is None else f"{CHAR_ESC}[{parameters}m"
+
+
+def downsample(string: str, depth: ColorDepth) -> str:
+    """
+    Convert the colors of the SGR sequences in `string` to the nearest
+    ones available at `depth` (see `ColorDepth`).
+
+    With "none", colors are removed, along with the sequences that only
+    set colors ; the sequences that reset them are kept.
+    """
+
+    if depth == "truecolor" or CHAR_ESC not in string:
+        return string
+
+    return _SGR_PATTERN.sub(lambda match: _downsample_sequence(match[0], depth), string)
+
+
+def detect_color_depth(environ: Optional[Mapping[str, str]] = None) -> ColorDepth:
+    """
+    Guess the color depth of the terminal from the environment variables
+    (by default, `os.environ`): `NO_COLOR`, `COLORTERM` and `TERM`.
+    """
+
+    if environ is None:
+        environ = os.environ
+
+    term = environ.get("TERM", "")
+
+    if environ.get("NO_COLOR") or term == "dumb":
+        return "none"
+
+    if environ.get("COLORTERM", "").lower() in ("truecolor", "24bit") or term.endswith(
+        "-direct",
+    ):
+        return "truecolor"
+
+    if "256color" in term:
+        return "256"
+
+    return "16"
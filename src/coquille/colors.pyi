@@ -0,0 +1,23 @@
+import collections.abc
+import typing
+
+__all__ = [
+    "ColorDepth",
+    "detect_color_depth",
+    "downsample",
+    "palette_to_16",
+    "palette_to_rgb",
+    "rgb_to_16",
+    "rgb_to_256",
+]
+
+ColorDepth: typing.TypeAlias = typing.Literal["truecolor", "256", "16", "none"]
+
+def palette_to_rgb(n: int) -> tuple[int, int, int]: ...
+def rgb_to_256(r: int, g: int, b: int) -> int: ...
+def rgb_to_16(r: int, g: int, b: int) -> int: ...
+def palette_to_16(n: int) -> int: ...
+def downsample(string: str, depth: ColorDepth) -> str: ...
+def detect_color_depth(
+    environ: collections.abc.Mapping[str, str] | None = None,
+) -> ColorDepth: ...
@@ -0,0 +1,507 @@
+"""
+# Emulator
+
+A headless terminal: it interprets the output of coquille (text, cursor
+movements, erasures, scrolling, SGR, alternative screen buffer...) into
+a grid of cells, so that renderers can be tested and benchmarked
+without a TTY.
+
+Sequences that it does not implement are ignored.
+"""
+# pyright: reportUnusedCallResult = false
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from coquille.parser import ControlSequence
+from coquille.parser import ControlString
+from coquille.parser import Escape
+from coquille.parser import Parser
+from coquille.parser import Text
+from coquille.sequences import ALT_SCREEN_BUFFER
+from coquille.sequences import CURSOR_VISIBILITY
+from coquille.style import Style
+from coquille.width import char_width
+
+__all__ = [
+    "VirtualTerminal",
+]
+
+
+DEFAULT_STYLE = Style()
+
+AUTOWRAP = 7
+# alternative screen buffer, without saving the cursor
+_ALT_SCREEN_BUFFERS = (47, 1047)
+_DEFAULT_MODES = frozenset({AUTOWRAP, CURSOR_VISIBILITY})
+
+TAB_SIZE = 8
+
+# a control character, or a run of printable ones
+_TEXT_PATTERN = re.compile(r"([\x00-\x1f\x7f])|([^\x00-\x1f\x7f]+)")
+_PRINTABLE = 2
+
+_DEC_LINE_DRAWING = str.maketrans(
+    {
+        "`": "◆",
+        "a": "▒",
+        "f": "°",
+        "g": "±",
+        "j": "┘",
+        "k": "┐",
+        "l": "┌",
+        "m": "└",
+        "n": "┼",
+        "o": "⎺",
+        "p": "⎻",
+        "q": "─",
+        "r": "⎼",
+        "s": "⎽",
+        "t": "├",
+        "u": "┤",
+        "v": "┴",
+        "w": "┬",
+        "x": "│",
+        "y": "≤",
+        "z": "≥",
+        "{": "π",
+        "|": "≠",
+        "}": "£",
+        "~": "·",
+    },
+)
+
+
+class VirtualTerminal:
+    """
+    An in-memory terminal of `height` rows and `width` columns.
+
+    As it has `write` and `flush` methods, it can be used as the `file`
+    of `apply`, `write`, a `Coquille` or a `Screen`.
+
+    Each flush ends a frame: `frame_sizes` holds the number of bytes
+    (UTF-8) written during each one.
+
+    The effect of a line feed depends on the terminal settings: if
+    `newline_returns` is true, it also goes back to the first column,
+    like a TTY in cooked mode does.
+
+    Rows and columns are 0-based.
+
+    ## Example
+
+    ```py
+    >>> terminal = VirtualTerminal(80, 24)
+    >>> write("Hello World!", bold, file=terminal)
+    >>> terminal.lines[0].rstrip()
+    'Hello World!'
+    >>> terminal.cell(0, 0)
+    ('H', Style.from_sequences(['\\x1b[1m']))
+    ```
+    """
+
+    def __init__(
+        self,
+        width: int = 80,
+        height: int = 24,
+        *,
+        newline_returns: bool = True,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.newline_returns = newline_returns
+        self._parser = Parser()
+        self.bytes_written = 0
+        self.frame_sizes: list[int] = []
+        self._frame_size = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Go back to the initial state (like `reset_initial_state`).
+        """
+
+        self.row = 0
+        self.column = 0
+        self.pen = DEFAULT_STYLE
+        self.modes = set(_DEFAULT_MODES)
+        self.title = ""
+        self.line_drawing = False
+        self._saved: Optional[tuple[int, int, Style]] = None
+        self._chars = self._blank_rows(self.height)
+        self._styles = [[DEFAULT_STYLE] * self.width for _ in range(self.height)]
+        # the buffer that is not displayed (main or alternative)
+        self._other_chars = self._blank_rows(self.height)
+        self._other_styles = [[DEFAULT_STYLE] * self.width for _ in range(self.height)]
+        self.alternative_screen = False
+
+    # *- Output -* #
+
+    def write(self, text: str) -> int:
+        """
+        Interpret `text`.
+        """
+
+        size = len(text) if text.isascii() else len(text.encode("utf-8"))
+        self.bytes_written += size
+        self._frame_size += size
+
+        for token in self._parser.feed(text):
+            if type(token) is Text:
+                self._text(token.text)
+            elif type(token) is ControlSequence:
+                self._control_sequence(token)
+            elif type(token) is Escape:
+                self._escape(token)
+            elif type(token) is ControlString:
+                self._control_string(token)
+
+        return len(text)
+
+    def flush(self) -> None:
+        """
+        End the current frame.
+        """
+
+        if self._frame_size:
+            self.frame_sizes.append(self._frame_size)
+            self._frame_size = 0
+
+    # *- Inspection -* #
+
+    @property
+    def cursor(self) -> tuple[int, int]:
+        """
+        The position of the cursor, as (row, column).
+        """
+
+        return self.row, min(self.column, self.width - 1)
+
+    @property
+    def cursor_visible(self) -> bool:
+        return CURSOR_VISIBILITY in self.modes
+
+    @property
+    def lines(self) -> list[str]:
+        """
+        The displayed characters, row by row.
+        """
+
+        return ["".join(row) for row in self._chars]
+
+    @property
+    def text(self) -> str:
+        """
+        The displayed characters, without trailing spaces.
+        """
+
+        return "\n".join(line.rstrip() for line in self.lines).rstrip("\n")
+
+    def cell(self, row: int, column: int) -> tuple[str, Style]:
+        """
+        Get the character and the style of a cell.
+
+        The right half of a wide character is an empty string.
+        """
+
+        return self._chars[row][column], self._styles[row][column]
+
+    # *- Text -* #
+
+    def _text(self, text: str) -> None:
+        # no control characters
+        if text.isascii() and text.isprintable() and not self.line_drawing:
+            self._print_ascii(text)
+            return
+
+        for match in _TEXT_PATTERN.finditer(text):
+            run = match[0]
+
+            if match.lastindex == _PRINTABLE:
+                if self.line_drawing:
+                    run = run.translate(_DEC_LINE_DRAWING)
+
+                if run.isascii():
+                    self._print_ascii(run)
+                else:
+                    self._print(run)
+            elif run == "\n" or run == "\x0b" or run == "\x0c":
+                self._index()
+
+                if self.newline_returns:
+                    self.column = 0
+            elif run == "\r":
+                self.column = 0
+            elif run == "\b":
+                self.column = max(min(self.column, self.width - 1) - 1, 0)
+            elif run == "\t":
+                self.column = min(
+                    (self.column // TAB_SIZE + 1) * TAB_SIZE,
+                    self.width - 1,
+                )
+
+    def _wrap(self) -> None:
+        # the cursor is past the last column
+        if AUTOWRAP in self.modes:
+            self.column = 0
+            self._index()
+        else:
+            self.column = self.width - 1
+
+    def _print_ascii(self, text: str) -> None:
+        position = 0
+        length = len(text)
+        width = self.width
+
+        while position < length:
+            if self.column >= width:
+                self._wrap()
+
+            column = self.column
+            part = text[position : position + width - column]
+            end = column + len(part)
+            self._chars[self.row][column:end] = part
+            self._styles[self.row][column:end] = [self.pen] * len(part)
+            self.column = end
+            position += len(part)
+
+    def _print(self, text: str) -> None:
+        for char in text:
+            size = char_width(char)
+
+            if size == 0:
+                # combined with the previous character
+                if self.column > 0:
+                    self._chars[self.row][self.column - 1] += char
+
+                continue
+
+            if self.column + size > self.width:
+                self._wrap()
+
+                if self.column + size > self.width:
+                    continue
+
+            self._chars[self.row][self.column] = char
+            self._styles[self.row][self.column] = self.pen
+
+            if size == 2:
+                self._chars[self.row][self.column + 1] = ""
+                self._styles[self.row][self.column + 1] = self.pen
+
+            self.column += size
+
+    # *- Sequences -* #
+
+    def _control_sequence(self, sequence: ControlSequence) -> None:
+        final = sequence.final
+
+        if final == "m":
+            pen = self.pen.apply(sequence.raw)
+
+            if pen is not None:
+                self.pen = pen
+
+            return
+
+        if sequence.private or sequence.intermediates:
+            if sequence.private == "?" and final in "hl":
+                self._set_modes(sequence.parameters, final == "h")
+            elif sequence.intermediates == "!" and final == "p":
+                self._soft_reset()
+
+            return
+
+        parameters = sequence.parameters
+        # the first parameter, 0 or omitted meaning 1
+        n = (parameters[0] or 1) if parameters else 1
+        row = self.row
+        column = min(self.column, self.width - 1)
+
+        if final == "A":
+            self.row = max(row - n, 0)
+            self.column = column
+        elif final == "B":
+            self.row = min(row + n, self.height - 1)
+            self.column = column
+        elif final == "C":
+            self.column = min(column + n, self.width - 1)
+        elif final == "D":
+            self.column = max(column - n, 0)
+        elif final == "E":
+            self.row = min(row + n, self.height - 1)
+            self.column = 0
+        elif final == "F":
+            self.row = max(row - n, 0)
+            self.column = 0
+        elif final == "G":
+            self.column = min(n, self.width) - 1
+        elif final == "d":
+            self.row = min(n, self.height) - 1
+            self.column = column
+        elif final == "H" or final == "f":
+            m = (parameters[1] or 1) if len(parameters) > 1 else 1
+            self.row = min(n, self.height) - 1
+            self.column = min(m, self.width) - 1
+        elif final == "J":
+            self._erase_in_display((parameters[0] or 0) if parameters else 0)
+        elif final == "K":
+            self._erase_in_line((parameters[0] or 0) if parameters else 0)
+        elif final == "S":
+            self._scroll_up(n)
+        elif final == "T":
+            self._scroll_down(n)
+        elif final == "s":
+            self._saved = (row, column, self.pen)
+        elif final == "u":
+            self._restore_cursor(with_pen=False)
+
+    def _escape(self, escape: Escape) -> None:
+        if escape.intermediates == "(":
+            self.line_drawing = escape.final == "0"
+            return
+
+        if escape.intermediates:
+            return
+
+        final = escape.final
+
+        if final == "7":
+            self._saved = (self.row, min(self.column, self.width - 1), self.pen)
+        elif final == "8":
+            self._restore_cursor(with_pen=True)
+        elif final == "D":
+            self._index()
+        elif final == "E":
+            self._index()
+            self.column = 0
+        elif final == "M":
+            if self.row == 0:
+                self._scroll_down(1)
+            else:
+                self.row -= 1
+        elif final == "c":
+            self.reset()
+
+    def _control_string(self, string: ControlString) -> None:
+        # window title
+        if string.kind == "]":
+            code, _, title = string.data.partition(";")
+
+            if code in ("0", "2"):
+                self.title = title
+
+    def _set_modes(self, modes: tuple[Optional[int], ...], enabled: bool) -> None:
+        for mode in modes:
+            if mode is None:
+                continue
+
+            if mode == ALT_SCREEN_BUFFER or mode in _ALT_SCREEN_BUFFERS:
+                self._switch_screen(
+                    enabled,
+                    save_cursor=mode == ALT_SCREEN_BUFFER,
+                    clear=mode != 47,
+                )
+
+            if enabled:
+                self.modes.add(mode)
+            else:
+                self.modes.discard(mode)
+
+    def _soft_reset(self) -> None:
+        self.pen = DEFAULT_STYLE
+        self.modes.update(_DEFAULT_MODES)
+        self.line_drawing = False
+        self._saved = None
+
+    def _restore_cursor(self, *, with_pen: bool) -> None:
+        if self._saved is None:
+            self.row = self.column = 0
+            return
+
+        self.row, self.column, pen = self._saved
+
+        if with_pen:
+            self.pen = pen
+
+    def _switch_screen(self, alternative: bool, *, save_cursor: bool, clear: bool) -> None:
+        if alternative == self.alternative_screen:
+            return
+
+        if alternative and save_cursor:
+            self._saved = (self.row, min(self.column, self.width - 1), self.pen)
+
+        self._chars, self._other_chars = self._other_chars, self._chars
+        self._styles, self._other_styles = self._other_styles, self._styles
+        self.alternative_screen = alternative
+
+        if alternative and clear:
+            self._erase_in_display(2)
+
+        if not alternative and save_cursor:
+            self._restore_cursor(with_pen=True)
+
+    # *- Grid operations -* #
+
+    def _blank_rows(self, count: int) -> list[list[str]]:
+        return [[" "] * self.width for _ in range(count)]
+
+    def _erase_style(self) -> Style:
+        # erased cells get the current background color
+        if self.pen.background:
+            return Style(background=self.pen.background)
+
+        return DEFAULT_STYLE
+
+    def _erase(self, row: int, start: int, end: int) -> None:
+        self._chars[row][start:end] = " " * (end - start)
+        self._styles[row][start:end] = [self._erase_style()] * (end - start)
+
+    def _erase_in_line(self, mode: int) -> None:
+        column = min(self.column, self.width - 1)
+
+        if mode == 0:
+            self._erase(self.row, column, self.width)
+        elif mode == 1:
+            self._erase(self.row, 0, column + 1)
+        elif mode == 2:
+            self._erase(self.row, 0, self.width)
+
+    def _erase_in_display(self, mode: int) -> None:
+        if mode == 0:
+            self._erase_in_line(0)
+            rows = range(self.row + 1, self.height)
+        elif mode == 1:
+            self._erase_in_line(1)
+            rows = range(self.row)
+        elif mode in (2, 3):
+            rows = range(self.height)
+        else:
+            return
+
+        for row in rows:
+            self._erase(row, 0, self.width)
+
+    def _scroll_up(self, n: int) -> None:
+        n = min(n, self.height)
+        style = self._erase_style()
+        del self._chars[:n]
+        del self._styles[:n]
+        self._chars.extend(self._blank_rows(n))
+        self._styles.extend([style] * self.width for _ in range(n))
+
+    def _scroll_down(self, n: int) -> None:
+        n = min(n, self.height)
+        style = self._erase_style()
+        del self._chars[self.height - n :]
+        del self._styles[self.height - n :]
+        self._chars[:0] = self._blank_rows(n)
+        self._styles[:0] = [[style] * self.width for _ in range(n)]
+
+    def _index(self) -> None:
+        # line feed: move down, scrolling at the bottom
+        if self.row == self.height - 1:
+            self._scroll_up(1)
+        else:
+            self.row += 1
@@ -0,0 +1,43 @@
+from coquille.style import Style
+
+__all__ = [
+    "VirtualTerminal",
+]
+
+DEFAULT_STYLE: Style
+AUTOWRAP: int
+TAB_SIZE: int
+
+class VirtualTerminal:
+    width: int
+    height: int
+    newline_returns: bool
+    row: int
+    column: int
+    pen: Style
+    modes: set[int]
+    title: str
+    line_drawing: bool
+    alternative_screen: bool
+    bytes_written: int
+    frame_sizes: list[int]
+
+    def __init__(
+        self,
+        width: int = 80,
+        height: int = 24,
+        *,
+        newline_returns: bool = True,
+    ) -> None: ...
+    def reset(self) -> None: ...
+    def write(self, text: str) -> int: ...
+    def flush(self) -> None: ...
+    @property
+    def cursor(self) -> tuple[int, int]: ...
+    @property
+    def cursor_visible(self) -> bool: ...
+    @property
+    def lines(self) -> list[str]: ...
+    @property
+    def text(self) -> str: ...
+    def cell(self, row: int, column: int) -> tuple[str, Style]: ...
@@ -0,0 +1,251 @@
+"""
+# Image
+
+Render RGB pixels with truecolor half blocks: each cell shows two
+pixels, the upper one with the foreground color of `▀` and the lower
+one with the background color.
+
+Only the colors that change from a cell to the next one are emitted,
+so that runs of identical pixels cost a single character each, and a
+cell whose two pixels are identical is a space.
+
+If NumPy is installed, (height, width, 3) arrays are rendered in a
+single vectorized pass ; else, a pure-Python path is used.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any
+from typing import Optional
+from typing import Union
+
+from coquille.sequences import CHAR_ESC
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+__all__ = [
+    "HALF_BLOCK",
+    "render_half_blocks",
+]
+
+
+HALF_BLOCK = "▀"
+# the end of each line, so that the background color does not spill
+# over the next one
+_LINE_END = f"{CHAR_ESC}[0m\n"
+
+Pixel = Sequence[int]
+
+
+def render_half_blocks(pixels: Union[Sequence[Sequence[Pixel]], Any]) -> str:
+    """
+    Get the string that draws `pixels`, rows of RGB colors (e.g. a
+    NumPy array of shape (height, width, 3) and type `uint8`), as
+    `ceil(height / 2)` lines of `width` cells.
+
+    Each line ends with a reset ; the last one has no newline. If the
+    height is odd, the lower half of the last line is left empty.
+
+    Raise a `ValueError` if a component is not in 0..255.
+    """
+
+    if numpy is not None:
+        return _render_array(_as_array(pixels))
+
+    return _render_rows(pixels)
+
+
+def _check_color(color: tuple[int, ...]) -> None:
+    if not all(0 <= component <= 255 for component in color):
+        raise ValueError(f"color components must be in 0..255, got {color}")
+
+
+def _render_rows(pixels: Sequence[Sequence[Pixel]]) -> str:
+    if not pixels or not pixels[0]:
+        return ""
+
+    lines: list[str] = []
+
+    for top in range(0, len(pixels), 2):
+        upper_row = pixels[top]
+        lower_row: Optional[Sequence[Pixel]] = (
+            pixels[top + 1] if top + 1 < len(pixels) else None
+        )
+        parts: list[str] = []
+        foreground: Optional[tuple[int, ...]] = None
+        background: Optional[tuple[int, ...]] = None
+
+        for column, upper in enumerate(upper_row):
+            upper = tuple(upper)
+            lower = None if lower_row is None else tuple(lower_row[column])
+            # the foreground of a space does not matter
+            char = " " if upper == lower else HALF_BLOCK
+            parameters: list[str] = []
+
+            # every pixel is either emitted or equal to an emitted one
+            if char == HALF_BLOCK and upper != foreground:
+                _check_color(upper)
+                parameters.append("38;2;{};{};{}".format(*upper))
+                foreground = upper
+
+            if lower is not None and lower != background:
+                _check_color(lower)
+                parameters.append("48;2;{};{};{}".format(*lower))
+                background = lower
+
+            if parameters:
+                parts.append(f"{CHAR_ESC}[{';'.join(parameters)}m")
+
+            parts.append(char)
+
+        lines.append("".join(parts))
+
+    return _LINE_END.join(lines) + _LINE_END[:-1]
+
+
+# *- Vectorized path -* #
+
+# each cell is rendered into a record of 4-byte words, whose unused
+# bytes are zeros that are removed at the end:
+#   ESC [ 3 8 ; 2 ; _   R R R ;   G G G ;   B B B _     foreground
+#   ; _ _ _ or ESC [ _ _                                separator
+#   4 8 ; 2   ; _ _ _   R R R ;   G G G ;   B B B _     background
+#   m ▀ or m _ _ space                                  end, character
+# where the foreground and background are only kept if they change
+_FOREGROUND = slice(0, 5)
+_SEPARATOR = 5
+_BACKGROUND = slice(6, 11)
+_END = 11
+_RECORD_WORDS = 12
+
+
+def _as_array(pixels: Any) -> Any:
+    array = numpy.asarray(pixels)
+
+    if array.dtype == numpy.uint8:
+        return array
+
+    invalid = (array < 0) | (array > 255)
+
+    if invalid.any():
+        # the first pixel with an invalid component
+        index = numpy.argwhere(invalid)[0][:-1]
+        _check_color(tuple(array[tuple(index)].tolist()))
+
+    return array.astype(numpy.uint8)
+
+
+def _words(string: bytes) -> Any:
+    return numpy.frombuffer(string, dtype=numpy.uint8).view(numpy.uint32)
+
+
+@lru_cache(maxsize=None)
+def _tables() -> tuple[Any, Any]:
+    # the digits of each byte followed by `;`, and by a zero, as words
+    digits = [str(value).encode() for value in range(256)]
+    separated = b"".join(value.ljust(3, b"\0") + b";" for value in digits)
+    last = b"".join(value.ljust(4, b"\0") for value in digits)
+
+    return _words(separated), _words(last)
+
+
+def _pack(colors: Any) -> Any:
+    # one integer per color, to compare them at once
+    colors = colors.astype(numpy.uint32)
+
+    return colors[..., 0] << 16 | colors[..., 1] << 8 | colors[..., 2]
+
+
+def _changes(colors: Any, needed: Any) -> Any:
+    # whether each cell must emit its (packed) color: it is needed and
+    # differs from the last needed one on the same line
+    height, width = needed.shape
+    indices = numpy.where(needed, numpy.arange(width), -1)
+    # index of the last needed cell before each cell
+    previous = numpy.maximum.accumulate(indices, axis=1)
+    previous = numpy.concatenate(
+        (numpy.full((height, 1), -1), previous[:, :-1]),
+        axis=1,
+    )
+    previous_colors = numpy.take_along_axis(colors, numpy.maximum(previous, 0), axis=1)
+    differs = (previous < 0) | (colors != previous_colors)
+
+    return needed & differs
+
+
+def _render_array(pixels: Any) -> str:
+    if pixels.size == 0:
+        return ""
+
+    if pixels.ndim != 3 or pixels.shape[2] != 3:
+        raise ValueError(
+            f"expected an array of shape (height, width, 3), got {pixels.shape}",
+        )
+
+    height, width, _ = pixels.shape
+
+    if height % 2:
+        # the missing lower half: never needed, so never emitted
+        pixels = numpy.concatenate((pixels, pixels[-1:]), axis=0)
+
+    upper = pixels[0::2]
+    lower = pixels[1::2]
+    lines = upper.shape[0]
+
+    has_lower = numpy.ones((lines, width), dtype=bool)
+    has_lower[-1] &= height % 2 == 0
+    packed_upper = _pack(upper)
+    packed_lower = _pack(lower)
+    is_space = has_lower & (packed_upper == packed_lower)
+    foreground = _changes(packed_upper, ~is_space)
+    background = _changes(packed_lower, has_lower)
+
+    separated, last = _tables()
+    records = numpy.empty((lines, width, _RECORD_WORDS), dtype=numpy.uint32)
+
+    for block, prefix, colors in (
+        (_FOREGROUND, b"\x1b[38;2;\0", upper),
+        (_BACKGROUND, b"48;2;\0\0\0", lower),
+    ):
+        records[..., block.start : block.start + 2] = _words(prefix)
+        records[..., block.start + 2] = separated[colors[..., 0]]
+        records[..., block.start + 3] = separated[colors[..., 1]]
+        records[..., block.start + 4] = last[colors[..., 2]]
+
+    records[~foreground, _FOREGROUND] = 0
+    records[~background, _BACKGROUND] = 0
+
+    separator, start, empty = _words(b";\0\0\0\x1b[\0\0\0\0\0\0")
+    records[..., _SEPARATOR] = numpy.where(
+        foreground,
+        numpy.where(background, separator, empty),
+        numpy.where(background, start, empty),
+    )
+
+    # the end of the sequence, if any, and the character
+    block, space, block_end, space_end = _words(
+        b"\0" + HALF_BLOCK.encode() + b"\0\0\0 m" + HALF_BLOCK.encode() + b"m\0\0 ",
+    )
+    records[..., _END] = numpy.where(
+        foreground | background,
+        numpy.where(is_space, space_end, block_end),
+        numpy.where(is_space, space, block),
+    )
+
+    output = numpy.concatenate(
+        (
+            records.reshape(lines, width * _RECORD_WORDS).view(numpy.uint8),
+            numpy.broadcast_to(
+                numpy.frombuffer(_LINE_END.encode(), dtype=numpy.uint8),
+                (lines, len(_LINE_END)),
+            ),
+        ),
+        axis=1,
+    ).ravel()
+
+    # the zeros are the unused bytes of the records
+    return output[output != 0].tobytes()[:-1].decode()
@@ -0,0 +1,15 @@
+import collections.abc
+import typing
+
+__all__ = [
+    "HALF_BLOCK",
+    "render_half_blocks",
+]
+
+HALF_BLOCK: str
+
+Pixel: typing.TypeAlias = collections.abc.Sequence[int]
+
+def render_half_blocks(
+    pixels: collections.abc.Sequence[collections.abc.Sequence[Pixel]] | typing.Any,
+) -> str: ...
@@ -0,0 +1,234 @@
+"""
+# Instrumentation
+
+Opt-in counters of what coquille writes: the sequences requested by
+each call (by name), the bytes written, the flushes and the time spent
+in `write` and `flush`, by caller (`apply`, `write`, `Coquille.print`,
+`Coquille.__enter__`...).
+
+The output of coquille to text streams goes through a single function,
+which only checks whether an instrumentation is enabled ; when none is,
+nothing else is done. What is written to a `frame` or a `SharedWriter`
+is only counted once, when it reaches the actual stream.
+
+The writers of bytes are not instrumented: `coquille.binary.BinaryWriter`
+and `coquille.aio.AsyncWriter`.
+
+## Example
+
+```py
+>>> instrumentation = enable()
+>>> write("Hello", bold, "fg_red")
+>>> instrumentation.snapshot()["sequences"]
+{'bold': 1, 'fg_red': 1}
+>>> disable()
+```
+"""
+# pyright: reportUnusedCallResult = false
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+
+import coquille.prelude
+from coquille.sequences import EscapeSequence
+from coquille.sequences import EscapeSequenceName
+from coquille.sequences import SEQUENCES
+
+__all__ = [
+    "disable",
+    "EmitEvent",
+    "enable",
+    "Instrumentation",
+    "sequence_name",
+]
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coquille.typeshed import SupportsWriteAndFlush
+
+
+@dataclass(frozen=True)
+class EmitEvent:
+    """
+    What was written by a call of coquille, given to the callback of an
+    `Instrumentation`.
+    """
+
+    # the name of the caller, e.g. "write" or "Coquille.print"
+    source: str
+    string: str
+    # the names of the sequences it was given (see `sequence_name`)
+    sequences: tuple[str, ...]
+    # the size of `string` in UTF-8
+    bytes: int
+    flushed: bool
+    # seconds spent in `write` and in `flush`
+    write_time: float
+    flush_time: float
+
+
+@lru_cache(maxsize=None)
+def _names() -> dict[str, EscapeSequenceName]:
+    names: dict[str, EscapeSequenceName] = {}
+
+    # the first name of a sequence is the long one, the aliases follow
+    for name, sequence in SEQUENCES.items():
+        names.setdefault(sequence, name)
+
+    return names
+
+
+def sequence_name(sequence: Union[EscapeSequence, EscapeSequenceName]) -> str:
+    """
+    Get the name of a sequence: the one it is registered as (e.g.
+    "bold"), or its `repr` if it has none. Names are returned as is.
+    """
+
+    if not isinstance(sequence, EscapeSequence):
+        return sequence
+
+    return _names().get(sequence) or repr(str(sequence))
+
+
+class Instrumentation:
+    """
+    Counters of the output of coquille, updated while it is enabled
+    (see `enable`).
+
+    `callback`, if any, is called with an `EmitEvent` after each write,
+    on the thread that wrote.
+    """
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[EmitEvent], object]] = None,
+    ) -> None:
+        self.callback = callback
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Set every counter back to zero.
+        """
+
+        with self._lock:
+            self._emits = 0
+            self._bytes = 0
+            self._flushes = 0
+            self._write_time = 0.0
+            self._flush_time = 0.0
+            self._sources: Counter[str] = Counter()
+            self._sequences: Counter[str] = Counter()
+
+    def _emit(
+        self,
+        target: SupportsWriteAndFlush[str],
+        string: str,
+        flush: bool,
+        source: str,
+        sequences: Iterable[Union[EscapeSequence, EscapeSequenceName]],
+    ) -> None:
+        # the instrumented version of `coquille.prelude._emit`
+        start = time.perf_counter()
+        target.write(string)
+        written = time.perf_counter()
+
+        if flush:
+            target.flush()
+
+        flushed = time.perf_counter()
+        names = tuple(map(sequence_name, sequences))
+        size = len(string.encode(errors="surrogatepass"))
+
+        with self._lock:
+            self._emits += 1
+            self._bytes += size
+            self._flushes += flush
+            self._write_time += written - start
+            self._flush_time += flushed - written
+            self._sources[source] += 1
+            self._sequences.update(names)
+
+        if self.callback is not None:
+            self.callback(
+                EmitEvent(
+                    source,
+                    string,
+                    names,
+                    size,
+                    flush,
+                    written - start,
+                    flushed - written,
+                ),
+            )
+
+    def _request(
+        self,
+        sequences: Iterable[Union[EscapeSequence, EscapeSequenceName]],
+    ) -> None:
+        # sequences written to an in-memory stream of coquille, whose
+        # output is counted when it is emitted
+        names = tuple(map(sequence_name, sequences))
+
+        with self._lock:
+            self._sequences.update(names)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get a copy of the counters:
+        - "emits": the number of writes ;
+        - "bytes": the size of what was written, in UTF-8 ;
+        - "flushes": the number of flushes ;
+        - "write_time", "flush_time": the seconds spent in them ;
+        - "sources": the number of writes by caller ;
+        - "sequences": the number of times each sequence was requested,
+          by name.
+        """
+
+        with self._lock:
+            return {
+                "emits": self._emits,
+                "bytes": self._bytes,
+                "flushes": self._flushes,
+                "write_time": self._write_time,
+                "flush_time": self._flush_time,
+                "sources": dict(self._sources),
+                "sequences": dict(self._sequences),
+            }
+
+
+def enable(
+    callback: Optional[Callable[[EmitEvent], object]] = None,
+) -> Instrumentation:
+    """
+    Start counting the output of coquille with a new `Instrumentation`,
+    which replaces the enabled one if any.
+    """
+
+    instrumentation = Instrumentation(callback)
+    coquille.prelude._instrumentation = instrumentation
+
+    return instrumentation
+
+
+def disable() -> Optional[Instrumentation]:
+    """
+    Stop counting the output of coquille, and get the instrumentation
+    that was enabled, if any.
+    """
+
+    instrumentation = coquille.prelude._instrumentation
+    coquille.prelude._instrumentation = None
+
+    return instrumentation
@@ -0,0 +1,49 @@
+import collections.abc
+import typing
+
+from coquille.sequences import EscapeSequence, EscapeSequenceName
+
+__all__ = [
+    "disable",
+    "EmitEvent",
+    "enable",
+    "Instrumentation",
+    "sequence_name",
+]
+
+class EmitEvent:
+    source: str
+    string: str
+    sequences: tuple[str, ...]
+    bytes: int
+    flushed: bool
+    write_time: float
+    flush_time: float
+
+    def __init__(
+        self,
+        source: str,
+        string: str,
+        sequences: tuple[str, ...],
+        bytes: int,
+        flushed: bool,
+        write_time: float,
+        flush_time: float,
+    ) -> None: ...
+
+def sequence_name(sequence: EscapeSequence | EscapeSequenceName) -> str: ...
+
+class Instrumentation:
+    callback: collections.abc.Callable[[EmitEvent], object] | None
+
+    def __init__(
+        self,
+        callback: collections.abc.Callable[[EmitEvent], object] | None = None,
+    ) -> None: ...
+    def reset(self) -> None: ...
+    def snapshot(self) -> dict[str, typing.Any]: ...
+
+def enable(
+    callback: collections.abc.Callable[[EmitEvent], object] | None = None,
+) -> Instrumentation: ...
+def disable() -> Instrumentation | None: ...
@@ -0,0 +1,138 @@
+"""
+# Cursor movement
+
+Choose the cheapest way, in bytes, to move the cursor from a position
+to another, among the cursor sequences (`cursor_position`,
+`cursor_up`, `cursor_horizontal_absolute`, `cursor_next_line`...) and
+the plain control characters (carriage return, backspace, line feed).
+
+This is similar to the cost model of curses' `mvcur`.
+
+Rows and columns are 0-based.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+from coquille.sequences import CHAR_ESC
+
+__all__ = [
+    "plan_cursor_move",
+]
+
+
+CARRIAGE_RETURN = "\r"
+BACKSPACE = "\b"
+LINE_FEED = "\n"
+REVERSE_INDEX = CHAR_ESC + "M"
+
+
+def _csi(n: int, subcode: str) -> str:
+    # the parameter can be omitted when it is 1
+    return f"{CHAR_ESC}[{subcode}" if n == 1 else f"{CHAR_ESC}[{n}{subcode}"
+
+
+def _absolute(row: int, column: int) -> str:
+    if column == 0:
+        return f"{CHAR_ESC}[H" if row == 0 else f"{CHAR_ESC}[{row + 1}H"
+
+    return f"{CHAR_ESC}[{row + 1};{column + 1}H"
+
+
+def _horizontal(column: int, target: int) -> str:
+    if column == target:
+        return ""
+
+    if target == 0:
+        return CARRIAGE_RETURN
+
+    if target > column:
+        candidates = [_csi(target - column, "C")]
+    else:
+        candidates = [BACKSPACE * (column - target), _csi(column - target, "D")]
+
+    candidates.append(f"{CHAR_ESC}[{target + 1}G")
+
+    return min(candidates, key=len)
+
+
+@lru_cache(maxsize=4096)
+def _plan(
+    row: int,
+    column: int,
+    target_row: int,
+    target_column: int,
+    newline_returns: Optional[bool],
+) -> str:
+    # (vertical movement, column after it)
+    verticals: list[tuple[str, int]] = []
+    distance = target_row - row
+
+    if distance == 0:
+        verticals.append(("", column))
+    elif distance > 0:
+        verticals.append((_csi(distance, "B"), column))
+        verticals.append((_csi(distance, "E"), 0))
+
+        if newline_returns is not None:
+            verticals.append(
+                (LINE_FEED * distance, 0 if newline_returns else column),
+            )
+    else:
+        verticals.append((_csi(-distance, "A"), column))
+        verticals.append((_csi(-distance, "F"), 0))
+
+        if distance == -1:
+            verticals.append((REVERSE_INDEX, column))
+
+    candidates = [
+        vertical + _horizontal(new_column, target_column)
+        for vertical, new_column in verticals
+    ]
+    candidates.append(_absolute(target_row, target_column))
+
+    return min(candidates, key=len)
+
+
+def plan_cursor_move(
+    row: Optional[int],
+    column: Optional[int],
+    target_row: int,
+    target_column: int,
+    *,
+    overwrite: Optional[str] = None,
+    newline_returns: Optional[bool] = None,
+) -> str:
+    """
+    Get the shortest string that moves the cursor from (`row`, `column`)
+    to (`target_row`, `target_column`).
+
+    If the current position is unknown (None), an absolute position is
+    used.
+
+    `overwrite` is what is already displayed, with the current style,
+    between `column` and `target_column` on the same row: re-printing
+    it moves the cursor forward, and is sometimes the cheapest option
+    (costs are compared in UTF-8 bytes).
+
+    The effect of a line feed depends on the terminal settings: when
+    `newline_returns` is None, it is never used ; else it tells whether
+    a line feed also goes back to the first column (like in cooked mode).
+    """
+
+    if row is None or column is None:
+        return _absolute(target_row, target_column)
+
+    move = _plan(row, column, target_row, target_column, newline_returns)
+
+    if (
+        overwrite is not None
+        and row == target_row
+        and len(overwrite) == target_column - column
+        # the moves are ASCII, the text may not be
+        and len(overwrite.encode()) < len(move)
+    ):
+        return overwrite
+
+    return move
@@ -0,0 +1,9 @@
+def plan_cursor_move(
+    row: int | None,
+    column: int | None,
+    target_row: int,
+    target_column: int,
+    *,
+    overwrite: str | None = None,
+    newline_returns: bool | None = None,
+) -> str: ...
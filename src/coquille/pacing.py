@@ -0,0 +1,227 @@
+"""
+# Frame pacing
+
+Applications that redraw on every change can produce far more frames
+than a terminal can display. A `FrameScheduler` lets any thread request
+an update, and draws at most `fps` frames per second on ticks of fixed
+period, like vsync: requests made between two ticks are coalesced into
+a single frame, the superseded ones being counted as skipped.
+
+Each frame is drawn by a callback into a stream that goes through the
+usual coquille output path (`write`, `apply`, `Coquille`...), and is
+emitted as one synchronized update (see `coquille.prelude.frame`).
+"""
+# pyright: reportUnusedCallResult = false
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Optional
+from typing import TYPE_CHECKING
+
+from coquille.colors import ColorDepth
+from coquille.prelude import FlushPolicy
+from coquille.prelude import frame
+
+__all__ = [
+    "FrameScheduler",
+    "FrameStats",
+]
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coquille.typeshed import SupportsWriteAndFlush
+
+
+@dataclass(frozen=True)
+class FrameStats:
+    """
+    A snapshot of the counters of a `FrameScheduler`.
+    """
+
+    # frames emitted
+    frames: int
+    # update requests
+    requests: int
+    # requests superseded by a later one before the next frame
+    skipped: int
+    # ticks that passed while a frame was being drawn
+    late_ticks: int
+    # seconds spent drawing and emitting the frames
+    frame_time: float
+    # the longest of them
+    max_frame_time: float
+    # bytes emitted in the encoding of the file, synchronization
+    # sequences included
+    bytes: int
+
+    @property
+    def mean_frame_time(self) -> float:
+        return self.frame_time / self.frames if self.frames else 0.0
+
+    @property
+    def bytes_per_frame(self) -> float:
+        return self.bytes / self.frames if self.frames else 0.0
+
+
+class FrameScheduler:
+    """
+    Draw frames with `render` to `file` (by default, stdout), at most
+    `fps` times per second and only when an update was requested.
+
+    `render` is called on the thread of the scheduler, with the stream
+    of the frame.
+
+    ## Example
+
+    ```py
+    >>> def render(out):
+    ...     apply(cursor_position(1, 1), out)
+    ...     write(f"{done}/{total} files", bold, end="", file=out)
+    >>> scheduler = FrameScheduler(render, fps=30)
+    >>> # in any thread
+    >>> done += 1
+    >>> scheduler.request()
+    >>> scheduler.close()  # draws the last update
+    ```
+
+    With a `Screen`, `render` writes `screen.render()` to the stream.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[SupportsWriteAndFlush[str]], object],
+        file: Optional[SupportsWriteAndFlush[str]] = None,
+        fps: float = 60,
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
+    ) -> None:
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+
+        self.render = render
+        self.file = file
+        self.interval = 1 / fps
+        self.flush_policy: FlushPolicy = flush_policy
+        self.color_depth: ColorDepth = color_depth
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._frames = 0
+        self._requests = 0
+        self._skipped = 0
+        self._late_ticks = 0
+        self._frame_time = 0.0
+        self._max_frame_time = 0.0
+        self._bytes = 0
+        self._thread = threading.Thread(
+            target=self._run,
+            name="coquille-frames",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def request(self) -> None:
+        """
+        Ask for a frame to be drawn at the next tick.
+        """
+
+        with self._condition:
+            if self._closed:
+                raise ValueError("update requested from a closed FrameScheduler")
+
+            self._pending += 1
+            self._requests += 1
+            self._condition.notify_all()
+
+    def _draw(self) -> int:
+        # the number of bytes emitted
+        target = self.file or sys.stdout
+
+        with frame(target, self.flush_policy, self.color_depth) as buffer:
+            self.render(buffer)
+
+        encoding = getattr(target, "encoding", None) or "utf-8"
+
+        return len(buffer.output.encode(encoding, errors="replace"))  # type: ignore
+
+    def _run(self) -> None:
+        tick = time.monotonic()
+
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+
+                # wait for the tick, unless the scheduler is closed
+                while not self._closed and time.monotonic() < tick:
+                    self._condition.wait(tick - time.monotonic())
+
+                if not self._pending:
+                    return
+
+                requests = self._pending
+                self._pending = 0
+
+            start = time.monotonic()
+            # after a pause, the ticks start again from now
+            tick = max(tick, start)
+
+            try:
+                size = self._draw()
+            except BaseException as error:
+                with self._condition:
+                    self._error = error
+                    self._closed = True
+
+                return
+
+            end = time.monotonic()
+            # the ticks that passed while drawing are late
+            late = int((end - tick) / self.interval)
+            tick += (late + 1) * self.interval
+
+            with self._condition:
+                self._frames += 1
+                # all of the requests but the last one were superseded
+                self._skipped += requests - 1
+                self._late_ticks += late
+                self._frame_time += end - start
+                self._max_frame_time = max(self._max_frame_time, end - start)
+                self._bytes += size
+
+    def stats(self) -> FrameStats:
+        """
+        Get the current counters.
+        """
+
+        with self._condition:
+            return FrameStats(
+                self._frames,
+                self._requests,
+                self._skipped,
+                self._late_ticks,
+                self._frame_time,
+                self._max_frame_time,
+                self._bytes,
+            )
+
+    def close(self) -> None:
+        """
+        Draw the pending update, if any, and stop the scheduler.
+
+        If `render` failed, the error is raised here.
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+
+        if self._error is not None:
+            raise self._error
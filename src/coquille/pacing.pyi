@@ -0,0 +1,53 @@
+import collections.abc
+
+from coquille.colors import ColorDepth
+from coquille.prelude import FlushPolicy
+from coquille.typeshed import SupportsWriteAndFlush
+
+__all__ = [
+    "FrameScheduler",
+    "FrameStats",
+]
+
+class FrameStats:
+    frames: int
+    requests: int
+    skipped: int
+    late_ticks: int
+    frame_time: float
+    max_frame_time: float
+    bytes: int
+
+    def __init__(
+        self,
+        frames: int,
+        requests: int,
+        skipped: int,
+        late_ticks: int,
+        frame_time: float,
+        max_frame_time: float,
+        bytes: int,
+    ) -> None: ...
+    @property
+    def mean_frame_time(self) -> float: ...
+    @property
+    def bytes_per_frame(self) -> float: ...
+
+class FrameScheduler:
+    render: collections.abc.Callable[[SupportsWriteAndFlush[str]], object]
+    file: SupportsWriteAndFlush[str] | None
+    interval: float
+    flush_policy: FlushPolicy
+    color_depth: ColorDepth
+
+    def __init__(
+        self,
+        render: collections.abc.Callable[[SupportsWriteAndFlush[str]], object],
+        file: SupportsWriteAndFlush[str] | None = None,
+        fps: float = 60,
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
+    ) -> None: ...
+    def request(self) -> None: ...
+    def stats(self) -> FrameStats: ...
+    def close(self) -> None: ...
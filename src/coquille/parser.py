@@ -0,0 +1,250 @@
+"""
+# Parser
+
+An incremental parser that reads text containing escape sequences back
+into tokens: runs of plain text, control sequences (CSI), control
+strings (OSC, DCS, SOS, PM, APC) and other escape sequences (Fe, Fp,
+Fs, nF such as `RIS`, `DECSC` or `DEC_line_drawing`).
+
+The text can be fed in arbitrary chunks, even if they split a sequence:
+the incomplete end of a chunk is kept until the next one.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+from coquille.sequences import SEQUENCES
+
+__all__ = [
+    "ControlSequence",
+    "ControlString",
+    "Escape",
+    "parse",
+    "Parser",
+    "Text",
+    "Token",
+]
+
+
+# sequence -> name of the first registered sequence equal to it
+_NAMES: dict[str, str] = {}
+
+for _name, _sequence in SEQUENCES.items():
+    _NAMES.setdefault(_sequence, _name)
+
+# final byte of a CSI sequence -> name of the factory
+_CONTROL_SEQUENCE_FACTORIES: dict[str, str] = {
+    "A": "cursor_up",
+    "B": "cursor_down",
+    "C": "cursor_forward",
+    "D": "cursor_back",
+    "E": "cursor_next_line",
+    "F": "cursor_previous_line",
+    "G": "cursor_horizontal_absolute",
+    "H": "cursor_position",
+    "J": "erase_in_display",
+    "K": "erase_in_line",
+    "S": "scroll_up",
+    "T": "scroll_down",
+    "f": "horizontal_vertical_position",
+    "m": "select_graphical_rendition",
+    "~": "numpad",
+}
+
+_CONTROL_STRING_NAMES: dict[str, str] = {
+    "P": "device_control_string",
+    "X": "start_of_string",
+    "]": "operating_system_command",
+    "^": "privacy_message",
+    "_": "application_program_command",
+}
+
+
+class Text(NamedTuple):
+    text: str
+
+
+class ControlSequence(NamedTuple):
+    """
+    `ESC [ <private> <parameters> <intermediates> <final>`
+    """
+
+    raw: str
+    private: str
+    parameter_string: str
+    intermediates: str
+    final: str
+
+    @property
+    def parameters(self) -> tuple[Optional[int], ...]:
+        """
+        The numeric parameters ; omitted ones are None.
+        """
+
+        if not self.parameter_string:
+            return ()
+
+        return tuple(
+            int(parameter) if parameter.isdigit() else None
+            for parameter in self.parameter_string.split(";")
+        )
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        The name of the matching coquille sequence (e.g. "bold") or, if
+        it is not a constant, the name of its factory (e.g. "cursor_up").
+        """
+
+        name = _NAMES.get(self.raw)
+
+        if name is None and not self.private and not self.intermediates:
+            return _CONTROL_SEQUENCE_FACTORIES.get(self.final)
+
+        return name
+
+
+class ControlString(NamedTuple):
+    """
+    `ESC <kind> <data> ST`, where `kind` is one of `] P X ^ _` and ST is
+    either `ESC \\` or BEL.
+    """
+
+    raw: str
+    kind: str
+    data: str
+
+    @property
+    def name(self) -> Optional[str]:
+        return _CONTROL_STRING_NAMES.get(self.kind)
+
+
+class Escape(NamedTuple):
+    """
+    `ESC <intermediates> <final>`
+    """
+
+    raw: str
+    intermediates: str
+    final: str
+
+    @property
+    def name(self) -> Optional[str]:
+        return _NAMES.get(self.raw)
+
+
+Token = Union[Text, ControlSequence, ControlString, Escape]
+
+
+# one alternative per kind of token, see `Parser.feed`
+_TOKEN_PATTERN = re.compile(
+    r"""
+        ( [^\x1b]+ )
+      | ( \x1b\[ ([<=>?]*) ([0-;]*) ([\x20-\x2f]*) ([\x40-\x7e]) )
+      | ( \x1b ([\]PX^_]) (.*?) (?:\x07|\x1b\\) )
+      | ( \x1b (?![\[\]PX^_]) ([\x20-\x2f]*) ([\x30-\x7e]) )
+      | \x1b
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_TEXT = 1
+_CONTROL_SEQUENCE = 2
+_CONTROL_STRING = 7
+_ESCAPE = 10
+
+# the beginning of a sequence, which might be completed by the next chunk
+_PARTIAL_PATTERN = re.compile(
+    r"\x1b(?:\[[\x30-\x3f]*[\x20-\x2f]*|[\]PX^_].*|[\x20-\x2f]*)",
+    re.DOTALL,
+)
+
+MAX_SEQUENCE_LENGTH = 65536
+
+
+class Parser:
+    """
+    A streaming parser, see `Parser.feed`.
+
+    Only an incomplete sequence at the end of a chunk is kept in memory,
+    up to `max_sequence_length` characters ; beyond that, it is given
+    back as text.
+
+    ## Example
+
+    ```py
+    >>> parser = Parser()
+    >>> list(parser.feed("Hello \\x1b[1"))
+    [Text(text='Hello ')]
+    >>> list(parser.feed("mWorld"))
+    [ControlSequence(raw='\\x1b[1m', ...), Text(text='World')]
+    ```
+    """
+
+    def __init__(self, max_sequence_length: int = MAX_SEQUENCE_LENGTH) -> None:
+        self.max_sequence_length = max_sequence_length
+        self._pending = ""
+
+    def feed(self, chunk: str) -> Iterator[Token]:
+        """
+        Parse `chunk`, yielding the tokens it completes.
+        """
+
+        data = self._pending + chunk if self._pending else chunk
+        self._pending = ""
+        # skips the checks of the generated `__new__`
+        new = tuple.__new__
+
+        # the outer group of each alternative is the last one to close
+        for match in _TOKEN_PATTERN.finditer(data):
+            kind = match.lastindex
+
+            if kind == _TEXT:
+                yield new(Text, (match[1],))
+            elif kind == _CONTROL_SEQUENCE:
+                yield new(ControlSequence, match.group(2, 3, 4, 5, 6))
+            elif kind == _ESCAPE:
+                yield new(Escape, match.group(10, 11, 12))
+            elif kind == _CONTROL_STRING:
+                yield new(ControlString, match.group(7, 8, 9))
+            else:
+                index = match.start()
+
+                if _PARTIAL_PATTERN.fullmatch(data, index):
+                    if len(data) - index <= self.max_sequence_length:
+                        self._pending = data[index:]
+                    else:
+                        yield Text(data[index:])
+
+                    return
+
+                # a lone ESC
+                yield Text("\x1b")
+
+    def close(self) -> Iterator[Token]:
+        """
+        Give back an incomplete sequence left at the end of the stream
+        as text.
+        """
+
+        if self._pending:
+            yield Text(self._pending)
+            self._pending = ""
+
+
+def parse(chunks: Union[str, Iterable[str]]) -> Iterator[Token]:
+    """
+    Parse a string, or an iterable of chunks (e.g. a file opened in text
+    mode), into tokens.
+    """
+
+    parser = Parser()
+
+    for chunk in (chunks,) if isinstance(chunks, str) else chunks:
+        yield from parser.feed(chunk)
+
+    yield from parser.close()
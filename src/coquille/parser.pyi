@@ -0,0 +1,58 @@
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import NamedTuple
+from typing import TypeAlias
+
+__all__ = [
+    "ControlSequence",
+    "ControlString",
+    "Escape",
+    "parse",
+    "Parser",
+    "Text",
+    "Token",
+]
+
+MAX_SEQUENCE_LENGTH: int
+
+class Text(NamedTuple):
+    text: str
+
+class ControlSequence(NamedTuple):
+    raw: str
+    private: str
+    parameter_string: str
+    intermediates: str
+    final: str
+
+    @property
+    def parameters(self) -> tuple[int | None, ...]: ...
+    @property
+    def name(self) -> str | None: ...
+
+class ControlString(NamedTuple):
+    raw: str
+    kind: str
+    data: str
+
+    @property
+    def name(self) -> str | None: ...
+
+class Escape(NamedTuple):
+    raw: str
+    intermediates: str
+    final: str
+
+    @property
+    def name(self) -> str | None: ...
+
+Token: TypeAlias = Text | ControlSequence | ControlString | Escape
+
+class Parser:
+    max_sequence_length: int
+
+    def __init__(self, max_sequence_length: int = ...) -> None: ...
+    def feed(self, chunk: str) -> Iterator[Token]: ...
+    def close(self) -> Iterator[Token]: ...
+
+def parse(chunks: str | Iterable[str]) -> Iterator[Token]: ...
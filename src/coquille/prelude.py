@@ -2,27 +2,58 @@
 from __future__ import annotations
 
 import sys
+import threading
 from abc import abstractmethod
+from collections import deque
 from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
+from dataclasses import field
+from io import StringIO
+from typing import Literal
 from typing import Optional
 from typing import overload
 from typing import Protocol
 from typing import TYPE_CHECKING
 from typing import Union
+from weakref import finalize
+from weakref import WeakKeyDictionary
+from weakref import WeakMethod
 
+from coquille.colors import ColorDepth
+from coquille.colors import downsample
+from coquille.sequences import begin_synchronized_update
+from coquille.sequences import coalesce_sequences
+from coquille.sequences import end_synchronized_update
 from coquille.sequences import EscapeSequence
 from coquille.sequences import EscapeSequenceName
 from coquille.sequences import get_sequence_from_name
+from coquille.sequences import reset_initial_state
 from coquille.sequences import soft_reset
+from coquille.state import is_stateless
+from coquille.state import TerminalState
+from coquille.style import Style
 
 __all__ = [
     "apply",
+    "BackgroundWriter",
+    "BackgroundWriterStats",
+    "ColorDepth",
     "Coquille",
+    "CompiledCoquille",
     "EscapeSequence",
     "EscapeSequenceName",
+    "FlushPolicy",
+    "frame",
     "prepare",
+    "QueuePolicy",
+    "SharedWriter",
+    "StatefulWriter",
+    "TerminalState",
     "write",
+    "write_many",
 ]
 
 
@@ -33,10 +64,33 @@ if TYPE_CHECKING:  # pragma: no cover
 
         P = ParamSpec("P")
 
+    from coquille.instrumentation import Instrumentation
     from coquille.typeshed import Self
     from coquille.typeshed import SupportsWriteAndFlush
 
 
+# "call": flush after every output call (default)
+# "line": flush only when the emitted string contains a newline
+# "manual": never flush, leave it to the caller (`file.flush()`)
+FlushPolicy = Literal["call", "line", "manual"]
+
+# what a `BackgroundWriter` does with a record when its queue is full:
+# "block": wait for room (default)
+# "drop_oldest": drop the oldest queued record
+# "drop_newest": drop the new record
+# "coalesce": drop every queued record, for records that each redraw
+#   the whole screen
+QueuePolicy = Literal["block", "drop_oldest", "drop_newest", "coalesce"]
+
+# the style of a span: a sequence, several, or a `Style`
+SpanStyle = Union[
+    EscapeSequence,
+    EscapeSequenceName,
+    Iterable[Union[EscapeSequence, EscapeSequenceName]],
+    Style,
+]
+
+
 def prepare(
     sequence: Union[EscapeSequence, EscapeSequenceName, Callable[P, EscapeSequence]],
     *args: P.args,
@@ -86,14 +140,222 @@ def apply(
     """
 
     string: EscapeSequence = prepare(sequence, *args, **kwargs)
-    target = file or sys.stdout
+    _emit(file or sys.stdout, string, source="apply", sequences=(string,))
+
+
+# the active instrumentation, see `coquille.instrumentation`
+_instrumentation: Optional[Instrumentation] = None
+
+
+def _emit(
+    target: SupportsWriteAndFlush[str],
+    string: str,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
+    source: str = "emit",
+    sequences: Iterable[Union[EscapeSequence, EscapeSequenceName]] = (),
+) -> str:
+    """
+    Write `string` to `target` in a single call, then flush it
+    according to `flush_policy`, and get what was written.
+
+    Its colors are converted to `color_depth` first. `source` (the name
+    of the caller) and the `sequences` it was given are only used by the
+    instrumentation.
+    """
+
+    if color_depth != "truecolor":
+        string = downsample(string, color_depth)
+
+    if not string:
+        return string
+
+    flush = flush_policy == "call" or (flush_policy == "line" and "\n" in string)
+
+    if _instrumentation is not None:
+        # the output of frames and shared writers is counted when it
+        # reaches the actual stream
+        if isinstance(target, (_FrameBuffer, SharedWriter)):
+            _instrumentation._request(sequences)
+        else:
+            _instrumentation._emit(target, string, flush, source, sequences)
+            return string
+
     target.write(string)
-    target.flush()
+
+    if flush:
+        target.flush()
+
+    return string
+
+
+def _format(values: tuple[object, ...], sep: Optional[str], end: Optional[str]) -> str:
+    """
+    Format `values` the same way built-in `print` does.
+    """
+
+    return (" " if sep is None else sep).join(map(str, values)) + (
+        "\n" if end is None else end
+    )
+
+
+def _transition(
+    state: TerminalState,
+    sequences: Iterable[EscapeSequence],
+    base: Optional[TerminalState] = None,
+    reset_allowed: bool = True,
+) -> tuple[TerminalState, str, bool]:
+    """
+    Apply `sequences` to `base` (by default, `state`), skipping the ones
+    that change nothing, from `state` (see `TerminalState.delta` for
+    `reset_allowed`).
+
+    Return the new state, the string to emit, and whether a sequence
+    whose effect is not modeled (and is not stateless) was emitted.
+    """
+
+    parts: list[str] = []
+    current = state
+    target = state if base is None else base
+    unmodeled = False
+
+    for sequence in sequences:
+        new_state = target.apply(sequence)
+
+        # soft reset and RIS are modeled, but have effects beyond it
+        if new_state is None or sequence in (soft_reset, reset_initial_state):
+            parts.append(current.delta(target, reset_allowed))
+            parts.append(sequence)
+            current = target = new_state or target
+            unmodeled |= new_state is None and not is_stateless(sequence)
+        else:
+            target = new_state
+
+    parts.append(current.delta(target, reset_allowed))
+
+    return target, "".join(parts), unmodeled
+
+
+@dataclass(eq=False)
+class _Scope:
+    """
+    Escape sequences applied on top of the state of an enclosing scope,
+    which can be undone.
+    """
+
+    enclosing: TerminalState = field(default_factory=TerminalState)
+    state: TerminalState = field(default_factory=TerminalState)
+    # if a sequence with an unknown effect was applied, `state` is not
+    # reliable anymore and it can only be undone with a soft reset
+    dirty: bool = False
+
+    @classmethod
+    def open(cls, target: SupportsWriteAndFlush[str]) -> _Scope:
+        scopes = _scope_stack(target)
+        enclosing = scopes[-1].state if scopes else TerminalState()
+
+        return cls(enclosing, enclosing)
+
+    def apply(self, sequences: Iterable[Union[EscapeSequence, EscapeSequenceName]]) -> str:
+        """
+        Apply `sequences` and get the string to emit.
+        """
+
+        sequences = list(map(prepare, sequences))
+
+        if self.dirty:
+            for sequence in sequences:
+                self.state = self.state.apply(sequence) or self.state
+
+            return coalesce_sequences(sequences)
+
+        self.state, string, self.dirty = _transition(self.state, sequences)
+
+        return string
+
+    def switch(
+        self,
+        sequences: Iterable[Union[EscapeSequence, EscapeSequenceName]],
+    ) -> str:
+        """
+        Replace what was applied by `sequences`, and get the string to
+        emit, going directly from the current state to the new one.
+
+        Like `undo`, it never resets the whole rendition, which would
+        also remove the styling of the enclosing scope.
+        """
+
+        if self.dirty:
+            return self.undo() + self.apply(sequences)
+
+        self.state, string, self.dirty = _transition(
+            self.state,
+            map(prepare, sequences),
+            self.state.undo_target(self.enclosing),
+            reset_allowed=False,
+        )
+
+        return string
+
+    def undo(self) -> str:
+        """
+        Get the string that brings back the enclosing state, and go back
+        to it.
+        """
+
+        if self.dirty:
+            reset_state: TerminalState = self.state.apply(soft_reset)  # type: ignore
+            string = soft_reset + reset_state.delta(
+                self.state.undo_target(self.enclosing),
+            )
+        else:
+            string = self.state.undo(self.enclosing)
+
+        self.state = self.enclosing
+        self.dirty = False
+
+        return string
+
+    def push(self, target: SupportsWriteAndFlush[str]) -> None:
+        scopes = _scope_stack(target, create=True)
+
+        if scopes is not None:
+            scopes.append(self)
+
+    def pop(self, target: SupportsWriteAndFlush[str]) -> None:
+        scopes = _scope_stack(target)
+
+        if scopes and self in scopes:
+            scopes.remove(self)
+
+
+# active `with` blocks, by stream
+_scopes: WeakKeyDictionary[SupportsWriteAndFlush[str], list[_Scope]] = WeakKeyDictionary()
+
+
+def _scope_stack(
+    target: SupportsWriteAndFlush[str],
+    create: bool = False,
+) -> Optional[list[_Scope]]:
+    """
+    Get the active `with` blocks of `target`.
+    """
+
+    # the ones of a shared writer are tracked for each thread
+    if isinstance(target, SharedWriter):
+        return target._buffer().scopes
+
+    try:
+        return _scopes.setdefault(target, []) if create else _scopes.get(target)
+    except TypeError:  # the stream does not support weak references
+        return None
 
 
 class CoquilleLike(Protocol):
     sequences: list[EscapeSequence]
     file: Optional[SupportsWriteAndFlush[str]]
+    flush_policy: FlushPolicy
+    color_depth: ColorDepth
 
     @abstractmethod
     def print(
@@ -105,10 +367,37 @@ class CoquilleLike(Protocol):
         pass
 
 
+def _print(
+    coquille: CoquilleLike,
+    values: tuple[object, ...],
+    sep: Optional[str],
+    end: Optional[str],
+    source: str,
+) -> None:
+    """
+    Print `values` with the sequences of `coquille`, see `Coquille.print`.
+    """
+
+    target = coquille.file or sys.stdout
+    scope = _Scope.open(target)
+
+    _emit(
+        target,
+        scope.apply(coquille.sequences) + _format(values, sep, end) + scope.undo(),
+        coquille.flush_policy,
+        coquille.color_depth,
+        source,
+        coquille.sequences,
+    )
+
+
 @dataclass
 class _ContextCoquille:
     sequences: list[EscapeSequence]
     file: Optional[SupportsWriteAndFlush[str]]
+    flush_policy: FlushPolicy = "call"
+    color_depth: ColorDepth = "truecolor"
+    scope: _Scope = field(default_factory=_Scope, repr=False)
 
     def apply(self, sequence: Union[EscapeSequence, EscapeSequenceName]) -> None:
         """
@@ -116,17 +405,32 @@ class _ContextCoquille:
         in live.
 
         It is not added to the base `coquille.sequences`, but will still
-        be reset at the end of the block.
+        be undone at the end of the block. It is not emitted if it is
+        already active.
         """
 
-        apply(sequence, self.file)
+        _emit(
+            self.file or sys.stdout,
+            self.scope.apply((sequence,)),
+            self.flush_policy,
+            self.color_depth,
+            "Coquille.apply",
+            (sequence,),
+        )
 
     def reset(self) -> None:
         """
-        Reset the currently active escape sequences of the `with` block.
+        Reset the currently active escape sequences of the `with` block,
+        going back to the style of the enclosing one.
         """
 
-        apply(soft_reset, self.file)
+        _emit(
+            self.file or sys.stdout,
+            self.scope.undo(),
+            self.flush_policy,
+            self.color_depth,
+            "Coquille.reset",
+        )
 
     def print(
         self,
@@ -146,19 +450,29 @@ class _ContextCoquille:
         ```
         """
 
-        Coquille.print(self, *values, sep=sep, end=end)
+        _print(self, values, sep, end, "Coquille.print")
 
 
 @dataclass
 class Coquille:
     sequences: list[EscapeSequence]
     file: Optional[SupportsWriteAndFlush[str]]
+    flush_policy: FlushPolicy = "call"
+    color_depth: ColorDepth = "truecolor"
+    _contexts: list[_ContextCoquille] = field(
+        default_factory=list,
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     @overload
     @classmethod
     def new(
         cls: type[Self],
         *sequences: Union[EscapeSequence, EscapeSequenceName],
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
     ) -> Self:  # pragma: no cover
         pass
 
@@ -168,6 +482,8 @@ class Coquille:
         cls: type[Self],
         *sequences: Union[EscapeSequence, EscapeSequenceName],
         file: SupportsWriteAndFlush[str],
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
     ) -> Self:  # pragma: no cover
         pass
 
@@ -176,12 +492,14 @@ class Coquille:
         cls: type[Self],
         *sequences: Union[EscapeSequence, EscapeSequenceName],
         file: Optional[SupportsWriteAndFlush[str]] = None,
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
     ) -> Self:
         """
         Convenient constructor for a Coquille.
         """
 
-        return cls(list(sequences), file)
+        return cls(list(sequences), file, flush_policy, color_depth)
 
     def print(
         self: CoquilleLike,
@@ -201,11 +519,7 @@ class Coquille:
         ```
         """
 
-        for sequence in self.sequences:
-            apply(sequence, self.file)
-
-        print(*values, sep=sep, end=end, file=self.file)
-        apply(soft_reset)
+        _print(self, values, sep, end, "Coquille.print")
 
     def write(
         self,
@@ -230,17 +544,44 @@ class Coquille:
 
         The previous example is roughly equivalent to:
         ```py
-        >>> print("\x1b[35m", end="")
-        >>> print("\x1b[3m", end="")
-        >>> print("Hello World!")
-        >>> print("\x1b[!p", end="")
+        >>> print("\x1b[3;38;5;5mHello World!\n\x1b[0m", end="")
         ```
 
-        Note that the soft reset sequence is used rather than SGR reset `x1b[0m`,
-        because the range of allowed escape sequences is larger than SGR.
+        Consecutive SGR sequences are merged into one ; then the
+        sequences, the text and the reset are emitted with a single
+        `write` call, followed by at most one `flush` depending on the
+        coquille's `flush_policy`.
+
+        Only what was applied is reset, with the shortest sequence
+        possible ; inside of a `with` block, its style is restored.
         """
 
-        self.print(text, end=end)
+        _print(self, (text,), None, end, "Coquille.write")
+
+    def compile(self) -> CompiledCoquille:
+        """
+        Resolve the coquille's sequences once into a template, for code
+        that styles the same way over and over.
+
+        ## Example
+
+        ```py
+        >>> error = Coquille.new(bold, fg_red, file=sys.stderr).compile()
+        >>> for message in messages:
+        ...     error.write(message)
+        ```
+
+        Unlike `Coquille.write`, the template is not aware of the `with`
+        block it is used in: it always undoes its sequences to go back
+        to the default style. Its colors are converted to the coquille's
+        `color_depth` once, the written text is left as is.
+        """
+
+        scope = _Scope()
+        prefix = downsample(scope.apply(self.sequences), self.color_depth)
+        suffix = downsample(scope.undo(), self.color_depth)
+
+        return CompiledCoquille(prefix, suffix, self.file, self.flush_policy)
 
     def __enter__(self) -> _ContextCoquille:
         """
@@ -251,19 +592,103 @@ class Coquille:
         only make sense inside the `with` block, such as `coquille.reset()`.
         """
 
-        for sequence in self.sequences:
-            apply(sequence, self.file)
+        target = self.file or sys.stdout
+        scope = _Scope.open(target)
+
+        # pushed first, so that a shared writer holds the output back
+        scope.push(target)
+        _emit(
+            target,
+            scope.apply(self.sequences),
+            self.flush_policy,
+            self.color_depth,
+            "Coquille.__enter__",
+            self.sequences,
+        )
 
-        return _ContextCoquille(self.sequences, self.file)
+        context = _ContextCoquille(
+            self.sequences,
+            self.file,
+            self.flush_policy,
+            self.color_depth,
+            scope,
+        )
+        self._contexts.append(context)
+
+        return context
 
     def __exit__(self, *_) -> None:
         """
         Leave the Coquille context.
 
-        Soft reset the escape sequences applied since then.
+        Undo the escape sequences applied since then, restoring the
+        style of the enclosing context if there is one.
+
+        If the effect of one of them is unknown, a soft reset is used.
         """
 
-        apply(soft_reset, self.file)
+        target = self.file or sys.stdout
+        scope = self._contexts.pop().scope
+
+        scope.pop(target)
+        _emit(
+            target,
+            scope.undo(),
+            self.flush_policy,
+            self.color_depth,
+            "Coquille.__exit__",
+        )
+
+
+@dataclass(frozen=True)
+class CompiledCoquille:
+    """
+    A coquille whose sequences have been resolved into a `prefix` and a
+    `suffix` (both as a string and as bytes), see `Coquille.compile`.
+    """
+
+    prefix: str
+    suffix: str
+    file: Optional[SupportsWriteAndFlush[str]] = None
+    flush_policy: FlushPolicy = "call"
+    prefix_bytes: bytes = field(init=False, repr=False)
+    suffix_bytes: bytes = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "prefix_bytes", self.prefix.encode())
+        object.__setattr__(self, "suffix_bytes", self.suffix.encode())
+
+    def format(self, text: str) -> str:
+        """
+        Get `text` wrapped with the sequences.
+        """
+
+        return self.prefix + text + self.suffix
+
+    def format_bytes(self, text: bytes) -> bytes:
+        """
+        Same as `format`, for already encoded text.
+        """
+
+        return self.prefix_bytes + text + self.suffix_bytes
+
+    def write(
+        self,
+        text: str,
+        end: str = "\n",
+        file: Optional[SupportsWriteAndFlush[str]] = None,
+    ) -> None:
+        """
+        Same as `Coquille.write`, using a single concatenation and a
+        single `write` call.
+        """
+
+        _emit(
+            file or self.file or sys.stdout,
+            self.prefix + text + end + self.suffix,
+            self.flush_policy,
+            source="CompiledCoquille.write",
+        )
 
 
 def write(
@@ -271,6 +696,8 @@ def write(
     *sequences: Union[EscapeSequence, EscapeSequenceName],
     end: Optional[str] = "\n",
     file: Optional[SupportsWriteAndFlush[str]] = None,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
 ) -> None:
     """
     A function relatively similar to built-in `print`, but with
@@ -288,18 +715,523 @@ def write(
 
     The previous example is roughly the same as doing:
     ```py
-    >>> print("\x1b[35m", end="")
-    >>> print("\x1b[3m", end="")
-    >>> print("Hello World!")
-    >>> print("\x1b[!p", end="")
+    >>> print("\x1b[3;38;5;5mHello World!\n\x1b[0m", end="")
     ```
 
-    Note that the soft reset sequence is used rather than SGR reset `x1b[0m`,
-    because the range of allowed escape sequences is larger than SGR.
+    Consecutive SGR sequences are merged into one, and everything is
+    emitted with a single `write` call ; `flush_policy` decides whether
+    it is followed by a `flush`:
+    - "call" (default): always flush ;
+    - "line": only flush if the output contains a newline ;
+    - "manual": never flush, the caller is responsible for it.
+
+    On terminals with fewer colors, `color_depth` converts the colors to
+    the nearest available ones (see `coquille.colors`).
+
+    Only what was applied is reset afterwards, with the shortest
+    sequence possible (e.g. `\x1b[22m` for bold) ; inside of the `with`
+    block of a Coquille, its style is restored. If the effect of a
+    sequence is unknown, a soft reset is used, because the range of
+    allowed escape sequences is larger than SGR.
     """
 
-    for sequence in sequences:
-        apply(sequence, file)
+    target = file or sys.stdout
+    scope = _Scope.open(target)
+
+    _emit(
+        target,
+        scope.apply(sequences) + _format((text,), None, end) + scope.undo(),
+        flush_policy,
+        color_depth,
+        "write",
+        sequences,
+    )
+
+
+def write_many(
+    spans: Iterable[tuple[str, SpanStyle]],
+    file: Optional[SupportsWriteAndFlush[str]] = None,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
+    chunk_size: Optional[int] = None,
+) -> None:
+    """
+    Write styled spans of text, (text, style) pairs where the style is
+    a sequence, several, or a `Style`, as a single string.
+
+    Consecutive spans with the same style are merged, and only the
+    transitions from a style to the next one are emitted, followed by a
+    single reset at the end (as for `write`, inside of the `with` block
+    of a Coquille, its style is restored).
+
+    ## Example
+
+    ```py
+    >>> write_many([("def", bold), (" ", ()), ("main", (fg_blue, italic))])
+    ```
+
+    For long or streamed spans, `chunk_size` is the number of characters
+    after which what was formatted so far is written.
+    """
+
+    target = file or sys.stdout
+    scope = _Scope.open(target)
+    parts: list[str] = []
+    size = 0
+    previous: Optional[tuple[Union[EscapeSequence, EscapeSequenceName], ...]] = None
+    # (previous style, style) -> (state, transition) ; the state before a
+    # transition only depends on the previous style
+    transitions: dict[tuple[object, object], tuple[TerminalState, str]] = {}
+
+    for text, style in spans:
+        if isinstance(style, Style):
+            # the default style has an empty sequence
+            sequences = (style.sequence,) if style.sequence else ()
+        elif isinstance(style, str):
+            sequences = (style,)
+        else:
+            sequences = tuple(style)
+
+        if sequences != previous:
+            known = None if scope.dirty else transitions.get((previous, sequences))
+
+            if known is None:
+                was_dirty = scope.dirty
+                transition = scope.switch(sequences)
+
+                if not was_dirty and not scope.dirty:
+                    transitions[previous, sequences] = scope.state, transition
+            else:
+                scope.state, transition = known
+
+            parts.append(transition)
+            size += len(transition)
+            previous = sequences
+
+        parts.append(text)
+        size += len(text)
+
+        if chunk_size is not None and size >= chunk_size:
+            _emit(target, "".join(parts), flush_policy, color_depth, "write_many")
+            parts.clear()
+            size = 0
+
+    parts.append(scope.undo())
+    _emit(target, "".join(parts), flush_policy, color_depth, "write_many")
+
+
+class _FrameBuffer(StringIO):
+    """
+    What is written during a `frame`.
+    """
+
+    # what the frame emitted, once it ended
+    output: str = ""
+
+
+@contextmanager
+def frame(
+    file: Optional[SupportsWriteAndFlush[str]] = None,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
+) -> Iterator[SupportsWriteAndFlush[str]]:
+    """
+    Batch the output of a `with` block into a single write to `file` (by
+    default, stdout), wrapped in a synchronized update, so that the
+    terminal repaints once with all of it.
+
+    Coquille output goes to the stream it returns, on top of the style of
+    the `with` blocks of `file` ; it is emitted at the end of the block,
+    if anything was written. If the block raises, nothing is emitted.
+
+    ## Example
+
+    ```py
+    >>> with frame() as screen:
+    ...     apply(erase_in_display(2), screen)
+    ...     write("Status: OK", bold, "fg_green", file=screen)
+    ```
+
+    Terminals that do not support synchronized updates (DEC mode 2026)
+    ignore them, the output still comes in one write. A frame inside of
+    another one is only a part of it.
+    """
+
+    target = file or sys.stdout
+    buffer = _FrameBuffer()
+    # the state of `target` is the one the frame starts from
+    _Scope.open(target).push(buffer)
+
+    yield buffer
+
+    string = buffer.getvalue()
+
+    if string and not isinstance(target, _FrameBuffer):
+        string = begin_synchronized_update + string + end_synchronized_update
+
+    buffer.output = _emit(target, string, flush_policy, color_depth, "frame")
+
+
+class _ThreadBuffer:
+    __slots__ = ("parts", "scopes", "__weakref__")
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+        # the active `with` blocks of the thread
+        self.scopes: list[_Scope] = []
+
+
+def _commit_leftover(
+    commit: WeakMethod[Callable[[list[str]], None]],
+    parts: list[str],
+) -> None:
+    method = commit()
+
+    if method is not None:
+        method(parts)
+
+
+class SharedWriter:
+    """
+    A stream for several threads writing to `file` (by default, stdout)
+    through coquille, without their output being interleaved.
+
+    What a thread writes goes to its own buffer, which is committed to
+    `file` with a single locked write when the thread flushes it ; the
+    output of a `with` block is committed as a whole, at its end. What a
+    thread did not flush (e.g. with `flush_policy="manual"`) is committed
+    when it ends, unless the writer is gone by then.
+
+    ## Example
+
+    ```py
+    >>> stderr = SharedWriter(sys.stderr)
+    >>> # in each thread
+    >>> write("Something went wrong", fg_red, file=stderr)
+    >>> with Coquille.new(bold, file=stderr) as coquille:
+    ...     coquille.print("Starting")  # committed at the end of the block
+    ```
+    """
+
+    def __init__(self, file: Optional[SupportsWriteAndFlush[str]] = None) -> None:
+        self.file = file
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _buffer(self) -> _ThreadBuffer:
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = _ThreadBuffer()
+            # the buffer of a thread is dropped when it ends ; the writer
+            # is only weakly referenced, so that it can be collected
+            finalize(
+                buffer,
+                _commit_leftover,
+                WeakMethod(self._commit_leftover),
+                buffer.parts,
+            )
+
+            return buffer
+
+    def write(self, string: str) -> int:
+        """
+        Add `string` to the buffer of the current thread.
+        """
+
+        self._buffer().parts.append(string)
+
+        return len(string)
+
+    def flush(self) -> None:
+        """
+        Commit the buffer of the current thread, unless it is in a `with`
+        block.
+        """
+
+        buffer = self._buffer()
+
+        if not buffer.parts or buffer.scopes:
+            return
+
+        record = "".join(buffer.parts)
+        buffer.parts.clear()
+        self._commit(record)
+
+    def _commit(self, record: str) -> None:
+        target = self.file or sys.stdout
+
+        with self._lock:
+            _emit(target, record, source="SharedWriter")
+
+    def _commit_leftover(self, parts: list[str]) -> None:
+        # what a thread that ended had not flushed
+        if parts:
+            self._commit("".join(parts))
+
+
+@dataclass(frozen=True)
+class BackgroundWriterStats:
+    """
+    A snapshot of the counters of a `BackgroundWriter`.
+    """
+
+    # records waiting in the queue
+    depth: int
+    # the highest depth so far
+    peak_depth: int
+    # records written to the file
+    written: int
+    # writes to the file, each one with a batch of records
+    batches: int
+    # records dropped by the queue policy
+    dropped: int
+
+
+class BackgroundWriter(SharedWriter):
+    """
+    A `SharedWriter` whose records are written to `file` (by default,
+    stdout) by a dedicated thread, so that producers do not wait for a
+    slow terminal.
+
+    Committed records go through a queue of `max_records`, which the
+    thread empties with a single write each time ; `policy` (see
+    `QueuePolicy`) decides what happens when it is full. Dropping
+    records can drop sequences, which is only safe for records that
+    are self-contained.
+
+    `close` must be called to make sure that everything is written.
+
+    ## Example
+
+    ```py
+    >>> stdout = BackgroundWriter(max_records=4, policy="coalesce")
+    >>> for frame in frames:
+    ...     write(frame, end="", file=stdout)
+    >>> stdout.close()
+    ```
+    """
+
+    def __init__(
+        self,
+        file: Optional[SupportsWriteAndFlush[str]] = None,
+        *,
+        max_records: int = 1024,
+        policy: QueuePolicy = "block",
+    ) -> None:
+        if max_records < 1:
+            raise ValueError(f"max_records must be positive, got {max_records}")
+
+        super().__init__(file)
+        self.max_records = max_records
+        self.policy: QueuePolicy = policy
+        self._queue: deque[str] = deque()
+        self._condition = threading.Condition(self._lock)
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._peak_depth = 0
+        self._written = 0
+        self._batches = 0
+        self._dropped = 0
+        self._thread = threading.Thread(
+            target=self._run,
+            name="coquille-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _commit(self, record: str) -> None:
+        with self._condition:
+            if self._closed:
+                raise ValueError("write to a closed BackgroundWriter") from self._error
+
+            if len(self._queue) >= self.max_records:
+                if self.policy == "drop_newest":
+                    self._dropped += 1
+                    return
+
+                if self.policy == "drop_oldest":
+                    self._queue.popleft()
+                    self._dropped += 1
+                elif self.policy == "coalesce":
+                    self._dropped += len(self._queue)
+                    self._queue.clear()
+                else:
+                    while len(self._queue) >= self.max_records and not self._closed:
+                        self._condition.wait()
+
+                    if self._closed:
+                        raise ValueError(
+                            "write to a closed BackgroundWriter",
+                        ) from self._error
+
+            self._queue.append(record)
+            self._peak_depth = max(self._peak_depth, len(self._queue))
+            self._condition.notify_all()
+
+    def _commit_leftover(self, parts: list[str]) -> None:
+        try:
+            super()._commit_leftover(parts)
+        except ValueError:  # the threads that end after `close` are dropped
+            pass
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+
+                if not self._queue:
+                    return
+
+                batch = list(self._queue)
+                self._queue.clear()
+                # room for the blocked producers
+                self._condition.notify_all()
+
+            try:
+                target = self.file or sys.stdout
+                _emit(target, "".join(batch), source="BackgroundWriter")
+            except BaseException as error:
+                with self._condition:
+                    self._error = error
+                    self._closed = True
+                    self._queue.clear()
+                    self._condition.notify_all()
+
+                return
+
+            with self._condition:
+                self._written += len(batch)
+                self._batches += 1
+
+    def stats(self) -> BackgroundWriterStats:
+        """
+        Get the current counters.
+        """
+
+        with self._condition:
+            return BackgroundWriterStats(
+                len(self._queue),
+                self._peak_depth,
+                self._written,
+                self._batches,
+                self._dropped,
+            )
+
+    def close(self) -> None:
+        """
+        Commit the buffer of the current thread, wait until every queued
+        record is written, and stop the thread.
+
+        If writing to the file failed, the error is raised here.
+        """
+
+        with self._condition:
+            closed = self._closed
+
+        if not closed:
+            self.flush()
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+
+@dataclass
+class StatefulWriter:
+    """
+    A writer that keeps track of the terminal state, and only emits the
+    sequences that actually change it.
+
+    It assumes that it is the only one writing sequences to `file`.
+
+    ## Example
+
+    ```py
+    >>> writer = StatefulWriter()
+    >>> writer.write("Hello ", "bold", "fg_red", end="")  # \x1b[1;38;5;1m
+    >>> writer.write("World!", "fg_red", "bold")  # nothing is re-sent
+    >>> writer.reset()  # \x1b[0m
+    ```
+    """
+
+    file: Optional[SupportsWriteAndFlush[str]] = None
+    state: TerminalState = field(default_factory=TerminalState)
+    flush_policy: FlushPolicy = "call"
+    color_depth: ColorDepth = "truecolor"
+
+    def _transition(
+        self,
+        sequences: Iterable[Union[EscapeSequence, EscapeSequenceName]],
+    ) -> str:
+        """
+        Update the state with `sequences`, and get the string to emit.
+        """
+
+        self.state, string, _ = _transition(self.state, map(prepare, sequences))
+
+        return string
+
+    def apply(self, *sequences: Union[EscapeSequence, EscapeSequenceName]) -> None:
+        """
+        Apply the escape sequences which change the terminal state.
+
+        Sequences whose effect is not modeled are always emitted.
+        """
+
+        _emit(
+            self.file or sys.stdout,
+            self._transition(sequences),
+            self.flush_policy,
+            self.color_depth,
+            "StatefulWriter.apply",
+            sequences,
+        )
+
+    def write(
+        self,
+        text: str,
+        *sequences: Union[EscapeSequence, EscapeSequenceName],
+        end: Optional[str] = "\n",
+    ) -> None:
+        """
+        Same as `apply`, then write `text`. Unlike naked `write`, the
+        sequences are not reset afterwards.
+        """
+
+        _emit(
+            self.file or sys.stdout,
+            self._transition(sequences) + _format((text,), None, end),
+            self.flush_policy,
+            self.color_depth,
+            "StatefulWriter.write",
+            sequences,
+        )
+
+    def set_state(self, state: TerminalState) -> None:
+        """
+        Emit the shortest sequence that leads to `state`.
+        """
+
+        string = self.state.delta(state)
+        self.state = state
+        _emit(
+            self.file or sys.stdout,
+            string,
+            self.flush_policy,
+            self.color_depth,
+            "StatefulWriter.set_state",
+        )
+
+    def reset(self) -> None:
+        """
+        Go back to the default SGR attributes and colors, if needed.
+        """
 
-    print(text, end=end, file=file)
-    apply(soft_reset)
+        self.set_state(self.state.with_default_rendition())
@@ -1,12 +1,32 @@
 import abc
 import collections.abc
+import contextlib
 import typing
 
+from coquille.colors import ColorDepth as ColorDepth
 from coquille.sequences import EscapeSequence, EscapeSequenceName
+from coquille.state import TerminalState
+from coquille.style import Style
 from coquille.typeshed import SupportsWriteAndFlush
 
 P = typing.ParamSpec("P")
 
+FlushPolicy: typing.TypeAlias = typing.Literal["call", "line", "manual"]
+
+QueuePolicy: typing.TypeAlias = typing.Literal[
+    "block",
+    "drop_oldest",
+    "drop_newest",
+    "coalesce",
+]
+
+SpanStyle: typing.TypeAlias = (
+    EscapeSequence
+    | EscapeSequenceName
+    | collections.abc.Iterable[EscapeSequence | EscapeSequenceName]
+    | Style
+)
+
 @typing.overload
 def prepare(
     sequence: EscapeSequence | EscapeSequenceName,
@@ -40,6 +60,8 @@ def apply(
 class CoquilleLike(typing.Protocol):
     sequences: list[EscapeSequence]
     file: SupportsWriteAndFlush[str] | None
+    flush_policy: FlushPolicy
+    color_depth: ColorDepth
 
     @abc.abstractmethod
     def print(
@@ -53,6 +75,8 @@ class CoquilleLike(typing.Protocol):
 class _ContextCoquille:
     sequences: list[EscapeSequence]
     file: SupportsWriteAndFlush[str] | None
+    flush_policy: FlushPolicy
+    color_depth: ColorDepth
 
     def apply(self, sequence: EscapeSequence | EscapeSequenceName) -> None: ...
     def reset(self) -> None: ...
@@ -66,12 +90,16 @@ class _ContextCoquille:
 class Coquille:
     sequences: list[EscapeSequence]
     file: SupportsWriteAndFlush[str] | None
+    flush_policy: FlushPolicy
+    color_depth: ColorDepth
 
     @typing.overload
     @classmethod
     def new(
         cls: type[typing.Self],
         *sequences: EscapeSequence | EscapeSequenceName,
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
     ) -> typing.Self:  # pragma: no cover
         ...
     @typing.overload
@@ -80,6 +108,8 @@ class Coquille:
         cls: type[typing.Self],
         *sequences: EscapeSequence | EscapeSequenceName,
         file: SupportsWriteAndFlush[str],
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
     ) -> typing.Self:  # pragma: no cover
         ...
     def print(
@@ -93,12 +123,113 @@ class Coquille:
         text: str,
         end: str | None = "\n",
     ) -> None: ...
+    def compile(self) -> CompiledCoquille: ...
     def __enter__(self) -> _ContextCoquille: ...
     def __exit__(self, *_) -> None: ...
 
+class CompiledCoquille:
+    prefix: str
+    suffix: str
+    file: SupportsWriteAndFlush[str] | None
+    flush_policy: FlushPolicy
+    prefix_bytes: bytes
+    suffix_bytes: bytes
+
+    def __init__(
+        self,
+        prefix: str,
+        suffix: str,
+        file: SupportsWriteAndFlush[str] | None = None,
+        flush_policy: FlushPolicy = "call",
+    ) -> None: ...
+    def format(self, text: str) -> str: ...
+    def format_bytes(self, text: bytes) -> bytes: ...
+    def write(
+        self,
+        text: str,
+        end: str = "\n",
+        file: SupportsWriteAndFlush[str] | None = None,
+    ) -> None: ...
+
 def write(
     text: str,
     *sequences: EscapeSequence | EscapeSequenceName,
     end: str | None = "\n",
     file: SupportsWriteAndFlush[str] | None = None,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
+) -> None: ...
+
+def write_many(
+    spans: collections.abc.Iterable[tuple[str, SpanStyle]],
+    file: SupportsWriteAndFlush[str] | None = None,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
+    chunk_size: int | None = None,
 ) -> None: ...
+
+def frame(
+    file: SupportsWriteAndFlush[str] | None = None,
+    flush_policy: FlushPolicy = "call",
+    color_depth: ColorDepth = "truecolor",
+) -> contextlib.AbstractContextManager[SupportsWriteAndFlush[str]]: ...
+
+class SharedWriter:
+    file: SupportsWriteAndFlush[str] | None
+
+    def __init__(self, file: SupportsWriteAndFlush[str] | None = None) -> None: ...
+    def write(self, string: str) -> int: ...
+    def flush(self) -> None: ...
+
+class BackgroundWriterStats:
+    depth: int
+    peak_depth: int
+    written: int
+    batches: int
+    dropped: int
+
+    def __init__(
+        self,
+        depth: int,
+        peak_depth: int,
+        written: int,
+        batches: int,
+        dropped: int,
+    ) -> None: ...
+
+class BackgroundWriter(SharedWriter):
+    max_records: int
+    policy: QueuePolicy
+
+    def __init__(
+        self,
+        file: SupportsWriteAndFlush[str] | None = None,
+        *,
+        max_records: int = 1024,
+        policy: QueuePolicy = "block",
+    ) -> None: ...
+    def stats(self) -> BackgroundWriterStats: ...
+    def close(self) -> None: ...
+
+class StatefulWriter:
+    file: SupportsWriteAndFlush[str] | None
+    state: TerminalState
+    flush_policy: FlushPolicy
+    color_depth: ColorDepth
+
+    def __init__(
+        self,
+        file: SupportsWriteAndFlush[str] | None = None,
+        state: TerminalState = ...,
+        flush_policy: FlushPolicy = "call",
+        color_depth: ColorDepth = "truecolor",
+    ) -> None: ...
+    def apply(self, *sequences: EscapeSequence | EscapeSequenceName) -> None: ...
+    def write(
+        self,
+        text: str,
+        *sequences: EscapeSequence | EscapeSequenceName,
+        end: str | None = "\n",
+    ) -> None: ...
+    def set_state(self, state: TerminalState) -> None: ...
+    def reset(self) -> None: ...
@@ -0,0 +1,285 @@
+"""
+# Screen
+
+An in-memory grid of cells (a character and its style) for full-screen
+renderers.
+
+Drawing happens in a back buffer ; `Screen.present` compares it to
+what was last presented (the front buffer) and only emits the changed
+cells, with the cheapest cursor movements and the SGR deltas they need.
+
+Each cell is assumed to be one column wide. Its style is a `Style`,
+`TerminalState`s being converted ; its colors are converted to the
+color depth of the screen when it is presented.
+"""
+# pyright: reportUnusedCallResult = false
+from __future__ import annotations
+
+import sys
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Union
+
+from coquille.colors import ColorDepth
+from coquille.movement import plan_cursor_move
+from coquille.prelude import _emit
+from coquille.prelude import FlushPolicy
+from coquille.state import TerminalState
+from coquille.style import Style
+
+__all__ = [
+    "Screen",
+]
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from coquille.typeshed import SupportsWriteAndFlush
+
+
+DEFAULT_STYLE = Style()
+
+# never equal to a character, so that the cell is drawn
+_UNKNOWN = ""
+
+# a relative cursor movement is never longer than this
+_MAX_OVERWRITE = 5
+
+
+def _as_style(style: Union[Style, TerminalState]) -> Style:
+    if type(style) is Style:
+        return style
+
+    return Style.from_terminal_state(style)
+
+
+class Screen:
+    """
+    A double-buffered grid of `height` rows and `width` columns.
+
+    Rows and columns are 0-based.
+
+    ## Example
+
+    ```py
+    >>> screen = Screen(80, 24)
+    >>> title = Style.from_sequences([bold, fg_red])
+    >>> screen.put(0, 0, "Babble", title)
+    >>> screen.present()  # everything is drawn the first time
+    >>> screen.put(1, 0, "!")
+    >>> screen.present()  # only the `!` is drawn
+    ```
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        file: Optional[SupportsWriteAndFlush[str]] = None,
+        newline_returns: Optional[bool] = None,
+        color_depth: ColorDepth = "truecolor",
+        flush_policy: FlushPolicy = "call",
+    ) -> None:
+        self.file = file
+        # see `plan_cursor_move`
+        self.newline_returns = newline_returns
+        self.color_depth = color_depth
+        self.flush_policy: FlushPolicy = flush_policy
+        # the state of the terminal after the last frame
+        self.pen = DEFAULT_STYLE
+        self.resize(width, height)
+
+    def resize(self, width: int, height: int) -> None:
+        """
+        Change the size of the screen. Its content is cleared, and it is
+        completely redrawn by the next `present`.
+        """
+
+        self.width = width
+        self.height = height
+        self._chars = [[" "] * width for _ in range(height)]
+        self._styles = [[DEFAULT_STYLE] * width for _ in range(height)]
+        self._front_chars = [[_UNKNOWN] * width for _ in range(height)]
+        self._front_styles = [[DEFAULT_STYLE] * width for _ in range(height)]
+        # damaged columns of each row
+        self._damage: dict[int, set[int]] = {}
+        self._damage_all()
+
+    def invalidate(self) -> None:
+        """
+        Forget what is on the terminal, so that the next `present`
+        redraws every cell (e.g. after it was cleared by someone else).
+        """
+
+        for row in range(self.height):
+            self._front_chars[row] = [_UNKNOWN] * self.width
+
+        self._damage_all()
+        self.pen = DEFAULT_STYLE
+
+    def _damage_all(self) -> None:
+        self._damage = {row: set(range(self.width)) for row in range(self.height)}
+
+    def put(
+        self,
+        row: int,
+        column: int,
+        text: str,
+        style: Union[Style, TerminalState] = DEFAULT_STYLE,
+    ) -> None:
+        """
+        Draw `text` from the given cell onward, with `style`.
+
+        It is clipped to the screen, and does not wrap.
+        """
+
+        if not 0 <= row < self.height:
+            return
+
+        if column < 0:
+            text = text[-column:]
+            column = 0
+
+        end = min(column + len(text), self.width)
+
+        if end <= column:
+            return
+
+        self._chars[row][column:end] = text[: end - column]
+        self._styles[row][column:end] = [_as_style(style)] * (end - column)
+        columns = self._damage.get(row)
+
+        if columns is None:
+            self._damage[row] = set(range(column, end))
+        else:
+            columns.update(range(column, end))
+
+    def fill(
+        self,
+        char: str = " ",
+        style: Union[Style, TerminalState] = DEFAULT_STYLE,
+    ) -> None:
+        """
+        Fill the whole screen with `char`.
+        """
+
+        style = _as_style(style)
+
+        for row in range(self.height):
+            self._chars[row] = [char] * self.width
+            self._styles[row] = [style] * self.width
+
+        self._damage_all()
+
+    def get(self, row: int, column: int) -> tuple[str, Style]:
+        """
+        Get the character and the style of a cell of the back buffer.
+        """
+
+        return self._chars[row][column], self._styles[row][column]
+
+    def render(self) -> str:
+        """
+        Get the string that updates the terminal from the front buffer
+        to the back buffer, and consider it presented.
+
+        Its cost is proportional to the number of cells drawn since the
+        last frame, not to the size of the screen.
+        """
+
+        parts: list[str] = []
+        pen = self.pen
+        depth = self.color_depth
+        # unknown cursor position
+        cursor_row = cursor_column = -1
+
+        for row in sorted(self._damage):
+            columns = self._damage[row]
+            chars = self._chars[row]
+            styles = self._styles[row]
+            front_chars = self._front_chars[row]
+            front_styles = self._front_styles[row]
+
+            # no need to sort a fully damaged row
+            ordered = range(self.width) if len(columns) == self.width else sorted(columns)
+
+            for column in ordered:
+                char = chars[column]
+                style = styles[column]
+
+                # the front buffer holds what the terminal displays
+                if depth != "truecolor":
+                    style = style.downsample(depth)
+
+                front_style = front_styles[column]
+
+                if char == front_chars[column] and (
+                    style is front_style or style == front_style
+                ):
+                    continue
+
+                if row != cursor_row or column != cursor_column:
+                    parts.append(
+                        self._move(row, column, cursor_row, cursor_column, pen),
+                    )
+                    cursor_row = row
+
+                if style is not pen and style != pen:
+                    parts.append(pen.delta(style))
+                    pen = style
+
+                parts.append(char)
+                front_chars[column] = char
+                front_styles[column] = style
+                # the cursor stays on the last column (pending wrap)
+                cursor_column = column + 1 if column + 1 < self.width else -1
+
+        self._damage.clear()
+        self.pen = pen
+
+        return "".join(parts)
+
+    def _move(
+        self,
+        row: int,
+        column: int,
+        cursor_row: int,
+        cursor_column: int,
+        pen: Style,
+    ) -> str:
+        if cursor_row < 0 or cursor_column < 0:
+            return plan_cursor_move(None, None, row, column)
+
+        overwrite: Optional[str] = None
+
+        # re-printing a few unchanged cells might be cheaper
+        if row == cursor_row and 0 < column - cursor_column <= _MAX_OVERWRITE:
+            front_chars = self._front_chars[row][cursor_column:column]
+            front_styles = self._front_styles[row][cursor_column:column]
+
+            if _UNKNOWN not in front_chars and all(
+                style is pen or style == pen for style in front_styles
+            ):
+                overwrite = "".join(front_chars)
+
+        return plan_cursor_move(
+            cursor_row,
+            cursor_column,
+            row,
+            column,
+            overwrite=overwrite,
+            newline_returns=self.newline_returns,
+        )
+
+    def present(self) -> None:
+        """
+        Emit the changes since the last frame with a single write, then
+        flush it according to `flush_policy`.
+        """
+
+        # its colors are already at `color_depth`
+        _emit(
+            self.file or sys.stdout,
+            self.render(),
+            self.flush_policy,
+            source="Screen.present",
+        )
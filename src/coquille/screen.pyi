@@ -0,0 +1,39 @@
+from coquille.colors import ColorDepth
+from coquille.prelude import FlushPolicy
+from coquille.state import TerminalState
+from coquille.style import Style
+from coquille.typeshed import SupportsWriteAndFlush
+
+DEFAULT_STYLE: Style
+
+class Screen:
+    width: int
+    height: int
+    file: SupportsWriteAndFlush[str] | None
+    newline_returns: bool | None
+    color_depth: ColorDepth
+    flush_policy: FlushPolicy
+    pen: Style
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        file: SupportsWriteAndFlush[str] | None = None,
+        newline_returns: bool | None = None,
+        color_depth: ColorDepth = "truecolor",
+        flush_policy: FlushPolicy = "call",
+    ) -> None: ...
+    def resize(self, width: int, height: int) -> None: ...
+    def invalidate(self) -> None: ...
+    def put(
+        self,
+        row: int,
+        column: int,
+        text: str,
+        style: Style | TerminalState = ...,
+    ) -> None: ...
+    def fill(self, char: str = " ", style: Style | TerminalState = ...) -> None: ...
+    def get(self, row: int, column: int) -> tuple[str, Style]: ...
+    def render(self) -> str: ...
+    def present(self) -> None: ...
@@ -19,9 +19,25 @@ Some are also taken from Microsoft documentation:
 - [U] = the abbreviation was made up for convenience.
 - [RS] = rarely (never, basically) supported.
 """
+import re
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Mapping
+from collections.abc import Sequence
+from functools import cached_property
+from functools import lru_cache
+from functools import wraps
+from types import MappingProxyType
 from typing import Literal
+from typing import NamedTuple
 from typing import Optional
+from typing import overload
+from typing import TypeVar
+from typing import Union
 
+# not part of `__all__`
+_IMPORTED_NAMES = frozenset(globals())
 
 # Constants
 
@@ -31,6 +47,7 @@ CURSOR_VISIBILITY = 25
 FOCUS_REPORT = 1004
 ALT_SCREEN_BUFFER = 1049
 BRACKETED_PASTE_MODE = 2004
+SYNCHRONIZED_OUTPUT = 2026
 
 FOREGROUND_CODE = 30
 BACKGROUND_CODE = 40
@@ -41,10 +58,17 @@ RESET = 9
 # Helper types
 EscapeSequenceName = str
 AltFontNumber = Literal[1, 2, 3, 4, 5, 6, 7, 8, 9]
+_Factory = TypeVar("_Factory", bound=Callable[..., "EscapeSequence"])
 
 
 class EscapeSequence(str):
-    pass
+    @cached_property
+    def encoded(self) -> bytes:
+        """
+        The sequence as bytes, encoded once.
+        """
+
+        return self.encode()
 
 
 def escape_sequence(
@@ -77,6 +101,130 @@ def escape_sequence(
 # alias
 ESC = escape_sequence
 
+
+# *- Factory cache -* #
+
+# factory name -> factory
+_MEMOIZABLE_FACTORIES: dict[str, Callable[..., EscapeSequence]] = {}
+# factory name -> cache in front of the factory, when enabled ; the dict
+# is replaced as a whole, so that callers never see it half-built
+_FACTORY_CACHES: dict[str, Callable[..., EscapeSequence]] = {}
+FACTORY_CACHE_MAXSIZE = 4096
+
+
+class FactoryCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _memoizable(factory: _Factory) -> _Factory:
+    """
+    Register a parameterized factory whose results can be cached using
+    `configure_factory_cache`.
+    """
+
+    name = factory.__name__
+    _MEMOIZABLE_FACTORIES[name] = factory
+
+    @wraps(factory)
+    def memoizable(*args: int, **kwargs: int) -> EscapeSequence:
+        cache = _FACTORY_CACHES.get(name)
+
+        if cache is None:
+            return factory(*args, **kwargs)
+
+        return cache(*args, **kwargs)
+
+    return memoizable  # type: ignore
+
+
+def configure_factory_cache(
+    enabled: bool = True,
+    maxsize: int = FACTORY_CACHE_MAXSIZE,
+) -> None:
+    """
+    Enable (or disable) a bounded LRU cache in front of the parameterized
+    factories such as `foreground_truecolor` or `cursor_position`.
+
+    The cache is disabled by default. Each factory has its own cache of
+    at most `maxsize` sequences ; reconfiguring it clears them.
+    """
+
+    global _FACTORY_CACHES
+
+    _FACTORY_CACHES = {
+        name: lru_cache(maxsize)(factory)
+        for name, factory in _MEMOIZABLE_FACTORIES.items()
+        if enabled
+    }
+
+
+def factory_cache_info() -> dict[str, FactoryCacheInfo]:
+    """
+    Get the hit/miss statistics of each cached factory.
+
+    It is empty if the cache is disabled.
+    """
+
+    return {
+        name: FactoryCacheInfo(*cache.cache_info())  # type: ignore
+        for name, cache in _FACTORY_CACHES.items()
+    }
+
+
+def clear_factory_cache() -> None:
+    """
+    Empty the cache of each factory and reset their statistics.
+    """
+
+    for cache in _FACTORY_CACHES.values():
+        cache.cache_clear()  # type: ignore
+
+
+# *- Lazy constants -* #
+
+# name -> section that defines the constant sequence, see `_lazy_sequences`
+_LAZY_SECTIONS: dict[
+    EscapeSequenceName,
+    Callable[[], dict[EscapeSequenceName, EscapeSequence]],
+] = {}
+
+
+def _lazy_sequences(
+    section: Callable[[], dict[EscapeSequenceName, EscapeSequence]],
+) -> Callable[[], dict[EscapeSequenceName, EscapeSequence]]:
+    """
+    Register a section of constant sequences: a function that defines
+    them as local variables and returns `locals()`.
+
+    It is only called when one of them is first accessed (see
+    `__getattr__`), so that importing this module stays cheap.
+    """
+
+    for name in section.__code__.co_varnames:
+        _LAZY_SECTIONS[name] = section
+
+    return section
+
+
+def __getattr__(name: str) -> EscapeSequence:
+    section = _LAZY_SECTIONS.get(name)
+
+    if section is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    sequences = section()
+    globals().update(sequences)
+
+    return sequences[name]
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_SECTIONS})
+
+
 # *- Fe -* #
 
 
@@ -136,23 +284,29 @@ def _CSI_private(subcode: str, *args: int) -> EscapeSequence:
 # *- FS -* #
 
 
-reset_initial_state = ESC("c")
+@_lazy_sequences
+def _FS_sequences() -> dict[str, EscapeSequence]:
+    reset_initial_state = ESC("c")
 
+    # alias
+    RIS = reset_initial_state
 
-# alias
-RIS = reset_initial_state
+    return locals()
 
 
 # *- Fp -* #
 
 
-DEC_save_cursor = ESC("7")
-DEC_restore_cursor = ESC("8")
+@_lazy_sequences
+def _Fp_sequences() -> dict[str, EscapeSequence]:
+    DEC_save_cursor = ESC("7")
+    DEC_restore_cursor = ESC("8")
 
+    # aliases
+    DECSC = DEC_save_cursor
+    DECRC = DEC_restore_cursor
 
-# aliases
-DECSC = DEC_save_cursor
-DECRC = DEC_restore_cursor
+    return locals()
 
 
 # *- CSI-based sequences -* #
@@ -176,54 +330,67 @@ def cursor_shape(n: int) -> EscapeSequence:
 
 
 # sequences
+@_memoizable
 def cursor_up(n: int = 1) -> EscapeSequence:
     return CSI("A", n)
 
 
+@_memoizable
 def cursor_down(n: int = 1) -> EscapeSequence:
     return CSI("B", n)
 
 
+@_memoizable
 def cursor_forward(n: int = 1) -> EscapeSequence:
     return CSI("C", n)
 
 
+@_memoizable
 def cursor_back(n: int = 1) -> EscapeSequence:
     return CSI("D", n)
 
 
+@_memoizable
 def cursor_next_line(n: int = 1) -> EscapeSequence:
     return CSI("E", n)
 
 
+@_memoizable
 def cursor_previous_line(n: int = 1) -> EscapeSequence:
     return CSI("F", n)
 
 
+@_memoizable
 def cursor_horizontal_absolute(n: int = 1) -> EscapeSequence:
     return CSI("G", n)
 
 
+@_memoizable
 def cursor_position(n: int = 1, m: int = 1) -> EscapeSequence:
     return CSI("H", n, m)
 
 
+@_memoizable
 def erase_in_display(n: int) -> EscapeSequence:
     return CSI("J", n)
 
 
+@_memoizable
 def erase_in_line(n: int) -> EscapeSequence:
     return CSI("K", n)
 
 
+@_memoizable
 def scroll_up(n: int = 1) -> EscapeSequence:
     return CSI("S", n)
 
 
+@_memoizable
 def scroll_down(n: int = 1) -> EscapeSequence:
     return CSI("T", n)
 
 
+@_memoizable
 def horizontal_vertical_position(n: int = 1, m: int = 1) -> EscapeSequence:
     return CSI("f", n, m)
 
@@ -236,32 +403,6 @@ def numpad(n: int) -> EscapeSequence:
     return CSI("~", n)
 
 
-AUX_port_on = _AUX_port(5)
-AUX_port_off = _AUX_port(4)
-device_status_report = CSI("n", 6)
-save_current_cursor_position = CSI("s")
-restore_current_cursor_position = CSI("u")
-show_cursor = _enable_CSI(CURSOR_VISIBILITY)
-hide_cursor = _disable_CSI(CURSOR_VISIBILITY)
-enable_focus_report = _enable_CSI(FOCUS_REPORT)
-disable_focus_report = _disable_CSI(FOCUS_REPORT)
-enable_alternative_screen_buffer = _enable_CSI(ALT_SCREEN_BUFFER)
-disable_alternative_screen_buffer = _disable_CSI(ALT_SCREEN_BUFFER)
-enable_bracketed_paste_mode = _enable_CSI(BRACKETED_PASTE_MODE)
-disable_bracketed_paste_mode = _disable_CSI(BRACKETED_PASTE_MODE)
-
-
-# *- Cursor shapes -* #
-
-user_defined_cursor_shape = cursor_shape(0)
-blinking_block_cursor_shape = cursor_shape(1)
-steady_block_cursor_shape = cursor_shape(2)
-blinking_underline_cursor_shape = cursor_shape(3)
-steady_underline_cursor_shape = cursor_shape(4)
-blinking_bar_cursor_shape = cursor_shape(5)
-steady_bar_cursor_shape = cursor_shape(6)
-
-
 # aliases
 CUU = cursor_up
 CUD = cursor_down
@@ -277,133 +418,160 @@ SU = scroll_up
 SD = scroll_down
 HVP = horizontal_vertical_position
 SGR = select_graphical_rendition
-EAP = AUX_port_off  # Enable Aux Port [U]
-DAP = AUX_port_off  # Disable Aux Port [U]
-DSR = device_status_report
-SCP = SCOSC = save_current_cursor_position
-RCP = SCORC = restore_current_cursor_position
-ECV = show_cursor  # Enable Cursor Visibility  [U]
-DCV = hide_cursor  # Disable Cursor Visibility [U]
-EFR = enable_focus_report  # [U]
-DFR = disable_focus_report  # [U]
-EASB = enable_alternative_screen_buffer  # [U]
-DASB = disable_alternative_screen_buffer  # [U]
-EBPM = enable_bracketed_paste_mode  # [U]
-DBPM = disable_bracketed_paste_mode  # [U]
-UDFCS = user_defined_cursor_shape  # [U]
-BBLCS = blinking_block_cursor_shape  # [U]
-SBLCS = steady_block_cursor_shape  # [U]
-BULCS = blinking_underline_cursor_shape  # [U]
-SULCS = steady_underline_cursor_shape  # [U]
-BBRCS = blinking_bar_cursor_shape  # [U]
-SBRCS = steady_bar_cursor_shape  # [U]
 
 
-# *- SGR-based sequences -* #
+@_lazy_sequences
+def _CSI_sequences() -> dict[str, EscapeSequence]:
+    AUX_port_on = _AUX_port(5)
+    AUX_port_off = _AUX_port(4)
+    device_status_report = CSI("n", 6)
+    save_current_cursor_position = CSI("s")
+    restore_current_cursor_position = CSI("u")
+    show_cursor = _enable_CSI(CURSOR_VISIBILITY)
+    hide_cursor = _disable_CSI(CURSOR_VISIBILITY)
+    enable_focus_report = _enable_CSI(FOCUS_REPORT)
+    disable_focus_report = _disable_CSI(FOCUS_REPORT)
+    enable_alternative_screen_buffer = _enable_CSI(ALT_SCREEN_BUFFER)
+    disable_alternative_screen_buffer = _disable_CSI(ALT_SCREEN_BUFFER)
+    enable_bracketed_paste_mode = _enable_CSI(BRACKETED_PASTE_MODE)
+    disable_bracketed_paste_mode = _disable_CSI(BRACKETED_PASTE_MODE)
+
+    # aliases
+    EAP = AUX_port_off  # Enable Aux Port [U]
+    DAP = AUX_port_off  # Disable Aux Port [U]
+    DSR = device_status_report
+    SCP = SCOSC = save_current_cursor_position
+    RCP = SCORC = restore_current_cursor_position
+    ECV = show_cursor  # Enable Cursor Visibility  [U]
+    DCV = hide_cursor  # Disable Cursor Visibility [U]
+    EFR = enable_focus_report  # [U]
+    DFR = disable_focus_report  # [U]
+    EASB = enable_alternative_screen_buffer  # [U]
+    DASB = disable_alternative_screen_buffer  # [U]
+    EBPM = enable_bracketed_paste_mode  # [U]
+    DBPM = disable_bracketed_paste_mode  # [U]
+
+    return locals()
+
+
+# *- Cursor shapes -* #
 
 
-reset = SGR(0)
-bold = SGR(1)
-faint = SGR(2)
-italic = SGR(3)
-underline = SGR(4)
-slow_blink = SGR(5)
-rapid_blink = SGR(6)
-invert = SGR(7)
-conceal = SGR(8)  # = hide
-crossed_out = SGR(9)
-primary_font = SGR(10)
+@_lazy_sequences
+def _cursor_shape_sequences() -> dict[str, EscapeSequence]:
+    user_defined_cursor_shape = cursor_shape(0)
+    blinking_block_cursor_shape = cursor_shape(1)
+    steady_block_cursor_shape = cursor_shape(2)
+    blinking_underline_cursor_shape = cursor_shape(3)
+    steady_underline_cursor_shape = cursor_shape(4)
+    blinking_bar_cursor_shape = cursor_shape(5)
+    steady_bar_cursor_shape = cursor_shape(6)
+
+    # aliases
+    UDFCS = user_defined_cursor_shape  # [U]
+    BBLCS = blinking_block_cursor_shape  # [U]
+    SBLCS = steady_block_cursor_shape  # [U]
+    BULCS = blinking_underline_cursor_shape  # [U]
+    SULCS = steady_underline_cursor_shape  # [U]
+    BBRCS = blinking_bar_cursor_shape  # [U]
+    SBRCS = steady_bar_cursor_shape  # [U]
+
+    return locals()
+
+
+# *- SGR-based sequences -* #
 
 
 def alternative_font(n: AltFontNumber) -> EscapeSequence:
     return SGR(n + 10)
 
 
-fraktur = SGR(20)  # [RS]
-double_underline = SGR(21)  # THIS MIGHT DISABLE BOLD ON SOME TERMINALS
-normal_intensity = SGR(22)
-no_italic = SGR(23)
-no_underline = SGR(24)  # Also disables double underline
-no_blink = SGR(25)  # Disables both blinks
-proportional_spacing = SGR(26)
-no_invert = SGR(27)
-no_conceal = SGR(28)  # = reveal
-not_crossed_out = SGR(29)
+class PaletteTable(Sequence[EscapeSequence]):
+    """
+    The 256 sequences that select a palette color (`ESC [ <code> ; 5 ; n m`),
+    indexed by color, and their encoded form (`encoded`).
 
+    They are built on first access.
+    """
 
-def foreground_color(n: int) -> EscapeSequence:
-    return SGR(FOREGROUND_CODE + 8, 5, n)
+    def __init__(self, code: int) -> None:
+        self.code = code
 
+    @cached_property
+    def sequences(self) -> tuple[EscapeSequence, ...]:
+        return tuple(
+            EscapeSequence(f"{CHAR_ESC}[{self.code};5;{n}m") for n in range(256)
+        )
 
-def foreground_truecolor(r: int, g: int, b: int) -> EscapeSequence:
-    return SGR(FOREGROUND_CODE + 8, 2, r, g, b)
+    @cached_property
+    def encoded(self) -> tuple[bytes, ...]:
+        return tuple(sequence.encoded for sequence in self.sequences)
 
+    @overload
+    def __getitem__(self, index: int) -> EscapeSequence:
+        ...
 
-default_foreground_color = SGR(FOREGROUND_CODE + RESET)
+    @overload
+    def __getitem__(self, index: slice) -> tuple[EscapeSequence, ...]:
+        ...
 
+    def __getitem__(
+        self,
+        index: Union[int, slice],
+    ) -> Union[EscapeSequence, tuple[EscapeSequence, ...]]:
+        return self.sequences[index]
 
-def background_color(n: int) -> EscapeSequence:
-    return SGR(BACKGROUND_CODE + 8, 5, n)
+    def __len__(self) -> int:
+        return 256
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.code})"
 
-def background_truecolor(r: int, g: int, b: int) -> EscapeSequence:
-    return SGR(BACKGROUND_CODE + 8, 2, r, g, b)
+
+FOREGROUND_COLORS = PaletteTable(FOREGROUND_CODE + 8)
+BACKGROUND_COLORS = PaletteTable(BACKGROUND_CODE + 8)
+UNDERLINE_COLORS = PaletteTable(UNDERLINE_CODE + 8)  # NOT STANDARD
+
+
+def foreground_color(n: int) -> EscapeSequence:
+    if 0 <= n <= 255:
+        return FOREGROUND_COLORS.sequences[n]
+
+    return SGR(FOREGROUND_CODE + 8, 5, n)
 
 
-default_background_color = SGR(BACKGROUND_CODE + RESET)
+# the truecolor factories format a template rather than going through
+# `escape_sequence`
+@_memoizable
+def foreground_truecolor(r: int, g: int, b: int) -> EscapeSequence:
+    return EscapeSequence(f"{CHAR_ESC}[38;2;{r};{g};{b}m")
 
 
-no_proportional_spacing = SGR(50)
-framed = SGR(51)
-encircled = SGR(52)
-overlined = SGR(53)
-not_framed_encircled = SGR(54)
-not_overlined = SGR(55)
+def background_color(n: int) -> EscapeSequence:
+    if 0 <= n <= 255:
+        return BACKGROUND_COLORS.sequences[n]
+
+    return SGR(BACKGROUND_CODE + 8, 5, n)
+
+
+@_memoizable
+def background_truecolor(r: int, g: int, b: int) -> EscapeSequence:
+    return EscapeSequence(f"{CHAR_ESC}[48;2;{r};{g};{b}m")
 
 
 def underline_color(n: int) -> EscapeSequence:  # NOT STANDARD
+    if 0 <= n <= 255:
+        return UNDERLINE_COLORS.sequences[n]
+
     return SGR(UNDERLINE_CODE + 8, 5, n)
 
 
+@_memoizable
 def underline_truecolor(r: int, g: int, b: int) -> EscapeSequence:  # NOT STANDARD
-    return SGR(UNDERLINE_CODE + 8, 2, r, g, b)
-
-
-default_underline_color = SGR(UNDERLINE_CODE + RESET)  # NOT STANDARD
-ideogram_underline = SGR(60)  # [RS]
-ideogram_double_underline = SGR(61)  # [RS]
-ideogram_overline = SGR(62)  # [RS]
-ideogram_double_overline = SGR(63)  # [RS]
-ideogram_stress_marking = SGR(64)  # [RS]
-no_ideogram = SGR(65)  # [RS]
-superscript = SGR(73)  # mintty only?
-subscript = SGR(74)  # mintty only?
-no_superscript_subscript = SGR(75)  # mintty only?
-
-# NOT STANDARD ↓
-foreground_bright_black = SGR(90)
-foreground_bright_red = SGR(91)
-foreground_bright_green = SGR(92)
-foreground_bright_yellow = SGR(93)
-foreground_bright_blue = SGR(94)
-foreground_bright_magenta = SGR(95)
-foreground_bright_cyan = SGR(96)
-foreground_bright_white = SGR(97)
-background_bright_black = SGR(100)
-background_bright_red = SGR(101)
-background_bright_green = SGR(102)
-background_bright_yellow = SGR(103)
-background_bright_blue = SGR(104)
-background_bright_magenta = SGR(105)
-background_bright_cyan = SGR(106)
-background_bright_white = SGR(107)
+    return EscapeSequence(f"{CHAR_ESC}[58;2;{r};{g};{b}m")
+
 
 # aliases
-dim = faint
-hide = conceal
-strikethrough = crossed_out
-reveal = no_conceal
-no_strikethrough = not_crossed_out
 fg_color = foreground_color
 fg_truecolor = foreground_truecolor
 bg_color = background_color
@@ -411,31 +579,158 @@ bg_truecolor = background_truecolor
 ul_color = underline_color
 ul_truecolor = underline_truecolor
 
-# convenient values
-fg_black = foreground_color(0)
-fg_red = foreground_color(1)
-fg_green = foreground_color(2)
-fg_yellow = foreground_color(3)
-fg_blue = foreground_color(4)
-fg_magenta = foreground_color(5)
-fg_cyan = foreground_color(6)
-fg_white = foreground_color(7)
-bg_black = background_color(0)
-bg_red = background_color(1)
-bg_green = background_color(2)
-bg_yellow = background_color(3)
-bg_blue = background_color(4)
-bg_magenta = background_color(5)
-bg_cyan = background_color(6)
-bg_white = background_color(7)
-ul_black = underline_color(0)
-ul_red = underline_color(1)
-ul_green = underline_color(2)
-ul_yellow = underline_color(3)
-ul_blue = underline_color(4)
-ul_magenta = underline_color(5)
-ul_cyan = underline_color(6)
-ul_white = underline_color(7)
+
+@_lazy_sequences
+def _SGR_sequences() -> dict[str, EscapeSequence]:
+    reset = SGR(0)
+    bold = SGR(1)
+    faint = SGR(2)
+    italic = SGR(3)
+    underline = SGR(4)
+    slow_blink = SGR(5)
+    rapid_blink = SGR(6)
+    invert = SGR(7)
+    conceal = SGR(8)  # = hide
+    crossed_out = SGR(9)
+    primary_font = SGR(10)
+    fraktur = SGR(20)  # [RS]
+    double_underline = SGR(21)  # THIS MIGHT DISABLE BOLD ON SOME TERMINALS
+    normal_intensity = SGR(22)
+    no_italic = SGR(23)
+    no_underline = SGR(24)  # Also disables double underline
+    no_blink = SGR(25)  # Disables both blinks
+    proportional_spacing = SGR(26)
+    no_invert = SGR(27)
+    no_conceal = SGR(28)  # = reveal
+    not_crossed_out = SGR(29)
+    default_foreground_color = SGR(FOREGROUND_CODE + RESET)
+    default_background_color = SGR(BACKGROUND_CODE + RESET)
+    no_proportional_spacing = SGR(50)
+    framed = SGR(51)
+    encircled = SGR(52)
+    overlined = SGR(53)
+    not_framed_encircled = SGR(54)
+    not_overlined = SGR(55)
+    default_underline_color = SGR(UNDERLINE_CODE + RESET)  # NOT STANDARD
+    ideogram_underline = SGR(60)  # [RS]
+    ideogram_double_underline = SGR(61)  # [RS]
+    ideogram_overline = SGR(62)  # [RS]
+    ideogram_double_overline = SGR(63)  # [RS]
+    ideogram_stress_marking = SGR(64)  # [RS]
+    no_ideogram = SGR(65)  # [RS]
+    superscript = SGR(73)  # mintty only?
+    subscript = SGR(74)  # mintty only?
+    no_superscript_subscript = SGR(75)  # mintty only?
+
+    # aliases
+    dim = faint
+    hide = conceal
+    strikethrough = crossed_out
+    reveal = no_conceal
+    no_strikethrough = not_crossed_out
+
+    return locals()
+
+
+@_lazy_sequences
+def _color_sequences() -> dict[str, EscapeSequence]:
+    # NOT STANDARD ↓
+    foreground_bright_black = SGR(90)
+    foreground_bright_red = SGR(91)
+    foreground_bright_green = SGR(92)
+    foreground_bright_yellow = SGR(93)
+    foreground_bright_blue = SGR(94)
+    foreground_bright_magenta = SGR(95)
+    foreground_bright_cyan = SGR(96)
+    foreground_bright_white = SGR(97)
+    background_bright_black = SGR(100)
+    background_bright_red = SGR(101)
+    background_bright_green = SGR(102)
+    background_bright_yellow = SGR(103)
+    background_bright_blue = SGR(104)
+    background_bright_magenta = SGR(105)
+    background_bright_cyan = SGR(106)
+    background_bright_white = SGR(107)
+
+    # convenient values
+    fg_black = foreground_color(0)
+    fg_red = foreground_color(1)
+    fg_green = foreground_color(2)
+    fg_yellow = foreground_color(3)
+    fg_blue = foreground_color(4)
+    fg_magenta = foreground_color(5)
+    fg_cyan = foreground_color(6)
+    fg_white = foreground_color(7)
+    bg_black = background_color(0)
+    bg_red = background_color(1)
+    bg_green = background_color(2)
+    bg_yellow = background_color(3)
+    bg_blue = background_color(4)
+    bg_magenta = background_color(5)
+    bg_cyan = background_color(6)
+    bg_white = background_color(7)
+    ul_black = underline_color(0)
+    ul_red = underline_color(1)
+    ul_green = underline_color(2)
+    ul_yellow = underline_color(3)
+    ul_blue = underline_color(4)
+    ul_magenta = underline_color(5)
+    ul_cyan = underline_color(6)
+    ul_white = underline_color(7)
+
+    return locals()
+
+
+# *- SGR coalescing -* #
+
+
+_GRAPHICAL_RENDITION_PATTERN = re.compile(r"\x1b\[([0-9;]*)m")
+
+
+def is_graphical_rendition(sequence: str) -> bool:
+    """
+    Whether `sequence` is a single SGR sequence (`ESC [ ... m`).
+    """
+
+    return _GRAPHICAL_RENDITION_PATTERN.fullmatch(sequence) is not None
+
+
+def coalesce_sequences(sequences: Iterable[str]) -> EscapeSequence:
+    r"""
+    Concatenate `sequences`, merging consecutive SGR sequences into a
+    single one.
+
+    ## Example
+
+    ```py
+    >>> coalesce_sequences([bold, italic, fg_truecolor(1, 2, 3)])
+    '[1;3;38;2;1;2;3m'
+    ```
+
+    Other sequences are kept as is and in order.
+    """
+
+    parts: list[str] = []
+    parameters: list[str] = []
+
+    for sequence in sequences:
+        match = _GRAPHICAL_RENDITION_PATTERN.fullmatch(sequence)
+
+        if match is not None:
+            # an empty parameter list means 0 (reset)
+            parameters.append(match[1] or "0")
+            continue
+
+        if parameters:
+            parts.append(f"{CHAR_ESC}[{';'.join(parameters)}m")
+            parameters.clear()
+
+        parts.append(sequence)
+
+    if parameters:
+        parts.append(f"{CHAR_ESC}[{';'.join(parameters)}m")
+
+    return EscapeSequence("".join(parts))
 
 
 # *- Designate character set -* #
@@ -446,37 +741,134 @@ def DCHARSET(subcode: str) -> EscapeSequence:
     return ESC("(", subcode)
 
 
-# sequences
-DEC_line_drawing = DCHARSET("0")
-US_ASCII = DCHARSET("B")
+@_lazy_sequences
+def _charset_sequences() -> dict[str, EscapeSequence]:
+    DEC_line_drawing = DCHARSET("0")
+    US_ASCII = DCHARSET("B")
+
+    return locals()
 
 
 # *- Numpad and Fn keys -* #
-insert = numpad(2)
-delete = numpad(3)
-page_up = numpad(5)
-page_down = numpad(6)
+
+
+@_lazy_sequences
+def _key_sequences() -> dict[str, EscapeSequence]:
+    insert = numpad(2)
+    delete = numpad(3)
+    page_up = numpad(5)
+    page_down = numpad(6)
+
+    return locals()
 
 
 # *- Extensions -* #
 
-soft_reset = ESC("[!", "p")
 
+@_lazy_sequences
+def _extension_sequences() -> dict[str, EscapeSequence]:
+    soft_reset = ESC("[!", "p")
+
+    # aliases
+    DECSTR = soft_reset
+
+    return locals()
+
+
+# *- Synchronized output -* #
+
+
+# apart from the other modes, as coquille uses them itself
+@_lazy_sequences
+def _synchronized_output_sequences() -> dict[str, EscapeSequence]:
+    begin_synchronized_update = _enable_CSI(SYNCHRONIZED_OUTPUT)
+    end_synchronized_update = _disable_CSI(SYNCHRONIZED_OUTPUT)
+
+    # aliases
+    BSU = begin_synchronized_update
+    ESU = end_synchronized_update
+
+    return locals()
+
+
+# *- Name registry -* #
 
-# aliases
-DECSTR = soft_reset
 
+class _SequenceRegistry(Mapping[EscapeSequenceName, EscapeSequence]):
+    # a read-only view of the constant sequences, built on first access
 
-def get_sequence_from_name(name: str) -> EscapeSequence:
-    module_items = dict(globals())
-    sequence_error = ValueError(f"{name!r} is not a valid escape sequence name")
+    def __getitem__(self, name: EscapeSequenceName) -> EscapeSequence:
+        if name not in _LAZY_SECTIONS:
+            raise KeyError(name)
 
-    if name not in module_items:
-        raise sequence_error
+        sequence = globals().get(name)
 
-    sequence = module_items[name]
+        if sequence is None:
+            return __getattr__(name)
 
-    if not isinstance(sequence, EscapeSequence):
-        raise sequence_error
+        return sequence
+
+    def __iter__(self) -> Iterator[EscapeSequenceName]:
+        return iter(_LAZY_SECTIONS)
+
+    def __len__(self) -> int:
+        return len(_LAZY_SECTIONS)
+
+
+# every sequence of this module (aliases included) by name
+SEQUENCES: Mapping[EscapeSequenceName, EscapeSequence] = _SequenceRegistry()
+_CASEFOLDED_NAMES: Mapping[str, EscapeSequenceName] = MappingProxyType(
+    {name.casefold(): name for name in _LAZY_SECTIONS},
+)
+
+
+def get_sequence_from_name(
+    name: EscapeSequenceName,
+    *,
+    case_sensitive: bool = True,
+) -> EscapeSequence:
+    """
+    Get the escape sequence registered as `name` (e.g. "fg_red" or "DECSTR").
+
+    Raise a `ValueError` if there is none.
+    """
+
+    try:
+        if case_sensitive:
+            return SEQUENCES[name]
+
+        return SEQUENCES[_CASEFOLDED_NAMES[name.casefold()]]
+    except KeyError:
+        raise ValueError(f"{name!r} is not a valid escape sequence name") from None
+
+
+@lru_cache(maxsize=1024)
+def get_sequence_from_names(
+    names: tuple[EscapeSequenceName, ...],
+    *,
+    case_sensitive: bool = True,
+) -> EscapeSequence:
+    """
+    Resolve a tuple of names into a single escape sequence that is the
+    concatenation of each of them.
+
+    The result is cached, so resolving the same names again is a lookup.
+    """
 
-    return sequence
+    return EscapeSequence(
+        "".join(
+            get_sequence_from_name(name, case_sensitive=case_sensitive)
+            for name in names
+        ),
+    )
+
+
+# the constant sequences are built by `from coquille.sequences import *`
+__all__ = [
+    *(
+        name
+        for name in globals()
+        if not name.startswith("_") and name not in _IMPORTED_NAMES
+    ),
+    *_LAZY_SECTIONS,
+]
@@ -1,3 +1,4 @@
+import collections.abc
 import typing
 
 CHAR_ESC: str
@@ -6,6 +7,7 @@ CURSOR_VISIBILITY: int
 FOCUS_REPORT: int
 ALT_SCREEN_BUFFER: int
 BRACKETED_PASTE_MODE: int
+SYNCHRONIZED_OUTPUT: int
 
 FOREGROUND_CODE: int
 BACKGROUND_CODE: int
@@ -17,7 +19,8 @@ EscapeSequenceName: typing.TypeAlias = str
 AltFontNumber: typing.TypeAlias = typing.Literal[1, 2, 3, 4, 5, 6, 7, 8, 9]
 
 class EscapeSequence(str):
-    pass
+    @property
+    def encoded(self) -> bytes: ...
 
 def escape_sequence(
     code: str,
@@ -28,6 +31,23 @@ def escape_sequence(
 
 ESC = escape_sequence
 
+# *- Factory cache -* #
+
+FACTORY_CACHE_MAXSIZE: int
+
+class FactoryCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+def configure_factory_cache(
+    enabled: bool = True,
+    maxsize: int = FACTORY_CACHE_MAXSIZE,
+) -> None: ...
+def factory_cache_info() -> dict[str, FactoryCacheInfo]: ...
+def clear_factory_cache() -> None: ...
+
 def single_shift_two() -> EscapeSequence: ...
 def single_shift_three() -> EscapeSequence: ...
 def device_control_string() -> EscapeSequence: ...
@@ -179,6 +199,24 @@ no_invert: EscapeSequence
 no_conceal: EscapeSequence  # = reveal
 not_crossed_out: EscapeSequence
 
+class PaletteTable(collections.abc.Sequence[EscapeSequence]):
+    code: int
+
+    def __init__(self, code: int) -> None: ...
+    @property
+    def sequences(self) -> tuple[EscapeSequence, ...]: ...
+    @property
+    def encoded(self) -> tuple[bytes, ...]: ...
+    @typing.overload
+    def __getitem__(self, index: int) -> EscapeSequence: ...
+    @typing.overload
+    def __getitem__(self, index: slice) -> tuple[EscapeSequence, ...]: ...
+    def __len__(self) -> int: ...
+
+FOREGROUND_COLORS: PaletteTable
+BACKGROUND_COLORS: PaletteTable
+UNDERLINE_COLORS: PaletteTable
+
 def foreground_color(n: int) -> EscapeSequence: ...
 def foreground_truecolor(r: int, g: int, b: int) -> EscapeSequence: ...
 
@@ -269,6 +307,11 @@ ul_magenta: EscapeSequence
 ul_cyan: EscapeSequence
 ul_white: EscapeSequence
 
+# *- SGR coalescing -* #
+
+def is_graphical_rendition(sequence: str) -> bool: ...
+def coalesce_sequences(sequences: collections.abc.Iterable[str]) -> EscapeSequence: ...
+
 # *- Designate character set -* #
 
 # helpers
@@ -291,4 +334,26 @@ soft_reset: EscapeSequence
 # aliases
 DECSTR: EscapeSequence
 
-def get_sequence_from_name(name: str) -> EscapeSequence: ...
+# *- Synchronized output -* #
+
+begin_synchronized_update: EscapeSequence
+end_synchronized_update: EscapeSequence
+
+# aliases
+BSU: EscapeSequence
+ESU: EscapeSequence
+
+# *- Name registry -* #
+
+SEQUENCES: collections.abc.Mapping[EscapeSequenceName, EscapeSequence]
+
+def get_sequence_from_name(
+    name: EscapeSequenceName,
+    *,
+    case_sensitive: bool = True,
+) -> EscapeSequence: ...
+def get_sequence_from_names(
+    names: tuple[EscapeSequenceName, ...],
+    *,
+    case_sensitive: bool = True,
+) -> EscapeSequence: ...
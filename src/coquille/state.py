@@ -0,0 +1,394 @@
+"""
+# Terminal state
+
+A model of the part of the terminal state that escape sequences act
+on: the graphic rendition (SGR attributes, font and colors) and the
+private modes (cursor visibility, alternative screen buffer...).
+
+It allows to know which sequences would not change anything, and to
+compute the shortest sequence that goes from a state to another.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import replace
+from functools import lru_cache
+from typing import Optional
+
+from coquille.sequences import CHAR_ESC
+from coquille.sequences import CURSOR_VISIBILITY
+from coquille.sequences import EscapeSequence
+from coquille.sequences import reset_initial_state
+from coquille.sequences import soft_reset
+
+__all__ = [
+    "ATTRIBUTE_CODES",
+    "is_stateless",
+    "PRIMARY_FONT",
+    "TerminalState",
+]
+
+
+PRIMARY_FONT = 10
+
+# attribute code -> code that disables it
+_ATTRIBUTE_OFF_CODES: dict[int, int] = {
+    1: 22,  # bold
+    2: 22,  # faint
+    3: 23,  # italic
+    20: 23,  # fraktur
+    4: 24,  # underline
+    21: 24,  # double underline
+    5: 25,  # slow blink
+    6: 25,  # rapid blink
+    7: 27,  # invert
+    8: 28,  # conceal
+    9: 29,  # crossed out
+    26: 50,  # proportional spacing
+    51: 54,  # framed
+    52: 54,  # encircled
+    53: 55,  # overlined
+    60: 65,  # ideogram underline
+    61: 65,  # ideogram double underline
+    62: 65,  # ideogram overline
+    63: 65,  # ideogram double overline
+    64: 65,  # ideogram stress marking
+    73: 75,  # superscript
+    74: 75,  # subscript
+}
+# every SGR attribute code, in order
+ATTRIBUTE_CODES: tuple[int, ...] = tuple(sorted(_ATTRIBUTE_OFF_CODES))
+# code -> attributes it disables
+_OFF_CODE_ATTRIBUTES: dict[int, frozenset[int]] = {
+    off_code: frozenset(
+        code for code, other in _ATTRIBUTE_OFF_CODES.items() if other == off_code
+    )
+    for off_code in set(_ATTRIBUTE_OFF_CODES.values())
+}
+
+# extended color code (`38;5;n`, `38;2;r;g;b`...) -> default color code
+_FOREGROUND_COLOR = 38
+_BACKGROUND_COLOR = 48
+_UNDERLINE_COLOR = 58
+_DEFAULT_COLOR_CODES = {
+    _FOREGROUND_COLOR: 39,
+    _BACKGROUND_COLOR: 49,
+    _UNDERLINE_COLOR: 59,
+}
+
+# ESC [ (?) params (m|h|l)
+_CSI_STATE_PATTERN = re.compile(r"\x1b\[(\??)([0-9;]*)([hlm])")
+# cursor movements, erasing, scrolling, cursor save/restore, status report
+_STATELESS_PATTERN = re.compile(r"\x1b(?:\[[0-9;]*[A-HJKSTfnsu]|[78])")
+
+
+def is_stateless(sequence: str) -> bool:
+    """
+    Whether `sequence` acts on the screen or the cursor position only,
+    leaving nothing to undo afterwards (e.g. `cursor_up` or `erase_in_line`).
+    """
+
+    return _STATELESS_PATTERN.fullmatch(sequence) is not None
+
+
+def _parse_parameters(string: str) -> list[int]:
+    # an empty parameter means 0
+    return [int(parameter or 0) for parameter in string.split(";")]
+
+
+@dataclass(frozen=True)
+class TerminalState:
+    """
+    An immutable snapshot of the terminal state.
+
+    Colors are stored as the SGR parameters that set them (e.g. `(31,)`,
+    `(38, 5, 1)` or `(38, 2, 255, 0, 0)`) ; an empty tuple is the default
+    color.
+
+    Modes can be enabled, disabled or unknown (in neither set). The
+    latter is the case for every mode at first, as the state of the
+    terminal before coquille is not known.
+    """
+
+    attributes: frozenset[int] = frozenset()
+    font: int = PRIMARY_FONT
+    foreground: tuple[int, ...] = ()
+    background: tuple[int, ...] = ()
+    underline_color: tuple[int, ...] = ()
+    enabled_modes: frozenset[int] = frozenset()
+    disabled_modes: frozenset[int] = frozenset()
+
+    @classmethod
+    def from_sequences(cls, sequences: Iterable[str]) -> TerminalState:
+        """
+        Get the state obtained by applying `sequences` to the default one.
+
+        Raise a `ValueError` if the effect of one of them is not modeled.
+        """
+
+        state = cls()
+
+        for sequence in sequences:
+            new_state = state.apply(sequence)
+
+            if new_state is None:
+                raise ValueError(f"the effect of {sequence!r} is not modeled")
+
+            state = new_state
+
+        return state
+
+    def apply(self, sequence: str) -> Optional[TerminalState]:
+        """
+        Get the state after `sequence` is applied to this one.
+
+        Return None if the effect of `sequence` is not modeled, in
+        which case the resulting state is not known.
+        """
+
+        return _apply(self, sequence)
+
+    def delta(
+        self,
+        target: TerminalState,
+        reset_allowed: bool = True,
+    ) -> EscapeSequence:
+        """
+        Get the shortest sequence that goes from this state to `target`.
+
+        Modes that are unknown in `target` are left untouched. Unless
+        `reset_allowed`, the rendition is never reset as a whole (see
+        `undo`).
+        """
+
+        return _delta(self, target, reset_allowed)
+
+    def undo(self, previous: TerminalState) -> EscapeSequence:
+        """
+        Get the sequence that undoes exactly what was applied on top of
+        `previous` to get to this state (e.g. `normal_intensity` for
+        `bold`).
+
+        Unlike `delta`, it never resets the whole rendition, as `previous`
+        might not be the actual state of the terminal but only what
+        coquille knows about it.
+        """
+
+        return _delta(self, self.undo_target(previous), reset_allowed=False)
+
+    def undo_target(self, previous: TerminalState) -> TerminalState:
+        """
+        Get the state to go to in order to undo what was applied on top
+        of `previous`.
+
+        It is `previous`, except that modes which are unknown there but
+        were changed since then are set back to their opposite, e.g.
+        enabling the alternative screen buffer is undone by disabling it.
+        """
+
+        known = previous.enabled_modes | previous.disabled_modes
+
+        return replace(
+            previous,
+            enabled_modes=previous.enabled_modes | (self.disabled_modes - known),
+            disabled_modes=previous.disabled_modes | (self.enabled_modes - known),
+        )
+
+    def with_default_rendition(self) -> TerminalState:
+        """
+        Get this state with the default SGR attributes, font and colors,
+        but the same modes.
+        """
+
+        return TerminalState(
+            enabled_modes=self.enabled_modes,
+            disabled_modes=self.disabled_modes,
+        )
+
+    def _set_modes(self, modes: Iterable[int], *, enabled: bool) -> TerminalState:
+        modes = frozenset(modes)
+
+        if enabled:
+            return replace(
+                self,
+                enabled_modes=self.enabled_modes | modes,
+                disabled_modes=self.disabled_modes - modes,
+            )
+
+        return replace(
+            self,
+            enabled_modes=self.enabled_modes - modes,
+            disabled_modes=self.disabled_modes | modes,
+        )
+
+    @property
+    def graphical_rendition_parameters(self) -> tuple[int, ...]:
+        """
+        The SGR parameters that go from the default rendition to this one.
+        """
+
+        parameters: list[int] = sorted(self.attributes)
+
+        if self.font != PRIMARY_FONT:
+            parameters.append(self.font)
+
+        parameters.extend(self.foreground)
+        parameters.extend(self.background)
+        parameters.extend(self.underline_color)
+
+        return tuple(parameters)
+
+
+@lru_cache(maxsize=4096)
+def _apply(state: TerminalState, sequence: str) -> Optional[TerminalState]:
+    if sequence == soft_reset:
+        return state.with_default_rendition()._set_modes(
+            (CURSOR_VISIBILITY,),
+            enabled=True,
+        )
+
+    if sequence == reset_initial_state:
+        return TerminalState(enabled_modes=frozenset({CURSOR_VISIBILITY}))
+
+    match = _CSI_STATE_PATTERN.fullmatch(sequence)
+
+    if match is None:
+        return None
+
+    private, parameters, final = match.groups()
+
+    if private and final != "m":
+        return state._set_modes(_parse_parameters(parameters), enabled=final == "h")
+
+    if not private and final == "m":
+        return _apply_graphical_rendition(state, _parse_parameters(parameters))
+
+    return None
+
+
+def _apply_graphical_rendition(
+    state: TerminalState,
+    parameters: list[int],
+) -> Optional[TerminalState]:
+    attributes = set(state.attributes)
+    font = state.font
+    colors = {
+        _FOREGROUND_COLOR: state.foreground,
+        _BACKGROUND_COLOR: state.background,
+        _UNDERLINE_COLOR: state.underline_color,
+    }
+
+    index = 0
+
+    while index < len(parameters):
+        code = parameters[index]
+        index += 1
+
+        if code == 0:
+            attributes.clear()
+            font = PRIMARY_FONT
+            colors = dict.fromkeys(colors, ())
+        elif code in _ATTRIBUTE_OFF_CODES:
+            attributes.add(code)
+        elif code in _OFF_CODE_ATTRIBUTES:
+            attributes.difference_update(_OFF_CODE_ATTRIBUTES[code])
+        elif 10 <= code <= 19:
+            font = code
+        elif 30 <= code <= 37 or 90 <= code <= 97:
+            colors[_FOREGROUND_COLOR] = (code,)
+        elif 40 <= code <= 47 or 100 <= code <= 107:
+            colors[_BACKGROUND_COLOR] = (code,)
+        elif code in (39, 49, 59):
+            colors[code - 1] = ()
+        elif code in colors:
+            kind = parameters[index] if index < len(parameters) else None
+            length = {5: 2, 2: 4}.get(kind, 0)  # type: ignore
+
+            if length == 0 or index + length > len(parameters):
+                return None
+
+            colors[code] = (code, *parameters[index : index + length])
+            index += length
+        else:
+            return None
+
+    return TerminalState(
+        frozenset(attributes),
+        font,
+        colors[_FOREGROUND_COLOR],
+        colors[_BACKGROUND_COLOR],
+        colors[_UNDERLINE_COLOR],
+        state.enabled_modes,
+        state.disabled_modes,
+    )
+
+
+def _graphical_rendition_delta(
+    current: TerminalState,
+    target: TerminalState,
+) -> list[int]:
+    parameters: list[int] = []
+    remaining = current.attributes
+    removed = current.attributes - target.attributes
+
+    if removed:
+        off_codes = sorted({_ATTRIBUTE_OFF_CODES[code] for code in removed})
+        parameters.extend(off_codes)
+
+        for off_code in off_codes:
+            remaining = remaining - _OFF_CODE_ATTRIBUTES[off_code]
+
+    parameters.extend(sorted(target.attributes - remaining))
+
+    if current.font != target.font:
+        parameters.append(target.font)
+
+    for code, current_color, target_color in (
+        (_FOREGROUND_COLOR, current.foreground, target.foreground),
+        (_BACKGROUND_COLOR, current.background, target.background),
+        (_UNDERLINE_COLOR, current.underline_color, target.underline_color),
+    ):
+        if current_color != target_color:
+            parameters.extend(target_color or (_DEFAULT_COLOR_CODES[code],))
+
+    return parameters
+
+
+def _format_parameters(parameters: Sequence[int]) -> str:
+    return ";".join(map(str, parameters))
+
+
+@lru_cache(maxsize=4096)
+def _delta(
+    current: TerminalState,
+    target: TerminalState,
+    reset_allowed: bool = True,
+) -> EscapeSequence:
+    parts: list[str] = []
+
+    if (
+        current.attributes != target.attributes
+        or current.font != target.font
+        or current.foreground != target.foreground
+        or current.background != target.background
+        or current.underline_color != target.underline_color
+    ):
+        parameters = _format_parameters(_graphical_rendition_delta(current, target))
+
+        if reset_allowed:
+            # starting over from a reset might be shorter
+            full = _format_parameters((0, *target.graphical_rendition_parameters))
+            parameters = min(parameters, full, key=len)
+
+        parts.append(f"{CHAR_ESC}[{parameters}m")
+
+    if enabled := sorted(target.enabled_modes - current.enabled_modes):
+        parts.append(f"{CHAR_ESC}[?{_format_parameters(enabled)}h")
+
+    if disabled := sorted(target.disabled_modes - current.disabled_modes):
+        parts.append(f"{CHAR_ESC}[?{_format_parameters(disabled)}l")
+
+    return EscapeSequence("".join(parts))
@@ -0,0 +1,51 @@
+import collections.abc
+
+from coquille.sequences import EscapeSequence
+
+PRIMARY_FONT: int
+ATTRIBUTE_CODES: tuple[int, ...]
+
+def is_stateless(sequence: str) -> bool: ...
+
+class TerminalState:
+    attributes: frozenset[int]
+    font: int
+    foreground: tuple[int, ...]
+    background: tuple[int, ...]
+    underline_color: tuple[int, ...]
+    enabled_modes: frozenset[int]
+    disabled_modes: frozenset[int]
+
+    def __init__(
+        self,
+        attributes: frozenset[int] = ...,
+        font: int = ...,
+        foreground: tuple[int, ...] = ...,
+        background: tuple[int, ...] = ...,
+        underline_color: tuple[int, ...] = ...,
+        enabled_modes: frozenset[int] = ...,
+        disabled_modes: frozenset[int] = ...,
+    ) -> None: ...
+    def __hash__(self) -> int: ...
+    @classmethod
+    def from_sequences(
+        cls,
+        sequences: collections.abc.Iterable[str],
+    ) -> TerminalState: ...
+    def apply(self, sequence: str) -> TerminalState | None: ...
+    def delta(
+        self,
+        target: TerminalState,
+        reset_allowed: bool = True,
+    ) -> EscapeSequence: ...
+    def undo(self, previous: TerminalState) -> EscapeSequence: ...
+    def undo_target(self, previous: TerminalState) -> TerminalState: ...
+    def with_default_rendition(self) -> TerminalState: ...
+    def _set_modes(
+        self,
+        modes: collections.abc.Iterable[int],
+        *,
+        enabled: bool,
+    ) -> TerminalState: ...
+    @property
+    def graphical_rendition_parameters(self) -> tuple[int, ...]: ...
@@ -0,0 +1,496 @@
+"""
+# Style
+
+A compact, immutable graphic rendition for per-cell renderers: the SGR
+attributes are the bits of an integer, and each color is packed into a
+single integer, so that comparing, hashing, merging and diffing styles
+do not involve strings.
+
+Parsing and diffing SGR sequences are left to `TerminalState`, whose
+results are cached for each style.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Optional
+
+from coquille.colors import ColorDepth
+from coquille.colors import palette_to_16
+from coquille.colors import rgb_to_16
+from coquille.colors import rgb_to_256
+from coquille.sequences import EscapeSequence
+from coquille.sequences import is_graphical_rendition
+from coquille.state import ATTRIBUTE_CODES
+from coquille.state import PRIMARY_FONT
+from coquille.state import TerminalState
+
+__all__ = [
+    "attribute_mask",
+    "basic_color",
+    "DEFAULT_COLOR",
+    "indexed_color",
+    "Style",
+    "true_color",
+]
+
+
+# each attribute is a bit, in the order of `ATTRIBUTE_CODES`
+_ATTRIBUTE_BITS: dict[int, int] = {
+    code: 1 << index for index, code in enumerate(ATTRIBUTE_CODES)
+}
+
+
+def attribute_mask(*codes: int) -> int:
+    """
+    Get the mask of the given SGR attribute codes (e.g. 1 for bold).
+    """
+
+    mask = 0
+
+    for code in codes:
+        if code not in _ATTRIBUTE_BITS:
+            raise ValueError(f"{code} is not an attribute code")
+
+        mask |= _ATTRIBUTE_BITS[code]
+
+    return mask
+
+
+def _attribute_codes(mask: int) -> list[int]:
+    # in increasing order
+    codes: list[int] = []
+    index = 0
+
+    while mask:
+        if mask & 1:
+            codes.append(ATTRIBUTE_CODES[index])
+
+        mask >>= 1
+        index += 1
+
+    return codes
+
+
+# *- Colors -* #
+
+# a color is packed as `kind | value`
+DEFAULT_COLOR = 0
+_TRUE_COLOR = 1 << 24
+_INDEXED_COLOR = 2 << 24
+_BASIC_COLOR = 3 << 24
+_KIND = 3 << 24
+_VALUE = (1 << 24) - 1
+
+
+def basic_color(n: int) -> int:
+    """
+    Pack one of the 16 colors of the `30-37` and `90-97` SGR codes
+    (bright colors are 8 to 15).
+
+    The underline color has no such codes, it is set with `58;5;n`.
+    """
+
+    return _BASIC_COLOR | n
+
+
+def indexed_color(n: int) -> int:
+    """
+    Pack one of the 256 colors of the palette (`38;5;n`).
+    """
+
+    return _INDEXED_COLOR | n
+
+
+def true_color(r: int, g: int, b: int) -> int:
+    """
+    Pack an RGB color (`38;2;r;g;b`).
+    """
+
+    return _TRUE_COLOR | r << 16 | g << 8 | b
+
+
+_FOREGROUND_COLOR = 38
+_BACKGROUND_COLOR = 48
+_UNDERLINE_COLOR = 58
+
+
+def _color_parameters(code: int, color: int) -> tuple[int, ...]:
+    # the SGR parameters that set `color` for the extended color `code`
+    kind = color & _KIND
+    value = color & _VALUE
+
+    if kind == _BASIC_COLOR and code == _UNDERLINE_COLOR:
+        return (code, 5, value)
+
+    if kind == _BASIC_COLOR:
+        return (code - 8 + value,) if value < 8 else (code + 52 + value - 8,)
+
+    if kind == _INDEXED_COLOR:
+        return (code, 5, value)
+
+    if kind == _TRUE_COLOR:
+        return (code, 2, value >> 16, value >> 8 & 0xFF, value & 0xFF)
+
+    return ()
+
+
+def _parse_color(parameters: tuple[int, ...]) -> int:
+    if not parameters:
+        return DEFAULT_COLOR
+
+    if len(parameters) == 1:
+        code = parameters[0]
+        return basic_color(code % 10 if code < 90 else code % 10 + 8)
+
+    if parameters[1] == 5:
+        return indexed_color(parameters[2])
+
+    return true_color(*parameters[2:5])
+
+
+# *- Style -* #
+
+
+class Style:
+    """
+    An immutable graphic rendition.
+
+    - `attributes` is a mask of SGR attributes (see `attribute_mask`) ;
+    - `font` is the SGR code of the font (10 to 19) ;
+    - colors are packed integers (see `basic_color`, `indexed_color` and
+    `true_color`), `DEFAULT_COLOR` being the default one.
+
+    `a | b` is `a` with everything that `b` sets on top of it, and `a - b`
+    is what `a` sets that `b` does not.
+
+    ## Example
+
+    ```py
+    >>> title = Style.from_sequences([bold, fg_red])
+    >>> title.sequence
+    '\\x1b[1;38;5;1m'
+    >>> title - Style.from_sequences([bold]) == Style.from_sequences([fg_red])
+    True
+    >>> Style().delta(title)
+    '\\x1b[1;38;5;1m'
+    ```
+    """
+
+    __slots__ = (
+        "attributes",
+        "font",
+        "foreground",
+        "background",
+        "underline_color",
+        "_hash",
+    )
+
+    attributes: int
+    font: int
+    foreground: int
+    background: int
+    underline_color: int
+    _hash: int
+
+    def __init__(
+        self,
+        attributes: int = 0,
+        font: int = PRIMARY_FONT,
+        foreground: int = DEFAULT_COLOR,
+        background: int = DEFAULT_COLOR,
+        underline_color: int = DEFAULT_COLOR,
+    ) -> None:
+        _initialize(self, attributes, font, foreground, background, underline_color)
+
+    @classmethod
+    def from_sequences(cls, sequences: Iterable[str]) -> Style:
+        """
+        Get the style obtained by applying `sequences` to the default one.
+
+        Raise a `ValueError` if one of them is not an SGR sequence.
+        """
+
+        style = DEFAULT_STYLE
+
+        for sequence in sequences:
+            new_style = style.apply(sequence)
+
+            if new_style is None:
+                raise ValueError(f"{sequence!r} is not a graphic rendition")
+
+            style = new_style
+
+        return style
+
+    @classmethod
+    def from_terminal_state(cls, state: TerminalState) -> Style:
+        """
+        Get the graphic rendition of `state`.
+        """
+
+        return _from_terminal_state(state)
+
+    def to_terminal_state(self) -> TerminalState:
+        """
+        Get the terminal state that has this graphic rendition.
+        """
+
+        return _to_terminal_state(self)
+
+    def apply(self, sequence: str) -> Optional[Style]:
+        """
+        Get the style after `sequence`, or None if it is not an SGR
+        sequence.
+        """
+
+        return _apply(self, sequence)
+
+    def delta(self, target: Style) -> EscapeSequence:
+        """
+        Get the shortest SGR sequence that goes from this style to `target`.
+        """
+
+        if self is target:
+            return EscapeSequence("")
+
+        return _delta(self, target)
+
+    def downsample(self, depth: ColorDepth) -> Style:
+        """
+        Get this style with its colors converted to the nearest ones
+        available at `depth` (see `coquille.colors`).
+        """
+
+        if depth == "truecolor":
+            return self
+
+        return _downsample(self, depth)
+
+    @property
+    def parameters(self) -> tuple[int, ...]:
+        """
+        The SGR parameters that go from the default style to this one.
+        """
+
+        parameters = _attribute_codes(self.attributes)
+
+        if self.font != PRIMARY_FONT:
+            parameters.append(self.font)
+
+        parameters.extend(_color_parameters(_FOREGROUND_COLOR, self.foreground))
+        parameters.extend(_color_parameters(_BACKGROUND_COLOR, self.background))
+        parameters.extend(_color_parameters(_UNDERLINE_COLOR, self.underline_color))
+
+        return tuple(parameters)
+
+    @property
+    def sequence(self) -> EscapeSequence:
+        """
+        The SGR sequence that goes from the default style to this one.
+        """
+
+        return DEFAULT_STYLE.delta(self)
+
+    def __or__(self, other: Style) -> Style:
+        if not isinstance(other, Style):
+            return NotImplemented
+
+        return _merge(self, other)
+
+    def __sub__(self, other: Style) -> Style:
+        if not isinstance(other, Style):
+            return NotImplemented
+
+        return _difference(self, other)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+
+        if not isinstance(other, Style):
+            return NotImplemented
+
+        return (
+            self._hash == other._hash
+            and self.attributes == other.attributes
+            and self.font == other.font
+            and self.foreground == other.foreground
+            and self.background == other.background
+            and self.underline_color == other.underline_color
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        if self == DEFAULT_STYLE:
+            return f"{type(self).__name__}()"
+
+        return f"{type(self).__name__}.from_sequences([{self.sequence!r}])"
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return (
+            type(self),
+            (
+                self.attributes,
+                self.font,
+                self.foreground,
+                self.background,
+                self.underline_color,
+            ),
+        )
+
+
+# the slots are set through their descriptors, as `__setattr__` forbids it
+_set_attributes = Style.attributes.__set__  # type: ignore
+_set_font = Style.font.__set__  # type: ignore
+_set_foreground = Style.foreground.__set__  # type: ignore
+_set_background = Style.background.__set__  # type: ignore
+_set_underline_color = Style.underline_color.__set__  # type: ignore
+_set_hash = Style._hash.__set__  # type: ignore
+
+
+def _initialize(
+    style: Style,
+    attributes: int,
+    font: int,
+    foreground: int,
+    background: int,
+    underline_color: int,
+) -> None:
+    _set_attributes(style, attributes)
+    _set_font(style, font)
+    _set_foreground(style, foreground)
+    _set_background(style, background)
+    _set_underline_color(style, underline_color)
+    _set_hash(
+        style,
+        hash((attributes, font, foreground, background, underline_color)),
+    )
+
+
+def _new(
+    attributes: int,
+    font: int,
+    foreground: int,
+    background: int,
+    underline_color: int,
+) -> Style:
+    style = object.__new__(Style)
+    _initialize(style, attributes, font, foreground, background, underline_color)
+
+    return style
+
+
+DEFAULT_STYLE = Style()
+
+
+# the same few styles are combined over and over
+@lru_cache(maxsize=4096)
+def _merge(style: Style, other: Style) -> Style:
+    return _new(
+        style.attributes | other.attributes,
+        style.font if other.font == PRIMARY_FONT else other.font,
+        other.foreground or style.foreground,
+        other.background or style.background,
+        other.underline_color or style.underline_color,
+    )
+
+
+@lru_cache(maxsize=4096)
+def _difference(style: Style, other: Style) -> Style:
+    return _new(
+        style.attributes & ~other.attributes,
+        PRIMARY_FONT if style.font == other.font else style.font,
+        DEFAULT_COLOR if style.foreground == other.foreground else style.foreground,
+        DEFAULT_COLOR if style.background == other.background else style.background,
+        DEFAULT_COLOR
+        if style.underline_color == other.underline_color
+        else style.underline_color,
+    )
+
+
+def _downsample_color(
+    color: int,
+    depth: ColorDepth,
+    underline: bool = False,
+) -> int:
+    kind = color & _KIND
+    value = color & _VALUE
+
+    if color == DEFAULT_COLOR or depth == "none":
+        return DEFAULT_COLOR
+
+    if kind == _TRUE_COLOR:
+        r, g, b = value >> 16, value >> 8 & 0xFF, value & 0xFF
+
+        if depth == "256":
+            return indexed_color(rgb_to_256(r, g, b))
+
+        n = rgb_to_16(r, g, b)
+    elif kind == _INDEXED_COLOR and depth == "16":
+        n = palette_to_16(value)
+    else:
+        return color
+
+    # there are no basic underline colors
+    return indexed_color(n) if underline else basic_color(n)
+
+
+@lru_cache(maxsize=4096)
+def _downsample(style: Style, depth: ColorDepth) -> Style:
+    return _new(
+        style.attributes,
+        style.font,
+        _downsample_color(style.foreground, depth),
+        _downsample_color(style.background, depth),
+        _downsample_color(style.underline_color, depth, underline=True),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _from_terminal_state(state: TerminalState) -> Style:
+    return _new(
+        attribute_mask(*state.attributes),
+        state.font,
+        _parse_color(state.foreground),
+        _parse_color(state.background),
+        _parse_color(state.underline_color),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _to_terminal_state(style: Style) -> TerminalState:
+    return TerminalState(
+        frozenset(_attribute_codes(style.attributes)),
+        style.font,
+        _color_parameters(_FOREGROUND_COLOR, style.foreground),
+        _color_parameters(_BACKGROUND_COLOR, style.background),
+        _color_parameters(_UNDERLINE_COLOR, style.underline_color),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _apply(style: Style, sequence: str) -> Optional[Style]:
+    # modes are part of a terminal state, not of a style
+    if not is_graphical_rendition(sequence):
+        return None
+
+    state = _to_terminal_state(style).apply(sequence)
+
+    return None if state is None else _from_terminal_state(state)
+
+
+@lru_cache(maxsize=4096)
+def _delta(current: Style, target: Style) -> EscapeSequence:
+    if current == target:
+        return EscapeSequence("")
+
+    return _to_terminal_state(current).delta(_to_terminal_state(target))
@@ -0,0 +1,57 @@
+from collections.abc import Iterable
+
+from coquille.colors import ColorDepth
+from coquille.sequences import EscapeSequence
+from coquille.state import TerminalState
+
+__all__ = [
+    "attribute_mask",
+    "basic_color",
+    "DEFAULT_COLOR",
+    "indexed_color",
+    "Style",
+    "true_color",
+]
+
+DEFAULT_COLOR: int
+
+def attribute_mask(*codes: int) -> int: ...
+def basic_color(n: int) -> int: ...
+def indexed_color(n: int) -> int: ...
+def true_color(r: int, g: int, b: int) -> int: ...
+
+class Style:
+    @property
+    def attributes(self) -> int: ...
+    @property
+    def font(self) -> int: ...
+    @property
+    def foreground(self) -> int: ...
+    @property
+    def background(self) -> int: ...
+    @property
+    def underline_color(self) -> int: ...
+    def __init__(
+        self,
+        attributes: int = 0,
+        font: int = ...,
+        foreground: int = ...,
+        background: int = ...,
+        underline_color: int = ...,
+    ) -> None: ...
+    @classmethod
+    def from_sequences(cls, sequences: Iterable[str]) -> Style: ...
+    @classmethod
+    def from_terminal_state(cls, state: TerminalState) -> Style: ...
+    def to_terminal_state(self) -> TerminalState: ...
+    def apply(self, sequence: str) -> Style | None: ...
+    def delta(self, target: Style) -> EscapeSequence: ...
+    def downsample(self, depth: ColorDepth) -> Style: ...
+    @property
+    def parameters(self) -> tuple[int, ...]: ...
+    @property
+    def sequence(self) -> EscapeSequence: ...
+    def __or__(self, other: Style) -> Style: ...
+    def __sub__(self, other: Style) -> Style: ...
+    def __eq__(self, other: object) -> bool: ...
+    def __hash__(self) -> int: ...
@@ -17,4 +17,25 @@ class SupportsWriteAndFlush(Protocol[_T_contra]):
     def flush(self) -> None:
         pass
 
+class SupportsWriteAndDrain(Protocol):
+    """
+    What coquille uses of `asyncio.StreamWriter`.
+    """
+
+    @abstractmethod
+    def write(self, __data: bytes) -> object:
+        pass
+
+    @abstractmethod
+    async def drain(self) -> None:
+        pass
+
+    @abstractmethod
+    def close(self) -> object:
+        pass
+
+    @abstractmethod
+    async def wait_closed(self) -> None:
+        pass
+
 Self = TypeVar("Self")
@@ -0,0 +1,9 @@
+__all__ = [
+    "char_width",
+    "strip_sequences",
+    "visible_width",
+]
+
+def strip_sequences(text: str) -> str: ...
+def char_width(char: str) -> int: ...
+def visible_width(text: str) -> int: ...
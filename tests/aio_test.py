@@ -0,0 +1,148 @@
+import asyncio
+import os
+
+from coquille.aio import AsyncWriter
+from coquille.sequences import bold
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_truecolor
+
+
+class RecordingStream:
+    def __init__(self) -> None:
+        self.writes: list[bytes] = []
+        self.drains = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        self.writes.append(data)
+
+    async def drain(self) -> None:
+        self.drains += 1
+
+    def close(self) -> None:
+        self.closed = True
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def test_writes_are_batched():
+    stream = RecordingStream()
+
+    async def main():
+        writer = AsyncWriter(stream)
+        writer.write("a", bold, "fg_red")
+        writer.apply(bold)
+        writer.write("b", end="")
+        assert stream.writes == []
+
+        # the end of the iteration of the event loop
+        await asyncio.sleep(0)
+        assert stream.writes == [b"\x1b[1;38;5;1ma\n\x1b[22;39m\x1b[1mb"]
+
+        writer.write("c")
+        await writer.close()
+
+    asyncio.run(main())
+    assert stream.writes[1:] == [b"c\n"]
+    assert stream.drains == 1
+    assert stream.closed
+
+
+def test_style():
+    stream = RecordingStream()
+
+    async def main():
+        writer = AsyncWriter(stream, color_depth="16")
+
+        with writer.style(fg_red):
+            writer.write("a", bold)
+
+            with writer.style(foreground_truecolor(0, 0, 238)):
+                writer.write("b")
+
+        await writer.drain()
+
+    asyncio.run(main())
+    assert b"".join(stream.writes) == (
+        b"\x1b[31m\x1b[1ma\n\x1b[22m\x1b[34mb\n\x1b[31m\x1b[39m"
+    )
+
+
+def test_style_in_interleaved_tasks():
+    stream = RecordingStream()
+
+    async def main():
+        writer = AsyncWriter(stream)
+        entered = asyncio.Event()
+        written = asyncio.Event()
+
+        async def styled():
+            with writer.style(bold):
+                writer.write("A1")
+                entered.set()
+                await written.wait()
+                writer.write("A2")
+
+        async def plain():
+            await entered.wait()
+            writer.write("B")
+            writer.write("Bb", bold)
+            written.set()
+
+        await asyncio.gather(styled(), plain())
+        await writer.drain()
+
+    asyncio.run(main())
+    # the block of a task is sent as a whole, at its end
+    assert b"".join(stream.writes) == (
+        b"B\n" + b"\x1b[1mBb\n\x1b[22m" + b"\x1b[1mA1\nA2\n\x1b[22m"
+    )
+
+
+def test_close_restores_blocking_mode():
+    read_end, write_end = os.pipe()
+    file = os.fdopen(write_end, "w")
+    assert os.get_blocking(write_end)
+
+    async def main():
+        writer = await AsyncWriter.open(file)
+        writer.write("a")
+        await writer.close()
+
+    asyncio.run(main())
+    assert os.get_blocking(write_end)
+    assert os.read(read_end, 16) == b"a\n"
+    file.close()
+    os.close(read_end)
+
+
+def test_open_pipe_backpressure():
+    read_end, write_end = os.pipe()
+    file = os.fdopen(write_end, "w")
+
+    async def main():
+        writer = await AsyncWriter.open(file)
+        loop = asyncio.get_running_loop()
+
+        # more than the pipe can hold
+        for _ in range(1000):
+            writer.write("x" * 1000, bold)
+
+        drain = asyncio.ensure_future(writer.drain())
+        await asyncio.sleep(0.05)
+        assert not drain.done()
+
+        received = 0
+
+        while received < 1000 * 1010:
+            received += len(await loop.run_in_executor(None, os.read, read_end, 65536))
+
+        await drain
+        await writer.close()
+
+        return received
+
+    assert asyncio.run(main()) == 1000 * len("\x1b[1m" + "x" * 1000 + "\n\x1b[22m")
+    file.close()
+    os.close(read_end)
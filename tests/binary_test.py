@@ -0,0 +1,68 @@
+import os
+from io import BytesIO
+
+import pytest
+from coquille.binary import BinaryWriter
+from coquille.prelude import Coquille
+from coquille.prelude import write
+from coquille.sequences import bold
+from coquille.sequences import fg_red
+
+
+def test_encoded():
+    assert bold.encoded == b"\x1b[1m"
+    assert bold.encoded is bold.encoded
+
+
+def test_BinaryWriter_buffer():
+    file = BytesIO()
+    writer = BinaryWriter(file)
+    writer.write_segments([bold.encoded, b"x"])
+    writer.write("é")
+    assert writer.pending == 7
+    assert file.getvalue() == b""
+
+    writer.flush()
+    assert file.getvalue() == b"\x1b[1mx\xc3\xa9"
+    assert writer.pending == 0
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def test_BinaryWriter_descriptor(pipe):
+    read_fd, write_fd = pipe
+    writer = BinaryWriter(write_fd)
+
+    for _ in range(3):
+        writer.write_bytes(fg_red.encoded)
+        writer.write_bytes(b"")
+
+    writer.write_segments(iter([b"a", b"b"]))
+    writer.flush()
+    assert os.read(read_fd, 1024) == fg_red.encoded * 3 + b"ab"
+    assert writer.pending == 0
+
+
+def test_BinaryWriter_descriptor_writes_nothing(pipe, monkeypatch):
+    _, write_fd = pipe
+    monkeypatch.setattr(os, "writev", lambda fd, segments: 0)
+    monkeypatch.setattr(os, "write", lambda fd, segment: 0)
+    writer = BinaryWriter(write_fd)
+    writer.write_bytes(b"a")
+
+    with pytest.raises(OSError):
+        writer.flush()
+
+
+def test_BinaryWriter_as_file():
+    file = BytesIO()
+    writer = BinaryWriter(file)
+    write("x", bold, file=writer)
+    Coquille.new(fg_red, file=writer).write("y", end="")
+    assert file.getvalue() == b"\x1b[1mx\n\x1b[22m\x1b[38;5;1my\x1b[39m"
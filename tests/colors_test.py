@@ -0,0 +1,98 @@
+import itertools
+
+import pytest
+from coquille.colors import detect_color_depth
+from coquille.colors import downsample
+from coquille.colors import palette_to_16
+from coquille.colors import palette_to_rgb
+from coquille.colors import rgb_to_16
+from coquille.colors import rgb_to_256
+from coquille.sequences import bold
+from coquille.sequences import foreground_truecolor
+
+
+def _distance(a, b):
+    return sum((x - y) ** 2 for x, y in zip(a, b))
+
+
+@pytest.mark.parametrize(
+    ["n", "rgb"],
+    [
+        (1, (205, 0, 0)),
+        (16, (0, 0, 0)),
+        (67, (95, 135, 175)),
+        (231, (255, 255, 255)),
+        (244, (128, 128, 128)),
+    ],
+)
+def test_palette_to_rgb(n, rgb):
+    assert palette_to_rgb(n) == rgb
+
+
+@pytest.mark.parametrize("n", [16, 67, 196, 231, 232, 255])
+def test_rgb_to_256_palette_colors(n):
+    assert rgb_to_256(*palette_to_rgb(n)) == n
+
+
+def test_lookup_tables_are_nearest():
+    # the tables are exact for the colors they are sampled at
+    for rgb in itertools.product([0, 66, 132, 198, 255], repeat=3):
+        def distance(n):
+            return _distance(rgb, palette_to_rgb(n))
+
+        nearest_256 = min(range(16, 256), key=distance)
+        nearest_16 = min(range(16), key=distance)
+
+        assert distance(rgb_to_256(*rgb)) == distance(nearest_256)
+        assert rgb_to_16(*rgb) == nearest_16
+
+
+@pytest.mark.parametrize(
+    ["n", "basic"],
+    [(1, 1), (15, 15), (196, 9), (16, 0), (231, 15)],
+)
+def test_palette_to_16(n, basic):
+    assert palette_to_16(n) == basic
+
+
+@pytest.mark.parametrize(
+    ["string", "depth", "output"],
+    [
+        ("\x1b[38;2;255;0;0mx", "truecolor", "\x1b[38;2;255;0;0mx"),
+        ("\x1b[38;2;255;0;0mx", "256", "\x1b[38;5;196mx"),
+        ("\x1b[38;2;255;0;0mx", "16", "\x1b[91mx"),
+        ("\x1b[38;2;255;0;0mx", "none", "x"),
+        ("\x1b[1;48;2;0;0;0;58;2;255;0;0mx", "16", "\x1b[1;40;58;5;9mx"),
+        ("\x1b[38:2::255:0:0mx", "256", "\x1b[38;5;196mx"),
+        ("\x1b[38;5;196mx", "256", "\x1b[38;5;196mx"),
+        ("\x1b[38;5;196mx", "16", "\x1b[91mx"),
+        ("\x1b[1;31;44mx\x1b[0m", "none", "\x1b[1mx\x1b[0m"),
+        ("\x1b[39;49mx\x1b[m", "none", "\x1b[39;49mx\x1b[m"),
+        ("\x1b[4:3;31mx", "none", "\x1b[4:3mx"),
+        ("\x1b[38;5mx", "16", "\x1b[38;5mx"),
+        ("\x1b[?25lx", "none", "\x1b[?25lx"),
+    ],
+)
+def test_downsample(string, depth, output):
+    assert downsample(string, depth) == output
+
+
+def test_downsample_factories():
+    string = bold + foreground_truecolor(0, 0, 238) + "x"
+    assert downsample(string, "16") == bold + "\x1b[34mx"
+
+
+@pytest.mark.parametrize(
+    ["environ", "depth"],
+    [
+        ({}, "16"),
+        ({"TERM": "xterm-256color"}, "256"),
+        ({"TERM": "xterm-256color", "COLORTERM": "truecolor"}, "truecolor"),
+        ({"TERM": "xterm-direct"}, "truecolor"),
+        ({"TERM": "dumb", "COLORTERM": "truecolor"}, "none"),
+        ({"TERM": "xterm-256color", "NO_COLOR": "1"}, "none"),
+        ({"TERM": "xterm-256color", "NO_COLOR": ""}, "256"),
+    ],
+)
+def test_detect_color_depth(environ, depth):
+    assert detect_color_depth(environ) == depth
@@ -1,12 +1,27 @@
+import gc
+import re
+import threading
+import time
+import weakref
 from io import StringIO
 
 import pytest
 from coquille.prelude import *
+from coquille.sequences import bold
 from coquille.sequences import DEC_save_cursor
 from coquille.sequences import erase_in_display
 from coquille.sequences import fg_black
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_color
+from coquille.sequences import foreground_truecolor
+from coquille.sequences import hide_cursor
+from coquille.sequences import italic
 from coquille.sequences import select_graphical_rendition
+from coquille.sequences import soft_reset
 from coquille.sequences import start_of_string
+from coquille.style import Style
+
+from tests.conftest import CountingStream
 
 
 @pytest.mark.parametrize(
@@ -39,5 +54,511 @@ def test_apply(sequence, args, output):
     assert file.getvalue() == output
 
 
+@pytest.mark.parametrize(
+    ["flush_policy", "end", "flushes"],
+    [
+        ("call", "\n", 1),
+        ("call", "", 1),
+        ("line", "\n", 1),
+        ("line", "", 0),
+        ("manual", "\n", 0),
+    ],
+)
+def test_write(flush_policy, end, flushes):
+    file = CountingStream()
+    write("x", "fg_red", bold, end=end, file=file, flush_policy=flush_policy)
+    assert file.getvalue() == "\x1b[1;38;5;1mx" + end + "\x1b[22;39m"
+    assert file.writes == 1
+    assert file.flushes == flushes
+
+
+def test_Coquille_print():
+    file = CountingStream()
+    coquille = Coquille.new("fg_red", bold, file=file)
+    coquille.print("a", 1, sep="-", end="!")
+    assert file.getvalue() == "\x1b[1;38;5;1ma-1!\x1b[22;39m"
+    assert (file.writes, file.flushes) == (1, 1)
+
+
+def test_Coquille_context():
+    file = CountingStream()
+
+    with Coquille.new(fg_red, bold, file=file, flush_policy="manual") as coquille:
+        coquille.print("x")
+
+    # the style is already active when printing in the block
+    assert file.getvalue() == "\x1b[1;38;5;1mx\n\x1b[22;39m"
+    assert (file.writes, file.flushes) == (3, 0)
+
+
+def test_Coquille_nested_contexts():
+    file = StringIO()
+
+    with Coquille.new(fg_red, bold, file=file) as outer:
+        with Coquille.new(italic, "fg_green", bold, file=file):
+            outer.print("x", end="")
+            write("y", "dim", end="", file=file)
+
+        outer.apply(bold)
+        outer.apply(italic)
+        outer.reset()
+
+    assert file.getvalue() == (
+        "\x1b[1;38;5;1m"  # outer
+        + "\x1b[3;38;5;2m"  # inner, bold is already there
+        + "\x1b[38;5;1mx\x1b[38;5;2m"  # outer's style, then back to inner's
+        + "\x1b[2my\x1b[22;1m"  # dim, then back to inner's bold
+        + "\x1b[23;38;5;1m"  # back to outer
+        + "\x1b[3m"  # bold is already active
+        + "\x1b[22;23;39m"  # reset, nothing left to undo on exit
+    )
+
+
+@pytest.mark.parametrize(
+    ["sequences", "undo"],
+    [
+        ((bold,), "\x1b[22m"),
+        (("fg_red",), "\x1b[39m"),
+        ((hide_cursor,), "\x1b[?25h"),
+        (("enable_alternative_screen_buffer",), "\x1b[?1049l"),
+        ((bold, "steady_bar_cursor_shape"), soft_reset),
+        ((EscapeSequence("\x1b[1;99m"),), soft_reset),
+        ((), ""),
+    ],
+)
+def test_write_undo(sequences, undo):
+    file = StringIO()
+    write("", *sequences, end="", file=file)
+    assert file.getvalue().endswith(undo)
+
+
+def test_write_keeps_non_SGR_sequences_in_order():
+    file = StringIO()
+    write("x", bold, DEC_save_cursor, fg_red, "italic", end="", file=file)
+    assert file.getvalue() == (
+        "\x1b[1m" + DEC_save_cursor + "\x1b[3;38;5;1mx" + "\x1b[22;23;39m"
+    )
+
+
+def test_Coquille_compile():
+    file = CountingStream()
+    compiled = Coquille.new("fg_red", bold, file=file).compile()
+    assert compiled.prefix == "\x1b[1;38;5;1m"
+    assert compiled.suffix == "\x1b[22;39m"
+    assert compiled.format("x") == "\x1b[1;38;5;1mx\x1b[22;39m"
+    assert compiled.format_bytes(b"x") == b"\x1b[1;38;5;1mx\x1b[22;39m"
+
+    compiled.write("x")
+    assert file.getvalue() == "\x1b[1;38;5;1mx\n\x1b[22;39m"
+    assert (file.writes, file.flushes) == (1, 1)
+
+    other = StringIO()
+    compiled.write("y", end="", file=other)
+    assert other.getvalue() == "\x1b[1;38;5;1my\x1b[22;39m"
+
+
+def test_StatefulWriter():
+    file = CountingStream()
+    writer = StatefulWriter(file)
+    writer.write("a", "bold", fg_red, end="")
+    writer.write("b", fg_red, bold, end="")
+    writer.apply(hide_cursor, hide_cursor, "italic")
+    writer.apply(DEC_save_cursor, italic)
+    writer.reset()
+    writer.reset()
+    assert file.getvalue() == (
+        "\x1b[1;38;5;1ma" + "b" + "\x1b[3m\x1b[?25l" + DEC_save_cursor + "\x1b[0m"
+    )
+    assert file.writes == file.flushes == 5
+
+
+def test_StatefulWriter_soft_reset():
+    file = StringIO()
+    writer = StatefulWriter(file)
+    writer.apply(bold, soft_reset, bold)
+    assert file.getvalue() == "\x1b[1m" + soft_reset + "\x1b[1m"
+    assert writer.state == TerminalState(
+        attributes=frozenset({1}),
+        enabled_modes=frozenset({25}),
+    )
+
+
+def test_color_depth():
+    file = StringIO()
+    red = foreground_truecolor(255, 0, 0)
+    write("x", red, end="", file=file, color_depth="256")
+    Coquille.new(red, file=file, color_depth="16").print("y", end="")
+    writer = StatefulWriter(file, color_depth="none")
+    writer.write("z", red, bold, end="")
+    assert file.getvalue() == (
+        "\x1b[38;5;196mx\x1b[39m" + "\x1b[91my\x1b[39m" + "\x1b[1mz"
+    )
+
+    compiled = Coquille.new(red, color_depth="256").compile()
+    assert compiled.prefix == "\x1b[38;5;196m"
+
+
+def test_write_many():
+    file = CountingStream()
+    write_many(
+        [
+            ("def", bold),
+            (" ", ()),
+            ("main", (fg_red, "italic")),
+            ("(", ()),
+            (")", ()),
+            ("x", bold),
+            ("y", "bold"),
+        ],
+        file=file,
+    )
+    assert file.getvalue() == (
+        "\x1b[1mdef" + "\x1b[22m " + "\x1b[3;38;5;1mmain" + "\x1b[23;39m()"
+        + "\x1b[1mxy" + "\x1b[22m"
+    )
+    assert (file.writes, file.flushes) == (1, 1)
+
+
+def test_write_many_in_context():
+    file = StringIO()
+
+    with Coquille.new(fg_red, file=file, flush_policy="manual"):
+        write_many([("a", bold), ("b", fg_black), ("c", ())], file=file)
+
+    assert file.getvalue() == (
+        "\x1b[38;5;1m" + "\x1b[1ma" + "\x1b[22;38;5;0mb" + "\x1b[38;5;1mc" + "\x1b[39m"
+    )
+
+
+def test_write_many_keeps_the_enclosing_style():
+    file = StringIO()
+
+    with Coquille.new(bold, file=file):
+        write_many([("a", italic), ("b", ())], file=file)
+
+    # plain text is back to the style of the block, without a reset
+    assert file.getvalue() == "\x1b[1m" + "\x1b[3ma" + "\x1b[23mb" + "\x1b[22m"
+
+
+def test_write_many_style_spans():
+    file = StringIO()
+    write_many(
+        [("a", Style.from_sequences([bold, fg_red])), ("b", ()), ("c", Style())],
+        file=file,
+    )
+    assert file.getvalue() == "\x1b[1;38;5;1ma" + "\x1b[22;39mbc"
+
+
+def test_write_many_unmodeled_sequences():
+    file = StringIO()
+    write_many([("a", (start_of_string(), bold)), ("b", bold)], file=file)
+    assert file.getvalue() == (
+        "\x1bX\x1b[1ma" + soft_reset + "\x1b[1mb" + "\x1b[22m"
+    )
+
+
+def test_write_many_chunk_size():
+    file = CountingStream()
+    write_many(((str(n), bold) for n in range(10)), file=file, chunk_size=4)
+    assert file.getvalue() == "\x1b[1m0123456789\x1b[22m"
+    assert file.writes == 4
+
+
+class SlowStream(StringIO):
+    """
+    A stream whose writes let other threads run in the middle.
+    """
+
+    def write(self, s: str) -> int:
+        for index in range(0, len(s), 4):
+            super().write(s[index : index + 4])
+            time.sleep(0)
+
+        return len(s)
+
+
+def test_SharedWriter():
+    file = CountingStream()
+    shared = SharedWriter(file)
+    write("a", bold, file=shared, flush_policy="manual")
+    assert file.getvalue() == ""
+
+    write("b", "italic", file=shared)
+    assert file.getvalue() == "\x1b[1ma\n\x1b[22m\x1b[3mb\n\x1b[23m"
+    assert (file.writes, file.flushes) == (1, 1)
+
+
+def test_SharedWriter_commits_with_blocks_as_a_whole():
+    file = StringIO()
+    shared = SharedWriter(file)
+
+    with Coquille.new(fg_red, file=shared) as coquille:
+        coquille.print("a")
+        write("b", bold, file=shared)
+        assert file.getvalue() == ""
+
+    assert file.getvalue() == "\x1b[38;5;1ma\n\x1b[1mb\n\x1b[22m\x1b[39m"
+
+
+def test_SharedWriter_commits_when_a_thread_ends():
+    file = StringIO()
+    shared = SharedWriter(file)
+    thread = threading.Thread(
+        target=write,
+        args=("a", bold),
+        kwargs={"file": shared, "flush_policy": "manual"},
+    )
+    thread.start()
+    thread.join()
+
+    assert file.getvalue() == "\x1b[1ma\n\x1b[22m"
+
+
+@pytest.mark.parametrize("writer_type", [SharedWriter, BackgroundWriter])
+def test_SharedWriter_is_collected(writer_type):
+    writer = writer_type(StringIO())
+    write("a", file=writer)
+
+    if isinstance(writer, BackgroundWriter):
+        writer.close()
+
+    reference = weakref.ref(writer)
+    del writer
+    gc.collect()
+
+    assert reference() is None
+
+
+def test_SharedWriter_threads():
+    # each thread writes records with its own color ; they must come out
+    # whole, and with no color of another thread
+    threads = 8
+    records = 200
+    file = SlowStream()
+    shared = SharedWriter(file)
+    barrier = threading.Barrier(threads)
+
+    def log(thread):
+        color = foreground_color(thread)
+        barrier.wait()
+
+        for n in range(records):
+            if n % 2:
+                write(f"{thread}:{n}", color, bold, file=shared)
+            else:
+                with Coquille.new(color, file=shared) as coquille:
+                    coquille.print(f"{thread}:{n}")
+                    coquille.apply(bold)
+                    coquille.print(f"{thread}:{n}")
+
+    workers = [threading.Thread(target=log, args=(thread,)) for thread in range(threads)]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    record_pattern = re.compile(
+        r"\x1b\[1;38;5;(\d)m(\d):(\d+)\n\x1b\[22;39m"
+        r"|\x1b\[38;5;(\d)m(\d):(\d+)\n\x1b\[1m(\d):(\d+)\n\x1b\[22;39m",
+    )
+    seen = set()
+    position = 0
+
+    while position < len(file.getvalue()):
+        match = record_pattern.match(file.getvalue(), position)
+        assert match is not None, file.getvalue()[position : position + 80]
+
+        values = [int(value) for value in match.groups() if value is not None]
+        assert len(set(values[:2] + values[3:4])) == 1
+        seen.add((values[1], values[2]))
+        position = match.end()
+
+    assert seen == {(thread, n) for thread in range(threads) for n in range(records)}
+
+
+class GatedStream(StringIO):
+    """
+    A stream whose writes wait for `gate`, and record what they got.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.writes: list[str] = []
+
+    def write(self, s: str) -> int:
+        self.started.set()
+        self.gate.wait()
+        self.writes.append(s)
+        return super().write(s)
+
+
+def test_BackgroundWriter_batches():
+    file = GatedStream()
+    writer = BackgroundWriter(file)
+    write("a", bold, file=writer)
+    # the thread is stuck writing the first record
+    file.started.wait()
+
+    for text in "bcd":
+        write(text, file=writer)
+
+    assert writer.stats() == BackgroundWriterStats(3, 3, 0, 0, 0)
+
+    file.gate.set()
+    writer.close()
+    assert file.writes == ["\x1b[1ma\n\x1b[22m", "b\nc\nd\n"]
+    assert writer.stats() == BackgroundWriterStats(0, 3, 4, 2, 0)
+
+
+@pytest.mark.parametrize(
+    ["policy", "output", "dropped"],
+    [
+        ("drop_newest", "0123", 1),
+        ("drop_oldest", "0234", 1),
+        ("coalesce", "04", 3),
+    ],
+)
+def test_BackgroundWriter_policies(policy, output, dropped):
+    file = GatedStream()
+    writer = BackgroundWriter(file, max_records=3, policy=policy)
+    write("0", end="", file=writer)
+    file.started.wait()
+
+    for text in "1234":
+        write(text, end="", file=writer)
+
+    file.gate.set()
+    writer.close()
+    assert file.getvalue() == output
+    assert writer.stats().dropped == dropped
+    assert writer.stats().peak_depth == 3
+
+
+def test_BackgroundWriter_blocks():
+    file = GatedStream()
+    writer = BackgroundWriter(file, max_records=1)
+    write("0", end="", file=writer)
+    file.started.wait()
+    write("1", end="", file=writer)
+
+    producer = threading.Thread(
+        target=write,
+        args=("2",),
+        kwargs={"end": "", "file": writer},
+    )
+    producer.start()
+    producer.join(0.05)
+    assert producer.is_alive()
+
+    file.gate.set()
+    producer.join()
+    writer.close()
+    assert file.getvalue() == "012"
+    assert writer.stats().dropped == 0
+
+
+def test_BackgroundWriter_commits_with_blocks_as_a_whole():
+    file = StringIO()
+    writer = BackgroundWriter(file)
+
+    with Coquille.new(fg_red, file=writer) as coquille:
+        coquille.print("a")
+        assert writer.stats().depth == 0
+
+    writer.close()
+    assert file.getvalue() == "\x1b[38;5;1ma\n\x1b[39m"
+
+    with pytest.raises(ValueError):
+        write("b", file=writer)
+
+
+def test_BackgroundWriter_error():
+    class BrokenStream(StringIO):
+        def write(self, s: str) -> int:
+            raise BrokenPipeError
+
+    writer = BackgroundWriter(BrokenStream())
+    write("a", file=writer)
+    writer._thread.join()
+
+    # the producers know why
+    with pytest.raises(ValueError) as error:
+        write("b", file=writer)
+
+    assert isinstance(error.value.__cause__, BrokenPipeError)
+
+    with pytest.raises(BrokenPipeError):
+        writer.close()
+
+
+def test_frame():
+    file = CountingStream()
+
+    with frame(file) as screen:
+        apply(hide_cursor, screen)
+        write("a", bold, file=screen)
+
+        with Coquille.new(fg_red, file=screen) as coquille:
+            coquille.print("b")
+
+        assert file.getvalue() == ""
+
+    assert file.getvalue() == (
+        "\x1b[?2026h\x1b[?25l\x1b[1ma\n\x1b[22m"
+        "\x1b[38;5;1mb\n\x1b[39m\x1b[?2026l"
+    )
+    assert (file.writes, file.flushes) == (1, 1)
+
+
+def test_frame_nested():
+    file = StringIO()
+
+    with frame(file, color_depth="none") as outer:
+        write("a", fg_red, file=outer)
+
+        with frame(outer) as inner:
+            write("b", file=inner)
+
+    assert file.getvalue() == "\x1b[?2026ha\n\x1b[39mb\n\x1b[?2026l"
+
+
+def test_frame_in_context():
+    file = StringIO()
+
+    with Coquille.new(bold, file=file):
+        with frame(file) as screen:
+            write("a", bold, file=screen)
+            write("b", italic, file=screen)
+
+    # the style of the block is kept
+    assert file.getvalue() == (
+        "\x1b[1m" + "\x1b[?2026ha\n" + "\x1b[3mb\n\x1b[23m" + "\x1b[?2026l"
+        + "\x1b[22m"
+    )
+
+
+def test_frame_error():
+    file = CountingStream()
+
+    with pytest.raises(KeyError):
+        with frame(file) as screen:
+            write("a", file=screen)
+            raise KeyError
+
+    assert (file.writes, file.flushes) == (0, 0)
+
+
+def test_frame_empty():
+    file = CountingStream()
+
+    with frame(file):
+        pass
+
+    assert (file.writes, file.flushes) == (0, 0)
+
+
 # TODO: test_ContextCoquille_*
-# TODO: test_Coquille_*
@@ -0,0 +1,233 @@
+import random
+
+import pytest
+from coquille.emulator import VirtualTerminal
+from coquille.prelude import apply
+from coquille.prelude import Coquille
+from coquille.prelude import write
+from coquille.screen import Screen
+from coquille.sequences import bold
+from coquille.sequences import cursor_position
+from coquille.sequences import DEC_line_drawing
+from coquille.sequences import DEC_restore_cursor
+from coquille.sequences import DEC_save_cursor
+from coquille.sequences import disable_alternative_screen_buffer
+from coquille.sequences import enable_alternative_screen_buffer
+from coquille.sequences import erase_in_display
+from coquille.sequences import erase_in_line
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_color
+from coquille.sequences import hide_cursor
+from coquille.sequences import reset_initial_state
+from coquille.sequences import restore_current_cursor_position
+from coquille.sequences import save_current_cursor_position
+from coquille.sequences import scroll_down
+from coquille.sequences import scroll_up
+from coquille.sequences import soft_reset
+from coquille.sequences import US_ASCII
+from coquille.style import basic_color
+from coquille.style import Style
+
+BOLD = Style.from_sequences([bold])
+RED = Style.from_sequences([fg_red])
+
+
+@pytest.fixture
+def terminal():
+    return VirtualTerminal(10, 4)
+
+
+def test_text(terminal):
+    terminal.write("Hello\nWorld")
+
+    assert terminal.lines == ["Hello     ", "World     ", " " * 10, " " * 10]
+    assert terminal.cursor == (1, 5)
+
+
+def test_text_without_newline_returns():
+    terminal = VirtualTerminal(10, 4, newline_returns=False)
+    terminal.write("ab\ncd")
+
+    assert terminal.text == "ab\n  cd"
+
+
+@pytest.mark.parametrize(
+    ["output", "text", "cursor"],
+    [
+        ("0123456789ab", "0123456789\nab", (1, 2)),
+        ("0123456789", "0123456789", (0, 9)),
+        ("\x1b[?7l0123456789ab", "012345678b", (0, 9)),
+        ("a\tb", "a       b", (0, 9)),
+        ("abc\b\bd", "adc", (0, 2)),
+        ("abc\rd", "dbc", (0, 1)),
+        ("1\n2\n3\n4\n5", "2\n3\n4\n5", (3, 1)),
+        ("日本語!", "日本語!", (0, 7)),
+        ("é", "é", (0, 1)),
+        (f"{DEC_line_drawing}lqk{US_ASCII}q", "┌─┐q", (0, 4)),
+    ],
+)
+def test_printing(terminal, output, text, cursor):
+    terminal.write(output)
+
+    assert terminal.text == text
+    assert terminal.cursor == cursor
+
+
+@pytest.mark.parametrize(
+    ["output", "cursor"],
+    [
+        (cursor_position(3, 5), (2, 4)),
+        (cursor_position(30, 50), (3, 9)),
+        ("\x1b[H", (0, 0)),
+        ("\x1b[3;5H\x1b[A", (1, 4)),
+        ("\x1b[3;5H\x1b[2D\x1b[B", (3, 2)),
+        ("\x1b[3;5H\x1b[20C", (2, 9)),
+        ("\x1b[3;5H\x1b[F", (1, 0)),
+        ("\x1b[3;5H\x1b[E", (3, 0)),
+        ("\x1b[3;5H\x1b[7G", (2, 6)),
+        ("\x1b[3;5H\x1bM\x1bM", (0, 4)),
+        (f"\x1b[3;5H{save_current_cursor_position}\x1b[H{restore_current_cursor_position}", (2, 4)),
+    ],
+)
+def test_cursor_movement(terminal, output, cursor):
+    terminal.write(output)
+
+    assert terminal.cursor == cursor
+
+
+@pytest.mark.parametrize(
+    ["sequence", "text"],
+    [
+        (erase_in_line(0), "aaaa\nbb\ncccc"),
+        (erase_in_line(1), "aaaa\n   b\ncccc"),
+        (erase_in_line(2), "aaaa\n\ncccc"),
+        (erase_in_display(0), "aaaa\nbb"),
+        (erase_in_display(1), "\n   b\ncccc"),
+        (erase_in_display(2), ""),
+        (scroll_up(1), "bbbb\ncccc"),
+        (scroll_down(1), "\naaaa\nbbbb\ncccc"),
+    ],
+)
+def test_erase_and_scroll(terminal, sequence, text):
+    terminal.write(f"aaaa\nbbbb\ncccc\x1b[2;3H{sequence}")
+
+    assert terminal.text == text
+
+
+def test_erase_uses_the_background_color(terminal):
+    terminal.write("\x1b[41m\x1b[2J")
+
+    assert terminal.cell(0, 0) == (" ", Style(background=basic_color(1)))
+
+
+def test_styles(terminal):
+    write("ab", bold, end="", file=terminal)
+    terminal.write("c")
+
+    assert terminal.cell(0, 0) == ("a", BOLD)
+    assert terminal.cell(0, 2) == ("c", Style())
+    assert terminal.pen == Style()
+
+
+def test_coquille_context(terminal):
+    with Coquille.new(fg_red, file=terminal) as coquille:
+        terminal.write("a")
+        coquille.apply(bold)
+        terminal.write("b")
+
+    terminal.write("c")
+
+    assert [terminal.cell(0, column)[1] for column in range(3)] == [
+        RED,
+        Style.from_sequences([fg_red, bold]),
+        Style(),
+    ]
+
+
+def test_modes(terminal):
+    apply(hide_cursor, file=terminal)
+    assert not terminal.cursor_visible
+
+    apply(soft_reset, file=terminal)
+    assert terminal.cursor_visible
+
+
+def test_alternative_screen(terminal):
+    terminal.write("main\x1b[2;2H")
+    apply(enable_alternative_screen_buffer, file=terminal)
+    terminal.write("alt")
+
+    assert terminal.alternative_screen
+    assert terminal.text == "\n alt"
+
+    apply(disable_alternative_screen_buffer, file=terminal)
+
+    assert terminal.text == "main"
+    assert terminal.cursor == (1, 1)
+
+
+def test_save_cursor_with_pen(terminal):
+    terminal.write(f"\x1b[2;3H{bold}{DEC_save_cursor}\x1b[0m\x1b[H{DEC_restore_cursor}")
+
+    assert terminal.cursor == (1, 2)
+    assert terminal.pen == BOLD
+
+
+def test_reset_initial_state(terminal):
+    terminal.write(f"{bold}abc{hide_cursor}{reset_initial_state}")
+
+    assert terminal.text == ""
+    assert terminal.cursor == (0, 0)
+    assert terminal.pen == Style()
+    assert terminal.cursor_visible
+
+
+def test_title(terminal):
+    terminal.write("\x1b]0;coquille\x07")
+
+    assert terminal.title == "coquille"
+
+
+def test_split_sequences(terminal):
+    for char in f"{bold}a{cursor_position(2, 2)}b":
+        terminal.write(char)
+
+    assert terminal.cell(0, 0) == ("a", BOLD)
+    assert terminal.cell(1, 1) == ("b", BOLD)
+
+
+def test_bytes_per_frame(terminal):
+    terminal.write("ab")
+    terminal.write("日")
+    terminal.flush()
+    terminal.flush()
+    apply(bold, file=terminal)
+
+    assert terminal.bytes_written == 9
+    assert terminal.frame_sizes == [5, 4]
+
+
+def test_screen_frames():
+    terminal = VirtualTerminal(12, 5)
+    screen = Screen(12, 5, file=terminal)
+    styles = [Style()] + [
+        Style.from_sequences([bold, foreground_color(n)]) for n in range(4)
+    ]
+    rng = random.Random(0)
+
+    for _ in range(20):
+        for _ in range(8):
+            screen.put(
+                rng.randrange(5),
+                rng.randrange(12),
+                rng.choice(["a", "bc", "def"]),
+                rng.choice(styles),
+            )
+
+        screen.present()
+
+        for row in range(5):
+            for column in range(12):
+                assert terminal.cell(row, column) == screen.get(row, column)
+
+    assert len(terminal.frame_sizes) == 20
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+from coquille import image
+from coquille.image import render_half_blocks
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+BLACK = (0, 0, 0)
+
+
+@pytest.mark.parametrize(
+    ["pixels", "output"],
+    [
+        ([], ""),
+        ([[RED]], "\x1b[38;2;255;0;0m▀\x1b[0m"),
+        ([[RED], [BLUE]], "\x1b[38;2;255;0;0;48;2;0;0;255m▀\x1b[0m"),
+        # runs of identical cells are merged
+        (
+            [[RED, RED, RED], [BLUE, BLUE, BLACK]],
+            "\x1b[38;2;255;0;0;48;2;0;0;255m▀▀\x1b[48;2;0;0;0m▀\x1b[0m",
+        ),
+        # identical halves are a space, whose foreground does not matter
+        (
+            [[RED, BLUE, RED], [BLUE, BLUE, BLUE]],
+            "\x1b[38;2;255;0;0;48;2;0;0;255m▀ ▀\x1b[0m",
+        ),
+        (
+            [[RED], [BLUE], [BLUE]],
+            "\x1b[38;2;255;0;0;48;2;0;0;255m▀\x1b[0m\n\x1b[38;2;0;0;255m▀\x1b[0m",
+        ),
+    ],
+)
+def test_render_half_blocks(pixels, output):
+    assert render_half_blocks(pixels) == output
+
+
+@pytest.mark.parametrize(
+    "pixels",
+    [
+        [[(300, 0, 0)]],
+        [[RED], [(0, -1, 0)]],
+        [[RED, RED], [RED, (0, 0, 256)]],
+    ],
+)
+def test_render_half_blocks_out_of_range(pixels):
+    with pytest.raises(ValueError, match="0..255"):
+        image._render_rows(pixels)
+
+    with pytest.raises(ValueError, match="0..255"):
+        render_half_blocks(pixels)
+
+
+def test_numpy_out_of_range():
+    numpy = pytest.importorskip("numpy")
+
+    for dtype in (numpy.int64, numpy.float64):
+        with pytest.raises(ValueError, match="0..255"):
+            render_half_blocks(numpy.array([[(0, 256, 0)]], dtype=dtype))
+
+
+def _random_image(height, width, seed):
+    generator = random.Random(seed)
+    # few colors, so that there are runs
+    colors = [RED, BLUE, BLACK, (12, 34, 56)]
+
+    return [
+        [generator.choice(colors) for _ in range(width)] for _ in range(height)
+    ]
+
+
+@pytest.mark.parametrize(["height", "width"], [(1, 1), (4, 7), (5, 3), (9, 16)])
+def test_numpy_matches_pure_python(height, width):
+    numpy = pytest.importorskip("numpy")
+
+    for seed in range(10):
+        pixels = _random_image(height, width, seed)
+        assert image._render_array(
+            numpy.array(pixels, dtype=numpy.uint8),
+        ) == image._render_rows(pixels)
+
+
+def test_numpy_wrong_shape():
+    numpy = pytest.importorskip("numpy")
+
+    with pytest.raises(ValueError):
+        render_half_blocks(numpy.zeros((2, 2), dtype=numpy.uint8))
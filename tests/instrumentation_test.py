@@ -0,0 +1,149 @@
+from io import StringIO
+
+import pytest
+from coquille.instrumentation import *
+from coquille.prelude import apply
+from coquille.prelude import BackgroundWriter
+from coquille.prelude import Coquille
+from coquille.prelude import frame
+from coquille.prelude import SharedWriter
+from coquille.prelude import write
+from coquille.screen import Screen
+from coquille.sequences import bold
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_color
+from coquille.sequences import italic
+
+
+@pytest.fixture
+def instrumentation():
+    instrumentation = enable()
+    yield instrumentation
+    disable()
+
+
+@pytest.mark.parametrize(
+    ["sequence", "name"],
+    [
+        (bold, "bold"),
+        (fg_red, "fg_red"),
+        ("fg_red", "fg_red"),
+        (foreground_color(200), "'\\x1b[38;5;200m'"),
+    ],
+)
+def test_sequence_name(sequence, name):
+    assert sequence_name(sequence) == name
+
+
+def test_snapshot(instrumentation):
+    file = StringIO()
+    apply(bold, file)
+    write("é", "fg_red", italic, file=file, flush_policy="manual")
+    coquille = Coquille.new(bold, file=file)
+
+    with coquille as context:
+        context.print("a")
+        context.apply(italic)
+
+    coquille.write("b")
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot["emits"] == 7
+    assert snapshot["bytes"] == len(file.getvalue().encode())
+    assert snapshot["flushes"] == 6
+    assert snapshot["write_time"] > 0
+    assert snapshot["sources"] == {
+        "apply": 1,
+        "write": 1,
+        "Coquille.__enter__": 1,
+        "Coquille.print": 1,
+        "Coquille.apply": 1,
+        "Coquille.__exit__": 1,
+        "Coquille.write": 1,
+    }
+    assert snapshot["sequences"] == {"bold": 4, "fg_red": 1, "italic": 2}
+
+    instrumentation.reset()
+    assert instrumentation.snapshot()["emits"] == 0
+
+
+def test_frame(instrumentation):
+    file = StringIO()
+
+    with frame(file) as screen:
+        write("a", bold, file=screen)
+
+    # only what reaches the stream is counted
+    snapshot = instrumentation.snapshot()
+    assert (snapshot["emits"], snapshot["flushes"]) == (1, 1)
+    assert snapshot["bytes"] == len(file.getvalue())
+    assert snapshot["sources"] == {"frame": 1}
+    assert snapshot["sequences"] == {"bold": 1}
+
+
+def test_SharedWriter(instrumentation):
+    file = StringIO()
+    shared = SharedWriter(file)
+    write("a", bold, file=shared)
+    write("b", file=shared)
+
+    snapshot = instrumentation.snapshot()
+    assert (snapshot["emits"], snapshot["flushes"]) == (2, 2)
+    assert snapshot["bytes"] == len(file.getvalue())
+    assert snapshot["sources"] == {"SharedWriter": 2}
+    assert snapshot["sequences"] == {"bold": 1}
+
+
+def test_BackgroundWriter(instrumentation):
+    file = StringIO()
+    writer = BackgroundWriter(file)
+    write("a", bold, file=writer)
+    write("b", file=writer)
+    writer.close()
+
+    # one write for each batch, by the thread of the writer
+    batches = writer.stats().batches
+    snapshot = instrumentation.snapshot()
+    assert (snapshot["emits"], snapshot["flushes"]) == (batches, batches)
+    assert snapshot["bytes"] == len(file.getvalue())
+    assert snapshot["sources"] == {"BackgroundWriter": batches}
+    assert snapshot["sequences"] == {"bold": 1}
+
+
+def test_Screen(instrumentation):
+    file = StringIO()
+    screen = Screen(2, 1, file)
+    screen.put(0, 0, "a")
+    screen.present()
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot["sources"] == {"Screen.present": 1}
+    assert snapshot["bytes"] == len(file.getvalue())
+
+
+def test_callback():
+    events = []
+    enable(events.append)
+
+    try:
+        write("a", bold, file=StringIO())
+        # nothing is written, so there is no event
+        write("", end="", file=StringIO())
+    finally:
+        instrumentation = disable()
+
+    assert instrumentation is not None
+    assert [(event.source, event.string, event.sequences) for event in events] == [
+        ("write", "\x1b[1ma\n\x1b[22m", ("bold",)),
+    ]
+    assert events[0].bytes == 11
+    assert events[0].flushed
+
+
+def test_disable():
+    instrumentation = enable()
+    assert disable() is instrumentation
+    assert disable() is None
+
+    write("a", bold, file=StringIO())
+    assert instrumentation.snapshot()["emits"] == 0
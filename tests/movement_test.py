@@ -0,0 +1,56 @@
+import pytest
+from coquille.movement import plan_cursor_move
+
+
+@pytest.mark.parametrize(
+    ["position", "target", "move"],
+    [
+        ((None, None), (0, 0), "\x1b[H"),
+        ((None, None), (4, 0), "\x1b[5H"),
+        ((None, None), (4, 9), "\x1b[5;10H"),
+        ((3, 3), (3, 3), ""),
+        ((3, 3), (3, 0), "\r"),
+        ((3, 3), (3, 1), "\b\b"),
+        ((3, 30), (3, 10), "\x1b[20D"),
+        ((3, 300), (3, 10), "\x1b[11G"),
+        ((3, 3), (3, 4), "\x1b[C"),
+        ((3, 3), (3, 8), "\x1b[5C"),
+        ((3, 3), (4, 3), "\x1b[B"),
+        ((3, 3), (4, 0), "\x1b[E"),
+        ((3, 3), (2, 3), "\x1bM"),
+        ((3, 3), (1, 0), "\x1b[2F"),
+        ((3, 3), (1, 3), "\x1b[2A"),
+        ((50, 50), (2, 70), "\x1b[3;71H"),
+    ],
+)
+def test_plan_cursor_move(position, target, move):
+    assert plan_cursor_move(*position, *target) == move
+
+
+@pytest.mark.parametrize(
+    ["newline_returns", "target", "move"],
+    [
+        (None, (4, 0), "\x1b[E"),
+        (True, (4, 0), "\n"),
+        (True, (5, 0), "\n\n"),
+        (False, (4, 3), "\n"),
+        (False, (4, 0), "\n\r"),
+    ],
+)
+def test_plan_cursor_move_newline(newline_returns, target, move):
+    assert plan_cursor_move(3, 3, *target, newline_returns=newline_returns) == move
+
+
+@pytest.mark.parametrize(
+    ["overwrite", "move"],
+    [
+        ("ab", "ab"),
+        ("abcd", "\x1b[4C"),
+        ("éa", "éa"),
+        ("éé", "\x1b[2C"),  # 4 bytes
+        ("a", "\x1b[2C"),  # does not match the distance
+    ],
+)
+def test_plan_cursor_move_overwrite(overwrite, move):
+    target = 3 + len(overwrite) if overwrite != "a" else 5
+    assert plan_cursor_move(0, 3, 0, target, overwrite=overwrite) == move
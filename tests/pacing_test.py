@@ -0,0 +1,139 @@
+import threading
+import time
+from io import StringIO
+
+import pytest
+from coquille.pacing import FrameScheduler
+from coquille.pacing import FrameStats
+from coquille.prelude import Coquille
+from coquille.prelude import write
+from coquille.sequences import bold
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_truecolor
+
+from tests.conftest import CountingStream
+
+
+def test_FrameScheduler():
+    file = CountingStream()
+    state = {"value": 0}
+
+    def render(out):
+        with Coquille.new(bold, file=out) as coquille:
+            coquille.print(state["value"], end="")
+            write("!", fg_red, end="", file=out)
+
+    scheduler = FrameScheduler(render, file, fps=1000)
+    state["value"] = 1
+    scheduler.request()
+    scheduler.close()
+
+    assert file.getvalue() == (
+        "\x1b[?2026h\x1b[1m1\x1b[38;5;1m!\x1b[39m\x1b[22m\x1b[?2026l"
+    )
+    assert file.writes == 1
+
+    stats = scheduler.stats()
+    assert (stats.frames, stats.requests, stats.skipped) == (1, 1, 0)
+    assert stats.bytes == stats.bytes_per_frame == len(file.getvalue())
+    assert stats.frame_time == stats.max_frame_time == stats.mean_frame_time
+
+
+def test_FrameScheduler_coalesces_requests():
+    file = StringIO()
+    drawing = threading.Event()
+    gate = threading.Event()
+    frames = []
+
+    def render(out):
+        frames.append(threading.current_thread())
+        drawing.set()
+        gate.wait()
+        out.write("frame")
+
+    scheduler = FrameScheduler(render, file, fps=1000)
+    scheduler.request()
+    drawing.wait()
+
+    # superseded by each other while the first frame is drawn
+    requesters = [
+        threading.Thread(target=lambda: [scheduler.request() for _ in range(5)])
+        for _ in range(4)
+    ]
+
+    for requester in requesters:
+        requester.start()
+
+    for requester in requesters:
+        requester.join()
+
+    gate.set()
+    scheduler.close()
+
+    stats = scheduler.stats()
+    assert (stats.frames, stats.requests, stats.skipped) == (2, 21, 19)
+    assert len(set(frames)) == 1
+    assert frames[0] is not threading.current_thread()
+    assert file.getvalue().count("frame") == 2
+
+
+def test_FrameScheduler_caps_the_frame_rate():
+    scheduler = FrameScheduler(lambda out: out.write("x"), StringIO(), fps=20)
+    end = time.monotonic() + 0.3
+
+    while time.monotonic() < end:
+        scheduler.request()
+        time.sleep(0.001)
+
+    scheduler.close()
+
+    stats = scheduler.stats()
+    assert 2 <= stats.frames <= 0.3 * 20 + 2
+    assert stats.skipped == stats.requests - stats.frames
+
+
+def test_FrameScheduler_color_depth():
+    file = StringIO()
+    scheduler = FrameScheduler(
+        lambda out: write("a", foreground_truecolor(0, 0, 238), end="", file=out),
+        file,
+        color_depth="16",
+    )
+    scheduler.request()
+    scheduler.close()
+
+    assert file.getvalue() == "\x1b[?2026h\x1b[34ma\x1b[39m\x1b[?2026l"
+
+
+def test_FrameScheduler_bytes_in_the_encoding_of_the_file():
+    class Latin1Stream(StringIO):
+        encoding = "latin-1"
+
+    scheduler = FrameScheduler(
+        lambda out: write("é", end="", file=out),
+        Latin1Stream(),
+    )
+    scheduler.request()
+    scheduler.close()
+
+    # "é" and the synchronization sequences, one byte per character
+    assert scheduler.stats().bytes == 1 + 8 + 8
+
+
+def test_FrameScheduler_error():
+    def render(out):
+        raise RuntimeError("render")
+
+    scheduler = FrameScheduler(render, StringIO())
+    scheduler.request()
+
+    with pytest.raises(RuntimeError):
+        scheduler.close()
+
+    with pytest.raises(ValueError):
+        scheduler.request()
+
+
+def test_FrameScheduler_fps():
+    with pytest.raises(ValueError):
+        FrameScheduler(lambda out: None, fps=0)
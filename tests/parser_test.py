@@ -0,0 +1,111 @@
+import pytest
+from coquille.parser import ControlSequence
+from coquille.parser import ControlString
+from coquille.parser import Escape
+from coquille.parser import parse
+from coquille.parser import Parser
+from coquille.parser import Text
+from coquille.sequences import bold
+from coquille.sequences import cursor_position
+from coquille.sequences import DEC_line_drawing
+from coquille.sequences import fg_red
+from coquille.sequences import hide_cursor
+from coquille.sequences import soft_reset
+
+SAMPLE = (
+    f"{bold}{fg_red}Hello\x1b[0m World\x1b]0;title\x07"
+    f"{DEC_line_drawing}qq\x1bc{cursor_position(5, 10)}{hide_cursor}"
+    f"\x1bP1$r\x1b\\{soft_reset}\x1b[0 q!"
+)
+
+
+@pytest.mark.parametrize(
+    ["string", "tokens"],
+    [
+        ("", []),
+        ("Hello World", [Text("Hello World")]),
+        (
+            f"{bold}Hello",
+            [ControlSequence("\x1b[1m", "", "1", "", "m"), Text("Hello")],
+        ),
+        (
+            "\x1b[?25l",
+            [ControlSequence("\x1b[?25l", "?", "25", "", "l")],
+        ),
+        ("\x1b[!p", [ControlSequence("\x1b[!p", "", "", "!", "p")]),
+        ("\x1b]0;title\x07", [ControlString("\x1b]0;title\x07", "]", "0;title")]),
+        ("\x1b]8;;x\x1b\\", [ControlString("\x1b]8;;x\x1b\\", "]", "8;;x")]),
+        ("\x1bc", [Escape("\x1bc", "", "c")]),
+        ("\x1b(0", [Escape("\x1b(0", "(", "0")]),
+        ("a\x1b\x07b", [Text("a"), Text("\x1b"), Text("\x07b")]),
+        ("a\x1b[1", [Text("a"), Text("\x1b[1")]),
+    ],
+)
+def test_parse(string, tokens):
+    assert list(parse(string)) == tokens
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64])
+def test_parse_chunks(size):
+    chunks = [SAMPLE[i : i + size] for i in range(0, len(SAMPLE), size)]
+    tokens = list(parse(chunks))
+
+    assert [token for token in tokens if not isinstance(token, Text)] == [
+        token for token in parse(SAMPLE) if not isinstance(token, Text)
+    ]
+    assert "".join(token[0] for token in tokens) == SAMPLE
+
+
+def test_parser_pending():
+    parser = Parser()
+
+    assert list(parser.feed("Hello \x1b[3")) == [Text("Hello ")]
+    assert list(parser.feed("1mWorld")) == [
+        ControlSequence("\x1b[31m", "", "31", "", "m"),
+        Text("World"),
+    ]
+    assert list(parser.close()) == []
+
+
+def test_parser_max_sequence_length():
+    parser = Parser(max_sequence_length=8)
+
+    assert list(parser.feed("\x1b]0;long title")) == [Text("\x1b]0;long title")]
+    assert list(parser.feed("\x07")) == [Text("\x07")]
+
+
+@pytest.mark.parametrize(
+    ["string", "parameters"],
+    [
+        ("\x1b[m", ()),
+        ("\x1b[1;31m", (1, 31)),
+        ("\x1b[;5H", (None, 5)),
+        ("\x1b[?1049h", (1049,)),
+    ],
+)
+def test_parameters(string, parameters):
+    [token] = parse(string)
+
+    assert token.parameters == parameters
+
+
+@pytest.mark.parametrize(
+    ["string", "name"],
+    [
+        (bold, "bold"),
+        (fg_red, "fg_red"),
+        (hide_cursor, "hide_cursor"),
+        (soft_reset, "soft_reset"),
+        ("\x1bc", "reset_initial_state"),
+        (DEC_line_drawing, "DEC_line_drawing"),
+        (cursor_position(5, 10), "cursor_position"),
+        ("\x1b[38;5;208m", "select_graphical_rendition"),
+        ("\x1b]0;title\x07", "operating_system_command"),
+        ("\x1b[?7777h", None),
+        ("\x1b%G", None),
+    ],
+)
+def test_name(string, name):
+    [token] = parse(string)
+
+    assert token.name == name
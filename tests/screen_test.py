@@ -0,0 +1,107 @@
+from io import StringIO
+
+import pytest
+from coquille.screen import Screen
+from coquille.sequences import bold
+from coquille.sequences import fg_red
+from coquille.state import TerminalState
+from coquille.style import Style
+from coquille.style import true_color
+
+from tests.conftest import CountingStream
+
+RED = Style.from_sequences([fg_red])
+BOLD = Style.from_sequences([bold])
+
+
+@pytest.fixture
+def screen():
+    screen = Screen(4, 2)
+    screen.render()
+    return screen
+
+
+def test_first_render_draws_everything():
+    assert Screen(2, 2).render() == "\x1b[H  \x1b[2H  "
+
+
+def test_render_nothing_changed(screen):
+    screen.put(0, 0, "  ")
+    assert screen.render() == ""
+
+
+def test_render_changed_cells_only(screen):
+    screen.put(0, 1, "ab")
+    screen.put(1, 0, "c", RED)
+    screen.put(1, 3, "d", RED)
+    assert screen.render() == (
+        "\x1b[1;2Hab" + "\x1b[E\x1b[38;5;1mc" + "\x1b[2Cd"
+    )
+    assert screen.pen == RED
+    assert screen.render() == ""
+
+
+def test_render_style_change(screen):
+    screen.put(0, 0, "ab", BOLD)
+    assert screen.render() == "\x1b[H\x1b[1mab"
+    screen.put(0, 0, "ab", RED)
+    assert screen.render() == "\x1b[H\x1b[0;38;5;1mab"
+
+
+def test_put_is_clipped(screen):
+    screen.put(0, -1, "abc")
+    screen.put(1, 2, "xyz")
+    screen.put(2, 0, "nope")
+    assert screen.get(0, 0) == ("b", Style())
+    assert screen.render() == "\x1b[Hbc\x1b[Bxy"
+
+
+def test_invalidate(screen):
+    screen.invalidate()
+    assert screen.render() == "\x1b[H    \x1b[2H    "
+
+
+def test_present():
+    file = StringIO()
+    screen = Screen(1, 1, file)
+    screen.present()
+    screen.present()
+    assert file.getvalue() == "\x1b[H "
+
+
+def test_present_flush_policy():
+    file = CountingStream()
+    screen = Screen(1, 1, file, flush_policy="manual")
+    screen.present()
+    assert (file.writes, file.flushes) == (1, 0)
+
+
+def test_render_overwrites_unchanged_cells(screen):
+    screen.put(0, 0, "abcd")
+    screen.render()
+    screen.put(0, 0, "x")
+    screen.put(0, 3, "y")
+    # re-printing "bc" is shorter than moving forward
+    assert screen.render() == "\x1b[Hxbcy"
+
+
+def test_render_newline_returns():
+    screen = Screen(2, 3, newline_returns=True)
+    screen.render()
+    screen.put(0, 0, "a")
+    screen.put(1, 0, "b")
+    assert screen.render() == "\x1b[Ha\nb"
+
+
+def test_put_terminal_state(screen):
+    screen.put(0, 0, "a", TerminalState.from_sequences([fg_red]))
+    assert screen.get(0, 0) == ("a", RED)
+
+
+def test_render_color_depth():
+    screen = Screen(3, 1, color_depth="16")
+    screen.put(0, 0, "a", Style(foreground=true_color(255, 0, 0)))
+    # both are bright red at this depth
+    screen.put(0, 1, "bc", Style(foreground=true_color(250, 5, 5)))
+    assert screen.render() == "\x1b[H\x1b[91mabc"
+    assert screen.render() == ""
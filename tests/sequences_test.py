@@ -1,3 +1,7 @@
+import inspect
+import subprocess
+import sys
+
 import pytest
 from coquille.sequences import *
 
@@ -201,3 +205,191 @@ def test_background_truecolor():
 
 def test_underline_truecolor():
     assert underline_truecolor(255, 255, 255) == "\x1b[58;2;255;255;255m"
+
+
+@pytest.mark.parametrize(
+    ["name", "output"],
+    [
+        ("fg_red", "\x1b[38;5;1m"),
+        ("dim", "\x1b[2m"),
+        ("DECSTR", "\x1b[!p"),
+        ("BSU", "\x1b[?2026h"),
+        ("end_synchronized_update", "\x1b[?2026l"),
+    ],
+)
+def test_get_sequence_from_name(name, output):
+    assert get_sequence_from_name(name) == output
+
+
+@pytest.mark.parametrize("name", ["FG_RED", "decstr", "escape_sequence", "RESET"])
+def test_get_sequence_from_name_invalid(name):
+    with pytest.raises(ValueError):
+        get_sequence_from_name(name)
+
+
+def test_get_sequence_from_name_case_insensitive():
+    assert get_sequence_from_name("FG_Red", case_sensitive=False) == fg_red
+    assert get_sequence_from_name("decstr", case_sensitive=False) == soft_reset
+
+
+def test_get_sequence_from_names():
+    sequence = get_sequence_from_names(("fg_red", "bold", "dim"))
+    assert sequence == "\x1b[38;5;1m\x1b[1m\x1b[2m"
+    assert isinstance(sequence, EscapeSequence)
+    assert get_sequence_from_names(("fg_red", "bold", "dim")) is sequence
+
+
+def test_SEQUENCES_is_read_only():
+    with pytest.raises(TypeError):
+        SEQUENCES["fg_red"] = bold  # type: ignore
+
+
+def _run_python(*arguments):
+    return subprocess.run(
+        [sys.executable, *arguments],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def test_sequences_are_lazy():
+    script = """
+import coquille.sequences as sequences
+built = [name for name in sequences.SEQUENCES if name in vars(sequences)]
+from coquille.sequences import fg_red
+print(built, fg_red == sequences.foreground_color(1), "fg_red" in vars(sequences))
+"""
+
+    # only the sections used by coquille itself are built on import
+    assert _run_python("-c", script).stdout.split() == [
+        "['reset_initial_state',",
+        "'RIS',",
+        "'soft_reset',",
+        "'DECSTR',",
+        "'begin_synchronized_update',",
+        "'end_synchronized_update',",
+        "'BSU',",
+        "'ESU']",
+        "True",
+        "True",
+    ]
+
+
+def test_lazy_attributes():
+    import coquille.sequences as sequences
+
+    assert "ul_white" in dir(sequences)
+    assert set(SEQUENCES) <= set(sequences.__all__)
+
+    with pytest.raises(AttributeError):
+        sequences.not_a_sequence
+
+
+@pytest.fixture
+def factory_cache():
+    configure_factory_cache(maxsize=2)
+    yield
+    configure_factory_cache(enabled=False)
+
+
+def test_factory_cache(factory_cache):
+    assert factory_cache_info()["cursor_position"] == (0, 0, 2, 0)
+
+    for _ in range(3):
+        assert cursor_position(3, 4) == "\x1b[3;4H"
+
+    assert foreground_truecolor(1, 2, 3) == "\x1b[38;2;1;2;3m"
+    assert factory_cache_info()["cursor_position"] == (2, 1, 2, 1)
+    assert factory_cache_info()["foreground_truecolor"] == (0, 1, 2, 1)
+
+    # aliases are the same functions, and the defaults are kept
+    assert CUP(3, 4) == "\x1b[3;4H"
+    assert cursor_up() == "\x1b[1A"
+    assert factory_cache_info()["cursor_position"].hits == 3
+
+
+def test_factory_cache_is_bounded(factory_cache):
+    for n in range(10):
+        cursor_up(n)
+
+    assert factory_cache_info()["cursor_up"].currsize == 2
+
+
+def test_factory_cache_keeps_the_signatures(factory_cache):
+    parameters = inspect.signature(cursor_position).parameters
+    assert [(name, p.default) for name, p in parameters.items()] == [("n", 1), ("m", 1)]
+
+
+def test_clear_factory_cache(factory_cache):
+    cursor_up(1)
+    clear_factory_cache()
+    assert factory_cache_info()["cursor_up"] == (0, 0, 2, 0)
+
+
+def test_factory_cache_disabled():
+    assert factory_cache_info() == {}
+    assert cursor_up(2) == "\x1b[2A"
+
+
+@pytest.mark.parametrize(
+    ["sequence", "result"],
+    [
+        (bold, True),
+        (fg_truecolor(1, 2, 3), True),
+        ("\x1b[m", True),
+        (soft_reset, False),
+        (cursor_up(), False),
+        (bold + italic, False),
+    ],
+)
+def test_is_graphical_rendition(sequence, result):
+    assert is_graphical_rendition(sequence) is result
+
+
+@pytest.mark.parametrize(
+    ["sequences", "output"],
+    [
+        ((), ""),
+        ((bold,), "\x1b[1m"),
+        ((bold, italic, fg_truecolor(1, 2, 3)), "\x1b[1;3;38;2;1;2;3m"),
+        (("\x1b[m", bold), "\x1b[0;1m"),
+        ((bold, cursor_up(), italic, dim), "\x1b[1m\x1b[1A\x1b[3;2m"),
+    ],
+)
+def test_coalesce_sequences(sequences, output):
+    assert coalesce_sequences(sequences) == output
+
+
+@pytest.mark.parametrize(
+    ["table", "factory", "code"],
+    [
+        (FOREGROUND_COLORS, foreground_color, 38),
+        (BACKGROUND_COLORS, background_color, 48),
+        (UNDERLINE_COLORS, underline_color, 58),
+    ],
+)
+def test_palette_tables(table, factory, code):
+    assert len(table) == 256
+    assert table[208] == f"\x1b[{code};5;208m"
+    assert table.encoded[208] == f"\x1b[{code};5;208m".encode()
+    assert list(table) == [SGR(code, 5, n) for n in range(256)]
+    assert factory(208) is table[208]
+    assert isinstance(factory(208), EscapeSequence)
+    # out of the palette
+    assert factory(300) == f"\x1b[{code};5;300m"
+
+
+@pytest.mark.parametrize(
+    ["factory", "code"],
+    [
+        (foreground_truecolor, 38),
+        (background_truecolor, 48),
+        (underline_truecolor, 58),
+    ],
+)
+def test_truecolor_template(factory, code):
+    sequence = factory(255, 127, 0)
+
+    assert sequence == ESC("[", "m", code, 2, 255, 127, 0)
+    assert isinstance(sequence, EscapeSequence)
@@ -0,0 +1,125 @@
+import pytest
+from coquille.sequences import *
+from coquille.state import is_stateless
+from coquille.state import TerminalState
+
+DEFAULT = TerminalState()
+
+
+@pytest.mark.parametrize(
+    ["sequences", "state"],
+    [
+        ((bold,), TerminalState(attributes=frozenset({1}))),
+        ((bold, faint, normal_intensity), DEFAULT),
+        ((fg_red, italic, reset), DEFAULT),
+        (("\x1b[1;3m", no_italic), TerminalState(attributes=frozenset({1}))),
+        ((fg_truecolor(1, 2, 3),), TerminalState(foreground=(38, 2, 1, 2, 3))),
+        ((bg_red, default_background_color), DEFAULT),
+        ((foreground_bright_red,), TerminalState(foreground=(91,))),
+        ((alternative_font(2),), TerminalState(font=12)),
+        ((hide_cursor,), TerminalState(disabled_modes=frozenset({25}))),
+        (
+            ("\x1b[?1049;2004h",),
+            TerminalState(enabled_modes=frozenset({1049, 2004})),
+        ),
+        (
+            (bold, hide_cursor, soft_reset),
+            TerminalState(enabled_modes=frozenset({25})),
+        ),
+    ],
+)
+def test_apply(sequences, state):
+    current = DEFAULT
+
+    for sequence in sequences:
+        current = current.apply(sequence)
+
+    assert current == state
+
+
+@pytest.mark.parametrize(
+    "sequence",
+    [cursor_up(), DEC_save_cursor, "\x1b[38;5m", "\x1b[1;99m", "\x1b[2J"],
+)
+def test_apply_unknown(sequence):
+    assert DEFAULT.apply(sequence) is None
+
+
+@pytest.mark.parametrize(
+    ["current", "target", "delta"],
+    [
+        ((), (), ""),
+        ((), (bold, fg_red), "\x1b[1;38;5;1m"),
+        ((bold, fg_red), (bold, fg_red), ""),
+        ((bold, faint), (bold,), "\x1b[0;1m"),
+        ((bold, italic, fg_red), (italic,), "\x1b[0;3m"),
+        ((bold, italic, fg_red), (bold, italic), "\x1b[39m"),
+        ((bold, faint, italic, underline), (bold, italic, underline), "\x1b[22;1m"),
+        ((bold, italic, underline, fg_red, bg_blue), (), "\x1b[0m"),
+        ((fg_red,), (fg_green,), "\x1b[38;5;2m"),
+        ((), (hide_cursor,), "\x1b[?25l"),
+        ((hide_cursor,), (show_cursor,), "\x1b[?25h"),
+        ((hide_cursor,), (), ""),
+    ],
+)
+def test_delta(current, target, delta):
+    current_state = target_state = DEFAULT
+
+    for sequence in current:
+        current_state = current_state.apply(sequence)
+
+    for sequence in target:
+        target_state = target_state.apply(sequence)
+
+    assert current_state.delta(target_state) == delta
+
+
+@pytest.mark.parametrize(
+    ["previous", "applied", "undo"],
+    [
+        ((), (bold,), "\x1b[22m"),
+        ((), (bold, italic, fg_red), "\x1b[22;23;39m"),
+        ((fg_blue,), (bold, fg_red), "\x1b[22;38;5;4m"),
+        ((), (enable_alternative_screen_buffer,), "\x1b[?1049l"),
+        ((), (hide_cursor,), "\x1b[?25h"),
+        ((hide_cursor,), (hide_cursor,), ""),
+    ],
+)
+def test_undo(previous, applied, undo):
+    previous_state = DEFAULT
+
+    for sequence in previous:
+        previous_state = previous_state.apply(sequence)
+
+    state = previous_state
+
+    for sequence in applied:
+        state = state.apply(sequence)
+
+    assert state.undo(previous_state) == undo
+
+
+@pytest.mark.parametrize(
+    ["sequence", "result"],
+    [
+        (cursor_up(), True),
+        (cursor_position(2, 3), True),
+        (erase_in_line(2), True),
+        (DEC_save_cursor, True),
+        (bold, False),
+        (hide_cursor, False),
+        (DEC_line_drawing, False),
+    ],
+)
+def test_is_stateless(sequence, result):
+    assert is_stateless(sequence) is result
+
+
+def test_from_sequences():
+    assert TerminalState.from_sequences([bold, fg_red]) == TerminalState(
+        attributes=frozenset({1}),
+        foreground=(38, 5, 1),
+    )
+
+    with pytest.raises(ValueError):
+        TerminalState.from_sequences([bold, cursor_up()])
@@ -0,0 +1,161 @@
+import copy
+import pickle
+import random
+
+import pytest
+from coquille.sequences import bold
+from coquille.sequences import default_foreground_color
+from coquille.sequences import faint
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_bright_red
+from coquille.sequences import hide_cursor
+from coquille.sequences import italic
+from coquille.sequences import normal_intensity
+from coquille.state import TerminalState
+from coquille.style import attribute_mask
+from coquille.style import basic_color
+from coquille.style import indexed_color
+from coquille.style import Style
+from coquille.style import true_color
+
+BOLD = Style(attribute_mask(1))
+RED = Style(foreground=indexed_color(1))
+
+
+@pytest.mark.parametrize(
+    ["sequences", "style"],
+    [
+        ([], Style()),
+        ([bold], BOLD),
+        ([fg_red], RED),
+        ([bold, italic, normal_intensity], Style(attribute_mask(3))),
+        ([bold, faint, normal_intensity], Style()),
+        (["\x1b[31;44m"], Style(foreground=basic_color(1), background=basic_color(4))),
+        ([foreground_bright_red], Style(foreground=basic_color(9))),
+        (["\x1b[58;2;1;2;3m"], Style(underline_color=true_color(1, 2, 3))),
+        (["\x1b[12m"], Style(font=12)),
+        ([bold, fg_red, "\x1b[m"], Style()),
+        ([fg_red, default_foreground_color], Style()),
+    ],
+)
+def test_from_sequences(sequences, style):
+    assert Style.from_sequences(sequences) == style
+
+
+@pytest.mark.parametrize("sequence", [hide_cursor, "\x1b[38;5m", "\x1b[99m"])
+def test_from_sequences_error(sequence):
+    with pytest.raises(ValueError):
+        Style.from_sequences([sequence])
+
+
+def test_attribute_mask_error():
+    with pytest.raises(ValueError):
+        attribute_mask(22)
+
+
+@pytest.mark.parametrize(
+    ["style", "sequence"],
+    [
+        (Style(), ""),
+        (BOLD | RED, "\x1b[1;38;5;1m"),
+        (Style(background=basic_color(12)), "\x1b[104m"),
+        (Style(underline_color=basic_color(1)), "\x1b[58;5;1m"),
+        (Style(underline_color=basic_color(9)), "\x1b[58;5;9m"),
+        (Style(foreground=true_color(255, 0, 10)), "\x1b[38;2;255;0;10m"),
+    ],
+)
+def test_sequence(style, sequence):
+    assert style.sequence == sequence
+
+
+def test_merge_and_difference():
+    italic_blue = Style.from_sequences([italic, "\x1b[44m"])
+
+    assert BOLD | RED == Style.from_sequences([bold, fg_red])
+    assert (BOLD | RED) - RED == BOLD
+    assert (BOLD | RED) | Style(foreground=basic_color(2)) == Style.from_sequences(
+        ["\x1b[1;32m"],
+    )
+    assert BOLD - BOLD == Style()
+    assert (italic_blue - BOLD) | BOLD == italic_blue | BOLD
+
+
+def test_hash():
+    assert hash(Style.from_sequences([bold, fg_red])) == hash(BOLD | RED)
+    assert len({Style(), BOLD, Style.from_sequences([bold])}) == 2
+
+
+def test_immutable():
+    with pytest.raises(AttributeError):
+        BOLD.attributes = 0
+
+
+def test_copy():
+    style = BOLD | RED
+
+    assert pickle.loads(pickle.dumps(style)) == style
+    assert copy.deepcopy(style) == style
+
+
+def test_repr():
+    assert repr(Style()) == "Style()"
+    assert repr(BOLD) == "Style.from_sequences(['\\x1b[1m'])"
+
+
+def _random_sequence(rng):
+    codes = [0, 1, 2, 3, 4, 7, 20, 21, 22, 23, 24, 27, 31, 39, 42, 49, 91, 104, 12]
+    parameters = [str(rng.choice(codes)) for _ in range(rng.randint(1, 4))]
+    parameters.append(
+        rng.choice(["38;5;208", "48;2;1;2;3", "58;5;1", "59", "10"]),
+    )
+
+    return f"\x1b[{';'.join(parameters)}m"
+
+
+def test_same_as_terminal_state():
+    rng = random.Random(0)
+
+    for _ in range(500):
+        sequences = [_random_sequence(rng) for _ in range(rng.randint(0, 3))]
+        targets = [_random_sequence(rng) for _ in range(rng.randint(0, 3))]
+        state = TerminalState.from_sequences(sequences)
+        target = TerminalState.from_sequences(targets)
+        style = Style.from_sequences(sequences)
+
+        assert style == Style.from_terminal_state(state)
+        assert style.to_terminal_state() == state
+        assert style.delta(Style.from_sequences(targets)) == state.delta(target)
+
+
+TRUECOLOR = Style(
+    attribute_mask(1),
+    foreground=true_color(255, 0, 0),
+    underline_color=true_color(0, 0, 0),
+)
+
+
+@pytest.mark.parametrize(
+    ["depth", "style"],
+    [
+        ("truecolor", TRUECOLOR),
+        (
+            "256",
+            Style(
+                attribute_mask(1),
+                foreground=indexed_color(196),
+                underline_color=indexed_color(16),
+            ),
+        ),
+        (
+            "16",
+            Style(
+                attribute_mask(1),
+                foreground=basic_color(9),
+                underline_color=indexed_color(0),
+            ),
+        ),
+        ("none", Style(attribute_mask(1))),
+    ],
+)
+def test_downsample(depth, style):
+    assert TRUECOLOR.downsample(depth) == style
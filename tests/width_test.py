@@ -0,0 +1,68 @@
+import pytest
+from coquille.sequences import bold
+from coquille.sequences import cursor_position
+from coquille.sequences import DEC_line_drawing
+from coquille.sequences import fg_red
+from coquille.sequences import foreground_truecolor
+from coquille.sequences import hide_cursor
+from coquille.sequences import reset_initial_state
+from coquille.sequences import soft_reset
+from coquille.width import char_width
+from coquille.width import strip_sequences
+from coquille.width import visible_width
+
+
+@pytest.mark.parametrize(
+    ["text", "stripped"],
+    [
+        ("", ""),
+        ("Hello World", "Hello World"),
+        (f"{bold}Hello{fg_red} World", "Hello World"),
+        (f"{foreground_truecolor(1, 2, 3)}a{cursor_position(4, 5)}b", "ab"),
+        (f"{hide_cursor}{soft_reset}a{reset_initial_state}", "a"),
+        (f"{DEC_line_drawing}qqq", "qqq"),
+        ("\x1b]8;;https://example.com\x1b\\link\x1b]8;;\x07", "link"),
+        ("\x1b[0 qa", "a"),
+    ],
+)
+def test_strip_sequences(text, stripped):
+    assert strip_sequences(text) == stripped
+
+
+@pytest.mark.parametrize(
+    ["char", "width"],
+    [
+        ("a", 1),
+        ("é", 1),
+        ("­", 1),
+        ("́", 0),
+        ("​", 0),
+        ("\x00", 0),
+        ("\x7f", 0),
+        ("ᅠ", 0),
+        ("日", 2),
+        ("Ａ", 2),
+        ("\U0001f600", 2),
+        ("\U00020000", 2),
+        ("\U000e0001", 0),
+        ("\U0010ffff", 1),
+    ],
+)
+def test_char_width(char, width):
+    assert char_width(char) == width
+
+
+@pytest.mark.parametrize(
+    ["text", "width"],
+    [
+        ("", 0),
+        ("Hello World", 11),
+        (f"{bold}Hello{fg_red} World", 11),
+        ("日本語", 6),
+        (f"{fg_red}日本{bold}!", 5),
+        ("é", 1),
+        ("a\nb", 2),
+    ],
+)
+def test_visible_width(text, width):
+    assert visible_width(text) == width